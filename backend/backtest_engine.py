@@ -13,11 +13,11 @@ from .strategy import StrategyEngine
 from .data_fetcher import DataFetcher
 from .performance import PerformanceAnalyzer
 from .utils import (
-    calculate_total_cost,
-    get_execution_price,
-    is_trading_day,
-    apply_borrow_cost,
-    get_week_start
+    make_total_cost_fn,
+    execution_price_fn,
+    trading_day_flags,
+    build_trading_day_mask,
+    week_start_labels
 )
 
 logger = logging.getLogger(__name__)
@@ -92,18 +92,22 @@ class BacktestEngine:
             ranking_logic=st_config.get('rankingLogic'),
             stop_loss_type=pr_config.get('stopLossType', 'fixed-percent'),
             use_trailing_stops=pr_config.get('useTrailingStops', False),
-            trailing_stop_distance=pr_config.get('trailingStopDistance')
+            trailing_stop_distance=pr_config.get('trailingStopDistance'),
+            max_concurrent_finchat=st_config.get('maxConcurrentFinchat')
         )
         
         # Initialize FinChat client if FinChat slugs are provided
         finchat_client = None
+        finchat_cache = None
         entry_prompt_type = st_config.get('entryPromptType', 'string')
         exit_prompt_type = st_config.get('exitPromptType', 'string')
         
         if entry_prompt_type == 'finchat-slug' or exit_prompt_type == 'finchat-slug':
             try:
                 from .finchat_client import FinChatClient
+                from .finchat_cache import get_finchat_cache
                 finchat_client = FinChatClient()
+                finchat_cache = get_finchat_cache()
                 logger.info("FinChat client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize FinChat client: {e}")
@@ -132,7 +136,8 @@ class BacktestEngine:
             exit_finchat_slug=st_config.get('exitFinChatSlug'),
             upside_threshold=st_config.get('upsideThreshold'),
             downside_threshold=st_config.get('downsideThreshold'),
-            signal_tracker=self.finchat_signals
+            signal_tracker=self.finchat_signals,
+            finchat_cache=finchat_cache
         )
         
         # Store FinChat client for async calls
@@ -162,14 +167,24 @@ class BacktestEngine:
         
         # Store settings
         self.entry_timing = te_config.get('entryTiming', 'next-bar-open')
+        self._execution_price = execution_price_fn(self.entry_timing)
         self.commission_type = te_config.get('commissionType', 'per-trade')
         self.commission_amount = te_config.get('commissionAmount', 0)
         self.exchange_fees = te_config.get('exchangeFees', 0)
         self.slippage = te_config.get('slippage', 0)
+        self._total_cost = make_total_cost_fn(
+            self.commission_type,
+            self.commission_amount,
+            self.exchange_fees,
+            self.slippage
+        )
         self.trading_days = te_config.get('tradingDays', [])
+        self._trading_day_mask = build_trading_day_mask(self.trading_days)
         self.handle_missing_data = te_config.get('handleMissingData', 'skip')
         self.short_selling_allowed = te_config.get('shortSellingAllowed', False)
         self.borrow_cost = te_config.get('borrowCost', 0)
+        # Annual borrow cost percentage as a daily rate, resolved once
+        self._daily_borrow_rate = (self.borrow_cost or 0) / 100 / 365
         
         self.mtm_frequency = mtm_config.get('mtmFrequency', 'every-bar')
         self.mtm_price = mtm_config.get('mtmPrice', 'close')
@@ -276,13 +291,23 @@ class BacktestEngine:
         # Get unique timestamps
         timestamps = sorted(self.market_data.index.get_level_values('timestamp').unique())
         
+        # Precompute strategy lookups once for the whole run
+        self.strategy.prepare(self.market_data)
+        
         # Track current week for weekly resets
         current_week_start = None
         
-        for i, timestamp in enumerate(timestamps):
-            # Check if trading day
-            if not is_trading_day(timestamp, self.trading_days):
-                continue
+        timestamp_index = pd.DatetimeIndex(timestamps)
+        
+        # Calendar-day and week labels for every bar, computed once
+        day_labels = timestamp_index.normalize().to_numpy()
+        week_labels = week_start_labels(timestamp_index)
+        
+        # Trading-day check for every bar at once; the loop only visits trading days
+        trading_bars = np.flatnonzero(trading_day_flags(timestamp_index, self._trading_day_mask))
+        
+        for i in trading_bars:
+            timestamp = timestamps[i]
             
             # Get market data for current timestamp
             try:
@@ -296,11 +321,10 @@ class BacktestEngine:
             
             # Reset daily/weekly peaks
             if i > 0:
-                prev_timestamp = timestamps[i-1]
-                if prev_timestamp.date() != timestamp.date():
+                if day_labels[i - 1] != day_labels[i]:
                     self.portfolio.reset_daily_peak()
                 
-                week_start = get_week_start(timestamp)
+                week_start = week_labels[i]
                 if current_week_start is None or week_start != current_week_start:
                     self.portfolio.reset_weekly_peak()
                     current_week_start = week_start
@@ -401,34 +425,47 @@ class BacktestEngine:
     
     def _apply_borrow_costs(self):
         """Apply borrow costs to short positions"""
-        for ticker, position in self.portfolio.positions.items():
-            if position.shares < 0:  # Short position
-                cost = apply_borrow_cost(
-                    abs(position.current_value),
-                    self.borrow_cost,
-                    days_held=1
-                )
-                self.portfolio.cash -= cost
+        if not self._daily_borrow_rate:
+            return
+        
+        short_values = [
+            position.current_value
+            for position in self.portfolio.positions.values()
+            if position.shares < 0  # Short position
+        ]
+        if short_values:
+            # One day of accrual for every short position at once
+            costs = np.abs(np.asarray(short_values, dtype=np.float64)) * self._daily_borrow_rate
+            self.portfolio.cash -= float(costs.sum())
     
     async def _process_exits(self, timestamp: datetime, current_data: pd.DataFrame):
         """Process exit signals for existing positions"""
         positions_to_close = []
         
-        for ticker, position in self.portfolio.positions.items():
+        # Rule-based exits (stops, take profit, time) for all positions at once
+        open_positions = list(self.portfolio.positions.items())
+        rule_reasons = self.strategy.check_exit_signals_batch(
+            [position for _, position in open_positions],
+            timestamp
+        )
+        
+        for (ticker, position), rule_reason in zip(open_positions, rule_reasons):
             # Check exit conditions (use async version if FinChat is enabled)
             if self.finchat_client:
                 should_exit, exit_reason = await self.strategy.check_exit_signal_async(
                     self.market_data,
                     ticker,
                     timestamp,
-                    position
+                    position,
+                    rule_reason=rule_reason
                 )
             else:
                 should_exit, exit_reason = self.strategy.check_exit_signal(
                     self.market_data,
                     ticker,
                     timestamp,
-                    position
+                    position,
+                    rule_reason=rule_reason
                 )
             
             if should_exit:
@@ -467,20 +504,12 @@ class BacktestEngine:
         ticker_data = current_data.loc[ticker]
         
         # Get execution price
-        exit_price = get_execution_price(ticker_data.to_dict(), self.entry_timing)
+        exit_price = self._execution_price(ticker_data)
         if exit_price is None or exit_price <= 0:
             return
         
         # Calculate proceeds including costs
-        execution_price, exit_proceeds, total_fees = calculate_total_cost(
-            position.shares,
-            exit_price,
-            self.commission_type,
-            self.commission_amount,
-            self.exchange_fees,
-            self.slippage,
-            is_buy=False
-        )
+        execution_price, exit_proceeds, total_fees = self._total_cost(position.shares, exit_price, is_buy=False)
         
         # Close position
         self.portfolio.close_position(
@@ -488,7 +517,8 @@ class BacktestEngine:
             execution_price,
             timestamp,
             exit_proceeds,
-            exit_reason
+            exit_reason,
+            gross_exit_value=abs(position.shares) * execution_price
         )
     
     async def _process_entries(self, timestamp: datetime, current_data: pd.DataFrame):
@@ -577,7 +607,7 @@ class BacktestEngine:
         logger.debug(f"Ticker data for {ticker}: {ticker_data.to_dict()}")
         
         # Get execution price
-        entry_price = get_execution_price(ticker_data.to_dict(), self.entry_timing)
+        entry_price = self._execution_price(ticker_data)
         if entry_price is None or entry_price <= 0:
             logger.warning(f"Invalid entry price for {ticker}: {entry_price}")
             return
@@ -599,15 +629,7 @@ class BacktestEngine:
             return
         
         # Calculate total cost including fees
-        execution_price, total_cost, total_fees = calculate_total_cost(
-            shares,
-            entry_price,
-            self.commission_type,
-            self.commission_amount,
-            self.exchange_fees,
-            self.slippage,
-            is_buy=True
-        )
+        execution_price, total_cost, total_fees = self._total_cost(shares, entry_price, is_buy=True)
         
         # Check if we can open this position
         can_open, reason = self.portfolio.can_open_position(ticker, total_cost)
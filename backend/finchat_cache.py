@@ -0,0 +1,167 @@
+"""
+FinChat Response Cache Module
+Caches parsed FinChat COT signals so repeated backtests skip identical COT calls
+"""
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Process-wide cache shared by parsers that are not given one explicitly
+_shared_cache: Optional["FinChatResponseCache"] = None
+
+
+# Cache keys are tuples of sorted (field, value) pairs
+CacheKey = Tuple[Tuple[str, Any], ...]
+
+
+def make_cache_key(**fields: Any) -> CacheKey:
+    """
+    Build a cache key from the inputs that determine a COT response
+
+    The key is a tuple of the fields sorted by name, so argument order does
+    not matter and in-memory lookups hash a tuple instead of formatting and
+    digesting a string on every probe.
+    """
+    return tuple(sorted(fields.items()))
+
+
+def digest_cache_key(key: CacheKey) -> str:
+    """Stable SHA-256 digest of a cache key, for persistent backends"""
+    canonical = json.dumps(dict(key), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class FinChatResponseCache(abc.ABC):
+    """Interface for FinChat COT response caches"""
+
+    @abc.abstractmethod
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, or None on a miss / expired entry"""
+
+    @abc.abstractmethod
+    def set(self, key: CacheKey, entry: Dict[str, Any], ttl: Optional[float] = None):
+        """Store an entry, optionally expiring after ttl seconds"""
+
+    async def aget(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """get() for callers on the event loop (backends with blocking I/O override this)"""
+        return self.get(key)
+
+    async def aset(self, key: CacheKey, entry: Dict[str, Any], ttl: Optional[float] = None):
+        """set() for callers on the event loop (backends with blocking I/O override this)"""
+        self.set(key, entry, ttl)
+
+
+class InMemoryCache(FinChatResponseCache):
+    """Process-local LRU cache"""
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[CacheKey, tuple]" = OrderedDict()
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        entry, expires_at = item
+        if expires_at is not None and expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: CacheKey, entry: Dict[str, Any], ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        self._entries[key] = (entry, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class SQLiteCache(FinChatResponseCache):
+    """Cache persisted in a SQLite file, shared across backtest runs"""
+
+    def __init__(self, path: str = ".finchat_cot.db"):
+        self.path = path
+        # Worker threads share the connection (see aget / aset); one statement at a time
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cot_cache ("
+            "key TEXT PRIMARY KEY, entry TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+        logger.info(f"FinChat response cache at {path}")
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        key = digest_cache_key(key)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entry, expires_at FROM cot_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute("DELETE FROM cot_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return json.loads(entry)
+
+    def set(self, key: CacheKey, entry: Dict[str, Any], ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        key = digest_cache_key(key)
+        payload = json.dumps(entry, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cot_cache (key, entry, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at)
+            )
+            self._conn.commit()
+
+    async def aget(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        # SQLite reads and commits block; keep them off the event loop
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: CacheKey, entry: Dict[str, Any], ttl: Optional[float] = None):
+        await asyncio.to_thread(self.set, key, entry, ttl)
+
+
+def create_finchat_cache() -> FinChatResponseCache:
+    """
+    Build the default cache from the environment
+
+    FINCHAT_CACHE_PATH selects a persistent SQLite cache; otherwise results
+    are cached in memory for the lifetime of the process.
+    """
+    path = os.getenv("FINCHAT_CACHE_PATH")
+    if path:
+        return SQLiteCache(path)
+    return InMemoryCache(maxsize=100_000)
+
+
+def get_finchat_cache() -> FinChatResponseCache:
+    """Return the process-wide cache, creating it from the environment on first use"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = create_finchat_cache()
+    return _shared_cache
+
+
+def set_finchat_cache(cache: Optional[FinChatResponseCache]):
+    """
+    Replace the process-wide cache used by every StrategyParser / backtest
+
+    Pass None to rebuild it from the environment on next use.
+    """
+    global _shared_cache
+    _shared_cache = cache
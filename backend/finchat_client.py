@@ -6,11 +6,15 @@ import os
 import asyncio
 import aiohttp
 import logging
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterable, Tuple, Union
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# COT parameters that change on every call; rendered after the stable ones so
+# consecutive messages for a backtest share the longest possible prefix
+VOLATILE_COT_PARAMS = ("date", "yesterdays_price", "todays_price")
+
 
 class FinChatClient:
     """Client for interacting with FinChat API"""
@@ -71,7 +75,7 @@ class FinChatClient:
         cot_slug: str,
         ticker: str,
         session_id: Optional[str] = None,
-        additional_params: Optional[Dict[str, str]] = None,
+        additional_params: Optional[Union[Dict[str, str], Iterable[Tuple[str, str]]]] = None,
         max_poll_attempts: int = 60,
         poll_interval_seconds: int = 5
     ) -> Dict[str, Any]:
@@ -82,7 +86,8 @@ class FinChatClient:
             cot_slug: The COT slug identifier
             ticker: Ticker symbol to analyze
             session_id: Optional session ID (creates new if not provided)
-            additional_params: Additional parameters to pass to COT (e.g., {"date": "2024-01-01"})
+            additional_params: Additional parameters to pass to COT (e.g., {"date": "2024-01-01"}),
+                as a dict or ordered (key, value) pairs
             max_poll_attempts: Maximum number of polling attempts
             poll_interval_seconds: Seconds between polling attempts
         
@@ -93,17 +98,7 @@ class FinChatClient:
         if not session_id:
             session_id = await self.create_session(client_id=f"backtester-{datetime.now().timestamp()}")
         
-        # Construct COT message
-        # Use stock_symbol if provided in additional_params, otherwise use ticker
-        stock_symbol = additional_params.get("stock_symbol", ticker) if additional_params else ticker
-        cot_message = f"cot {cot_slug} $stock_symbol:{stock_symbol}"
-        
-        if additional_params:
-            for key, value in additional_params.items():
-                # Skip stock_symbol as we already added it, and ticker if stock_symbol was provided
-                if key == "stock_symbol" or (key == "ticker" and "stock_symbol" in additional_params):
-                    continue
-                cot_message += f" ${key}:{value}"
+        cot_message = self.build_cot_message(cot_slug, ticker, additional_params)
         
         # Send COT chat message
         cot_chat_id = await self._send_cot_message(session_id, cot_message)
@@ -129,6 +124,34 @@ class FinChatClient:
             "metadata": completion.get("metadata", {})
         }
     
+    @staticmethod
+    def build_cot_message(
+        cot_slug: str,
+        ticker: str,
+        additional_params: Optional[Union[Dict[str, str], Iterable[Tuple[str, str]]]] = None
+    ) -> str:
+        """
+        Render a COT chat message with a byte-stable parameter order
+        
+        The slug and stock symbol come first, then the remaining stable
+        parameters in the order given, then per-call values (VOLATILE_COT_PARAMS).
+        """
+        params = dict(additional_params or {})
+        
+        # Use stock_symbol if provided in additional_params, otherwise use ticker
+        # (an explicit stock_symbol also supersedes a "ticker" parameter)
+        if "stock_symbol" in params:
+            params.pop("ticker", None)
+        stock_symbol = params.pop("stock_symbol", ticker)
+        
+        stable = [(key, value) for key, value in params.items() if key not in VOLATILE_COT_PARAMS]
+        volatile = [(key, params[key]) for key in VOLATILE_COT_PARAMS if key in params]
+        
+        cot_message = f"cot {cot_slug} $stock_symbol:{stock_symbol}"
+        for key, value in stable + volatile:
+            cot_message += f" ${key}:{value}"
+        return cot_message
+    
     async def _send_cot_message(self, session_id: str, message: str) -> str:
         """Send a COT chat message"""
         url = f"{self.api_url}/api/v1/chats/"
@@ -1,14 +1,19 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .models import BacktestRequest
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, StreamingResponse
+from fastapi.routing import APIRoute
+from .models import BacktestRequest, BacktestBatchRequest, BacktestBatchDeleteRequest
 from .backtest_engine import BacktestEngine
 from .utils import validate_backtest_config, convert_numpy_types
 import uvicorn
+import asyncio
 import json
 import os
 import logging
 import uuid
-from typing import Dict
+import zlib
+from typing import Dict, List, Tuple
 from datetime import datetime
 
 # Configure logging
@@ -18,7 +23,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Largest request body accepted after gunzipping (guards against gzip bombs)
+MAX_DECOMPRESSED_BODY_BYTES = int(os.getenv("MAX_DECOMPRESSED_BODY_BYTES", 20 * 1024 * 1024))
+
+
+def gunzip_request_body(body: bytes, max_size: int = MAX_DECOMPRESSED_BODY_BYTES) -> bytes:
+    """
+    Decompress a gzip request body, producing at most max_size bytes
+    
+    Raises:
+        HTTPException: 413 if the body inflates past max_size, 400 if it is not valid gzip
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = decompressor.decompress(body, max_size)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Invalid gzip request body")
+    if decompressor.unconsumed_tail:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Decompressed request body exceeds {max_size} bytes"
+        )
+    if not decompressor.eof or decompressor.unused_data:
+        raise HTTPException(status_code=400, detail="Invalid gzip request body")
+    return data
+
+
+class GzipRequest(Request):
+    """Request whose body is transparently gunzipped when sent with Content-Encoding: gzip"""
+    
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            if "gzip" in self.headers.getlist("Content-Encoding"):
+                body = gunzip_request_body(body)
+            self._body = body
+        return self._body
+
+
+class GzipRoute(APIRoute):
+    """Route that accepts gzip-compressed request bodies"""
+    
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+        
+        async def route_handler(request: Request):
+            return await original_route_handler(GzipRequest(request.scope, request.receive))
+        
+        return route_handler
+
+
 app = FastAPI(title="Backtester Backend", version="1.0.0")
+app.router.route_class = GzipRoute
+
+# Compress larger responses (results JSON) for clients sending Accept-Encoding: gzip;
+# Starlette leaves text/event-stream responses uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # Configure CORS - allow requests from frontend
 # In production, set FRONTEND_URL environment variable or use Railway's domain
@@ -34,6 +94,65 @@ app.add_middleware(
 # Store for backtest results (in production, use a database)
 backtest_results: Dict[str, Dict] = {}
 backtest_status: Dict[str, str] = {}
+# Per-job event, set and replaced whenever the job's status changes
+status_changed: Dict[str, asyncio.Event] = {}
+
+TERMINAL_STATUSES = ("completed", "failed")
+# Comment line sent on idle streams so proxies keep the connection open
+STREAM_KEEPALIVE_SECONDS = 15
+# Longest a /backtest_status long poll (?wait=) is held open
+MAX_STATUS_WAIT_SECONDS = 30
+
+
+def set_backtest_status(job_id: str, status: str):
+    """Record a job's status and wake any status streams waiting on it"""
+    backtest_status[job_id] = status
+    event = status_changed.get(job_id)
+    if event is not None:
+        event.set()
+    status_changed[job_id] = asyncio.Event()
+
+
+def remove_backtest(job_id: str):
+    """Drop a job's status and results and wake any status streams waiting on it"""
+    backtest_results.pop(job_id, None)
+    backtest_status.pop(job_id, None)
+    event = status_changed.pop(job_id, None)
+    if event is not None:
+        event.set()
+
+
+def build_status_response(job_id: str, include_results: bool = False) -> Dict:
+    """
+    Status payload for a known job
+    
+    Once completed it carries the summary, and with include_results the full
+    results (or, for a failed job, its error details) too, so a client can
+    finish without a separate results request.
+    """
+    status = backtest_status[job_id]
+    
+    response = {
+        "job_id": job_id,
+        "status": status
+    }
+    
+    # If completed, include summary
+    if status == "completed" and job_id in backtest_results:
+        results = backtest_results[job_id]
+        summary = results.get("summary", {})
+        # Convert numpy types to native Python types for JSON serialization
+        response["summary"] = convert_numpy_types(summary)
+        if include_results:
+            # Stored results were already converted in execute_backtest
+            response["results"] = results
+    elif status == "failed" and include_results and job_id in backtest_results:
+        failure = backtest_results[job_id]
+        for key in ("error", "error_type", "error_traceback"):
+            if key in failure:
+                response[key] = failure[key]
+    
+    return response
 
 
 @app.get("/")
@@ -56,6 +175,20 @@ async def health_check():
     }
 
 
+def build_config_dict(request: BacktestRequest) -> Dict:
+    """Convert a BacktestRequest's Pydantic sections to the engine's config dict"""
+    return {
+        'marketData': request.data.marketData.dict() if request.data.marketData else {},
+        'strategy': request.data.strategy.dict() if request.data.strategy else {},
+        'portfolioRisk': request.data.portfolioRisk.dict() if request.data.portfolioRisk else {},
+        'tradingExecution': request.data.tradingExecution.dict() if request.data.tradingExecution else {},
+        'mtm': request.data.mtm.dict() if request.data.mtm else {},
+        'rebalancing': request.data.rebalancing.dict() if request.data.rebalancing else {},
+        'output': request.data.output.dict() if request.data.output else {},
+        'implementation': request.data.implementation.dict() if request.data.implementation else {}
+    }
+
+
 @app.post("/run_backtest")
 async def run_backtest(request: BacktestRequest, background_tasks: BackgroundTasks):
     """
@@ -70,17 +203,7 @@ async def run_backtest(request: BacktestRequest, background_tasks: BackgroundTas
     """
     logger.info(f"Received backtest request: {request.name}")
     
-    # Convert Pydantic model to dict for processing
-    config_dict = {
-        'marketData': request.data.marketData.dict() if request.data.marketData else {},
-        'strategy': request.data.strategy.dict() if request.data.strategy else {},
-        'portfolioRisk': request.data.portfolioRisk.dict() if request.data.portfolioRisk else {},
-        'tradingExecution': request.data.tradingExecution.dict() if request.data.tradingExecution else {},
-        'mtm': request.data.mtm.dict() if request.data.mtm else {},
-        'rebalancing': request.data.rebalancing.dict() if request.data.rebalancing else {},
-        'output': request.data.output.dict() if request.data.output else {},
-        'implementation': request.data.implementation.dict() if request.data.implementation else {}
-    }
+    config_dict = build_config_dict(request)
     
     # Validate configuration
     is_valid, error_msg = validate_backtest_config(config_dict)
@@ -92,7 +215,7 @@ async def run_backtest(request: BacktestRequest, background_tasks: BackgroundTas
     job_id = str(uuid.uuid4())
     
     # Initialize status
-    backtest_status[job_id] = "queued"
+    set_backtest_status(job_id, "queued")
     
     # Add backtest to background tasks
     background_tasks.add_task(execute_backtest, job_id, config_dict, request.name)
@@ -113,13 +236,71 @@ async def run_backtest(request: BacktestRequest, background_tasks: BackgroundTas
     }
 
 
+@app.post("/run_backtests")
+async def run_backtests(request: BacktestBatchRequest, background_tasks: BackgroundTasks):
+    """
+    Submit several backtest jobs in one request
+    
+    Every configuration is validated before any job is queued, so an invalid
+    entry rejects the whole batch.
+    
+    Args:
+        request: Batch of backtest configuration requests
+        background_tasks: FastAPI background tasks
+    
+    Returns:
+        Job IDs in the same order as the submitted configurations
+    """
+    logger.info(f"Received batch of {len(request.configs)} backtest requests")
+    
+    config_dicts = [build_config_dict(item) for item in request.configs]
+    
+    # Validate all configurations before queueing any
+    for index, config_dict in enumerate(config_dicts):
+        is_valid, error_msg = validate_backtest_config(config_dict)
+        if not is_valid:
+            logger.error(f"Invalid configuration at index {index}: {error_msg}")
+            raise HTTPException(status_code=400, detail=f"Config {index}: {error_msg}")
+    
+    jobs = []
+    for item, config_dict in zip(request.configs, config_dicts):
+        job_id = str(uuid.uuid4())
+        set_backtest_status(job_id, "queued")
+        jobs.append((job_id, config_dict, item.name))
+    
+    # One background task runs the batch concurrently (tasks added
+    # separately would run one after another)
+    background_tasks.add_task(execute_backtest_batch, jobs)
+    job_ids = [job_id for job_id, _, _ in jobs]
+    
+    logger.info(f"Backtest batch queued: {len(job_ids)} jobs")
+    
+    return {
+        "status": "queued",
+        "job_ids": job_ids,
+        "message": f"{len(job_ids)} backtests have been queued for execution"
+    }
+
+
 @app.get("/backtest_status/{job_id}")
-async def get_backtest_status(job_id: str):
+async def get_backtest_status(
+    job_id: str,
+    request: Request,
+    response: Response,
+    include_results: bool = False,
+    wait: float = 0
+):
     """
     Get the status of a backtest job
     
+    The response carries an ETag for the job's status; a request whose
+    If-None-Match still matches gets an empty 304.
+    
     Args:
         job_id: Backtest job ID
+        include_results: Inline the full results once the job has completed
+        wait: Long poll - hold the request up to this many seconds (capped at
+            MAX_STATUS_WAIT_SECONDS) until a running job's status changes
     
     Returns:
         Job status information
@@ -127,21 +308,60 @@ async def get_backtest_status(job_id: str):
     if job_id not in backtest_status:
         raise HTTPException(status_code=404, detail="Backtest job not found")
     
-    status = backtest_status[job_id]
+    if wait > 0 and backtest_status[job_id] not in TERMINAL_STATUSES:
+        try:
+            await asyncio.wait_for(status_changed[job_id].wait(), timeout=min(wait, MAX_STATUS_WAIT_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+        if job_id not in backtest_status:
+            raise HTTPException(status_code=404, detail="Backtest job not found")
     
-    response = {
-        "job_id": job_id,
-        "status": status
-    }
+    etag = f'"{backtest_status[job_id]}"'
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
     
-    # If completed, include summary
-    if status == "completed" and job_id in backtest_results:
-        results = backtest_results[job_id]
-        summary = results.get("summary", {})
-        # Convert numpy types to native Python types for JSON serialization
-        response["summary"] = convert_numpy_types(summary)
+    response.headers["ETag"] = etag
+    return build_status_response(job_id, include_results)
+
+
+@app.get("/backtest_status_stream/{job_id}")
+async def stream_backtest_status(job_id: str, include_results: bool = False):
+    """
+    Stream a job's status as Server-Sent Events
     
-    return response
+    Sends one `status` event now and one per status change, then closes
+    after a terminal status (completed / failed).
+    
+    Args:
+        job_id: Backtest job ID
+        include_results: Inline the full results in the `completed` event
+    
+    Returns:
+        text/event-stream response
+    """
+    if job_id not in backtest_status:
+        raise HTTPException(status_code=404, detail="Backtest job not found")
+    
+    async def events():
+        while job_id in backtest_status:
+            # Grab the event before reading the status so no change is missed
+            changed = status_changed[job_id]
+            payload = build_status_response(job_id, include_results)
+            yield f"event: status\ndata: {json.dumps(payload, default=str)}\n\n"
+            if payload["status"] in TERMINAL_STATUSES:
+                return
+            while True:
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=STREAM_KEEPALIVE_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.get("/backtest_results/{job_id}")
@@ -189,10 +409,7 @@ async def delete_backtest_results(job_id: str):
         raise HTTPException(status_code=404, detail="Backtest job not found")
     
     # Remove from storage
-    if job_id in backtest_results:
-        del backtest_results[job_id]
-    if job_id in backtest_status:
-        del backtest_status[job_id]
+    remove_backtest(job_id)
     
     return {
         "status": "success",
@@ -200,6 +417,36 @@ async def delete_backtest_results(job_id: str):
     }
 
 
+@app.post("/delete_backtests")
+async def delete_backtests(request: BacktestBatchDeleteRequest):
+    """
+    Delete several backtest jobs in one request
+    
+    Args:
+        request: Job IDs to delete
+    
+    Returns:
+        The deleted job IDs and those that were not found
+    """
+    deleted = []
+    not_found = []
+    for job_id in request.job_ids:
+        if job_id in backtest_status:
+            remove_backtest(job_id)
+            deleted.append(job_id)
+        else:
+            not_found.append(job_id)
+    
+    logger.info(f"Deleted {len(deleted)} backtests ({len(not_found)} not found)")
+    
+    return {
+        "status": "success",
+        "deleted": deleted,
+        "not_found": not_found,
+        "message": f"{len(deleted)} backtests deleted"
+    }
+
+
 @app.get("/list_backtests")
 async def list_backtests():
     """
@@ -242,7 +489,7 @@ async def execute_backtest(job_id: str, config: Dict, name: str):
     """
     try:
         logger.info(f"Starting backtest execution: {job_id}")
-        backtest_status[job_id] = "running"
+        set_backtest_status(job_id, "running")
         
         # Initialize backtest engine
         engine = BacktestEngine(config)
@@ -260,7 +507,7 @@ async def execute_backtest(job_id: str, config: Dict, name: str):
         
         # Store results
         backtest_results[job_id] = results
-        backtest_status[job_id] = "completed"
+        set_backtest_status(job_id, "completed")
         
         logger.info(f"Backtest completed successfully: {job_id}")
         
@@ -268,7 +515,6 @@ async def execute_backtest(job_id: str, config: Dict, name: str):
         import traceback
         error_traceback = traceback.format_exc()
         logger.error(f"Backtest failed: {job_id} - {str(e)}", exc_info=True)
-        backtest_status[job_id] = "failed"
         backtest_results[job_id] = {
             "status": "failed",
             "error": str(e),
@@ -277,6 +523,17 @@ async def execute_backtest(job_id: str, config: Dict, name: str):
             "job_id": job_id,
             "name": name
         }
+        set_backtest_status(job_id, "failed")
+
+
+async def execute_backtest_batch(jobs: List[Tuple[str, Dict, str]]):
+    """
+    Background task to execute a batch of backtests concurrently
+    
+    Args:
+        jobs: (job_id, config, name) for each backtest
+    """
+    await asyncio.gather(*(execute_backtest(job_id, config, name) for job_id, config, name in jobs))
 
 
 if __name__ == "__main__":
@@ -35,6 +35,7 @@ class StrategyDefinition(BaseModel):
     # FinChat exit COT thresholds
     upsideThreshold: Optional[float] = None  # Upside sell threshold percentage
     downsideThreshold: Optional[float] = None  # Downside sell threshold percentage
+    maxConcurrentFinchat: Optional[int] = None  # Cap on in-flight FinChat calls per bar
     
     positionSizingMethod: Optional[str] = None
     fixedDollarAmount: Optional[float] = None
@@ -141,3 +142,9 @@ class BacktestRequest(BaseModel):
     data: BacktestConfiguration
     timestamp: Optional[str] = None
 
+class BacktestBatchRequest(BaseModel):
+    configs: List[BacktestRequest]
+
+class BacktestBatchDeleteRequest(BaseModel):
+    job_ids: List[str]
+
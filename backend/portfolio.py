@@ -2,15 +2,16 @@
 Portfolio Management Module
 Handles portfolio state, positions, cash, and risk limits
 """
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 import logging
+import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     """Represents a single position in the portfolio"""
     ticker: str
@@ -20,6 +21,11 @@ class Position:
     entry_cost: float  # Including commissions and fees
     highest_price: float  # For trailing stops
     current_price: float = 0.0
+    entry_time_ns: Optional[int] = None  # entry_timestamp as epoch nanoseconds
+    
+    def __post_init__(self):
+        if self.entry_time_ns is None:
+            self.entry_time_ns = pd.Timestamp(self.entry_timestamp).value
     
     @property
     def current_value(self) -> float:
@@ -44,7 +50,7 @@ class Position:
         return (datetime.now() - self.entry_timestamp).days
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     """Represents a closed trade"""
     ticker: str
@@ -87,6 +93,7 @@ class Portfolio:
         
         # Value tracking
         self.portfolio_value = initial_capital
+        self._inv_portfolio_value = 1.0 / initial_capital if initial_capital else 0.0
         self.peak_value = initial_capital
         self.peak_value_today = initial_capital
         self.peak_value_this_week = initial_capital
@@ -97,6 +104,9 @@ class Portfolio:
         # Trading state
         self.trading_halted = False
         
+        # Risk-limit checks specialized for this configuration
+        self._check_chain = self._build_check_chain()
+        
         logger.info(f"Portfolio initialized with ${initial_capital:,.2f}")
     
     @property
@@ -112,9 +122,7 @@ class Portfolio:
     @property
     def current_leverage(self) -> float:
         """Current leverage ratio"""
-        if self.portfolio_value == 0:
-            return 0.0
-        return abs(self.total_position_value) / self.portfolio_value
+        return abs(self.total_position_value) * self._inv_portfolio_value
     
     @property
     def buying_power(self) -> float:
@@ -131,6 +139,8 @@ class Portfolio:
             Current portfolio value
         """
         self.portfolio_value = self.cash + self.total_position_value
+        # Cached reciprocal so ratio checks multiply instead of divide
+        self._inv_portfolio_value = 1.0 / self.portfolio_value if self.portfolio_value else 0.0
         
         # Update peaks
         if self.portfolio_value > self.peak_value:
@@ -143,7 +153,8 @@ class Portfolio:
         # Record in equity curve
         self.equity_curve.append((timestamp, self.portfolio_value))
         
-        logger.debug(f"Portfolio value: ${self.portfolio_value:,.2f}, Cash: ${self.cash:,.2f}, Positions: {len(self.positions)}")
+        logger.debug("Portfolio value: $%.2f, Cash: $%.2f, Positions: %d",
+                     self.portfolio_value, self.cash, len(self.positions))
         
         return self.portfolio_value
     
@@ -173,35 +184,80 @@ class Portfolio:
         if self.trading_halted:
             return False, "Trading is halted due to drawdown limits"
         
-        # Check single asset limit
-        if self.max_single_asset_percent is not None:
-            max_position_value = self.portfolio_value * (self.max_single_asset_percent / 100)
-            if position_value > max_position_value:
-                return False, f"Position size exceeds max single asset limit ({self.max_single_asset_percent}%)"
+        total_position_value = self.total_position_value
+        for check in self._check_chain:
+            ok, reason = check(position_value, total_position_value, sector)
+            if not ok:
+                return False, reason
+        
+        return True, "OK"
+    
+    def _build_check_chain(self) -> List[Callable[[float, float, Optional[str]], Tuple[bool, str]]]:
+        """
+        Build the list of risk-limit checks used by can_open_position
         
-        # Check leverage limit
-        if not self.leverage_allowed and position_value > self.cash:
-            return False, "Insufficient cash and leverage not allowed"
+        Limits are fixed at construction, so only the configured checks are
+        included and their percentage thresholds are converted to fractions once.
+        Each check takes (position_value, total_position_value, sector).
+        """
+        checks = []
         
+        # Single asset limit
+        if self.max_single_asset_percent is not None:
+            single_asset_frac = self.max_single_asset_percent / 100
+            single_asset_reason = f"Position size exceeds max single asset limit ({self.max_single_asset_percent}%)"
+            
+            def check_single_asset(position_value, total_position_value, sector):
+                if position_value > self.portfolio_value * single_asset_frac:
+                    return False, single_asset_reason
+                return True, "OK"
+            
+            checks.append(check_single_asset)
+        
+        # Leverage limit
         if self.leverage_allowed:
-            new_leverage = (self.total_position_value + position_value) / self.portfolio_value
-            if new_leverage > self.max_leverage:
-                return False, f"Would exceed max leverage ({self.max_leverage}x)"
+            max_leverage = self.max_leverage
+            leverage_reason = f"Would exceed max leverage ({self.max_leverage}x)"
+            
+            def check_leverage(position_value, total_position_value, sector):
+                if (total_position_value + position_value) * self._inv_portfolio_value > max_leverage:
+                    return False, leverage_reason
+                return True, "OK"
+        else:
+            def check_leverage(position_value, total_position_value, sector):
+                if position_value > self.cash:
+                    return False, "Insufficient cash and leverage not allowed"
+                return True, "OK"
         
-        # Check net exposure
+        checks.append(check_leverage)
+        
+        # Net exposure
         if self.max_net_exposure is not None:
-            new_exposure = ((self.total_position_value + position_value) / self.portfolio_value) * 100
-            if new_exposure > self.max_net_exposure:
-                return False, f"Would exceed max net exposure ({self.max_net_exposure}%)"
+            net_exposure_frac = self.max_net_exposure / 100
+            net_exposure_reason = f"Would exceed max net exposure ({self.max_net_exposure}%)"
+            
+            def check_net_exposure(position_value, total_position_value, sector):
+                if (total_position_value + position_value) * self._inv_portfolio_value > net_exposure_frac:
+                    return False, net_exposure_reason
+                return True, "OK"
+            
+            checks.append(check_net_exposure)
         
-        # Check sector limit (if provided)
-        if sector and self.max_sector_percent is not None:
-            sector_exposure = self._calculate_sector_exposure(sector)
-            new_sector_exposure = ((sector_exposure + position_value) / self.portfolio_value) * 100
-            if new_sector_exposure > self.max_sector_percent:
-                return False, f"Would exceed max sector exposure ({self.max_sector_percent}%)"
+        # Sector limit (only applies when a sector is provided)
+        if self.max_sector_percent is not None:
+            sector_frac = self.max_sector_percent / 100
+            sector_reason = f"Would exceed max sector exposure ({self.max_sector_percent}%)"
+            
+            def check_sector(position_value, total_position_value, sector):
+                if sector:
+                    sector_exposure = self._calculate_sector_exposure(sector)
+                    if (sector_exposure + position_value) * self._inv_portfolio_value > sector_frac:
+                        return False, sector_reason
+                return True, "OK"
+            
+            checks.append(check_sector)
         
-        return True, "OK"
+        return checks
     
     def open_position(
         self,
@@ -225,7 +281,7 @@ class Portfolio:
             True if position opened successfully
         """
         if ticker in self.positions:
-            logger.warning(f"Position already exists for {ticker}, adding to existing position")
+            logger.warning("Position already exists for %s, adding to existing position", ticker)
             # Add to existing position
             existing = self.positions[ticker]
             total_shares = existing.shares + shares
@@ -250,7 +306,7 @@ class Portfolio:
         # Deduct cost from cash
         self.cash -= total_cost
         
-        logger.info(f"Opened position: {ticker} - {shares} shares @ ${entry_price:.2f}")
+        logger.info("Opened position: %s - %s shares @ $%.2f", ticker, shares, entry_price)
         return True
     
     def close_position(
@@ -259,7 +315,8 @@ class Portfolio:
         exit_price: float,
         exit_timestamp: datetime,
         exit_proceeds: float,
-        exit_reason: str = ""
+        exit_reason: str = "",
+        gross_exit_value: Optional[float] = None
     ) -> Optional[Trade]:
         """
         Close an existing position
@@ -270,12 +327,13 @@ class Portfolio:
             exit_timestamp: Timestamp of exit
             exit_proceeds: Net proceeds after commissions and fees
             exit_reason: Reason for exit
+            gross_exit_value: abs(shares) * exit price before costs, if already known
         
         Returns:
             Trade object if successful, None otherwise
         """
         if ticker not in self.positions:
-            logger.error(f"Cannot close position - {ticker} not in portfolio")
+            logger.error("Cannot close position - %s not in portfolio", ticker)
             return None
         
         position = self.positions[ticker]
@@ -287,6 +345,11 @@ class Portfolio:
         # Calculate holding period
         holding_period = (exit_timestamp - position.entry_timestamp).days
         
+        # Exit-side costs only (commissions and fees paid on the sale)
+        if gross_exit_value is None:
+            gross_exit_value = abs(position.shares) * exit_price
+        exit_cost = gross_exit_value - exit_proceeds
+        
         # Create trade record
         trade = Trade(
             ticker=ticker,
@@ -298,7 +361,7 @@ class Portfolio:
             pnl=pnl,
             pnl_percent=pnl_percent,
             entry_cost=position.entry_cost,
-            exit_cost=position.entry_cost + position.shares * exit_price - exit_proceeds,
+            exit_cost=exit_cost,
             holding_period_days=holding_period,
             exit_reason=exit_reason
         )
@@ -312,7 +375,8 @@ class Portfolio:
         # Record trade
         self.closed_trades.append(trade)
         
-        logger.info(f"Closed position: {ticker} - P&L: ${pnl:.2f} ({pnl_percent:.2f}%) - Reason: {exit_reason}")
+        logger.info("Closed position: %s - P&L: $%.2f (%.2f%%) - Reason: %s",
+                    ticker, pnl, pnl_percent, exit_reason)
         
         return trade
     
@@ -399,4 +463,3 @@ class Portfolio:
             'avg_loss': sum(t.pnl for t in losing_trades) / len(losing_trades) if losing_trades else 0,
             'avg_holding_period': sum(t.holding_period_days for t in self.closed_trades) / len(self.closed_trades)
         }
-
@@ -0,0 +1,193 @@
+"""
+Signal Expression Module
+Compiles symbolic strategy expressions (e.g. "ma(close, 5) > ma(close, 20)")
+into code objects evaluated over whole per-ticker column arrays
+"""
+import ast
+from functools import lru_cache
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Market data columns an expression may reference
+COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _sma(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average (NaN until `window` rows exist)"""
+    window = int(window)
+    return pd.Series(values).rolling(window, min_periods=window).mean().to_numpy()
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    """Exponential moving average"""
+    return pd.Series(values).ewm(span=int(span), adjust=False).mean().to_numpy()
+
+
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Value `periods` rows earlier (NaN where unavailable)"""
+    return pd.Series(values).shift(int(periods)).to_numpy()
+
+
+# Vectorized functions an expression may call
+FUNCTIONS = {
+    'ma': _sma,
+    'sma': _sma,
+    'ema': _ema,
+    'shift': _shift,
+    'abs': np.abs,
+    'max': np.maximum,
+    'min': np.minimum,
+}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.USub, ast.UAdd, ast.Invert, ast.BitAnd, ast.BitOr,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+
+class _ToArrayOps(ast.NodeTransformer):
+    """Rewrite boolean syntax into element-wise array operators"""
+
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(left=result, op=op, right=value)
+        return result
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(op=ast.Invert(), operand=node.operand)
+        return node
+
+    def visit_Compare(self, node: ast.Compare) -> ast.AST:
+        self.generic_visit(node)
+        # a < b < c  ->  (a < b) & (b < c)
+        parts = []
+        left = node.left
+        for op, right in zip(node.ops, node.comparators):
+            parts.append(ast.Compare(left=left, ops=[op], comparators=[right]))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(left=result, op=ast.BitAnd(), right=part)
+        return result
+
+
+# Allowed positional argument counts per function
+_ARITY = {
+    'ma': (2, 2),
+    'sma': (2, 2),
+    'ema': (2, 2),
+    'shift': (1, 2),
+    'abs': (1, 1),
+    'max': (2, 2),
+    'min': (2, 2),
+}
+
+# Functions whose second argument is a row count, with the smallest allowed value
+_PERIOD_MINIMUM = {
+    'ma': 1,
+    'sma': 1,
+    'ema': 1,
+    # A negative shift would read future bars
+    'shift': 0,
+}
+
+
+def _check_call_args(node: ast.Call):
+    """Reject calls with the wrong arity or a window/period that is not an int literal in range"""
+    name = node.func.id
+    low, high = _ARITY[name]
+    if not low <= len(node.args) <= high:
+        expected = str(low) if low == high else f"{low} to {high}"
+        raise ValueError(f"{name}() takes {expected} arguments, got {len(node.args)}")
+    if name in _PERIOD_MINIMUM and len(node.args) == 2:
+        period = node.args[1]
+        minimum = _PERIOD_MINIMUM[name]
+        if not (
+            isinstance(period, ast.Constant)
+            and type(period.value) is int
+            and period.value >= minimum
+        ):
+            raise ValueError(
+                f"{name}() period must be an integer literal >= {minimum}, got {ast.unparse(period)!r}"
+            )
+
+
+@lru_cache(maxsize=128)
+def compile_expression(text: Optional[str], boolean: bool = False):
+    """
+    Compile a symbolic expression into a code object
+
+    Args:
+        text: Expression over COLUMNS and FUNCTIONS, e.g. "ma(close, 5) > ma(close, 20)"
+        boolean: Require a condition (comparison / and / or / not) at the top level
+
+    Returns:
+        Code object for evaluate_expression, or None if the text is not a
+        supported expression (e.g. a natural-language description)
+
+    Raises:
+        ValueError: If a function is called with the wrong number of arguments,
+            or a ma/sma/ema window or shift period is not an integer literal in
+            range (positive windows, non-negative shifts)
+    """
+    if not text:
+        return None
+
+    try:
+        tree = ast.parse(text.strip(), mode='eval')
+    except SyntaxError:
+        return None
+
+    if boolean:
+        top = tree.body
+        if not isinstance(top, (ast.Compare, ast.BoolOp)) and not (
+            isinstance(top, ast.UnaryOp) and isinstance(top.op, ast.Not)
+        ):
+            return None
+
+    tree = ast.fix_missing_locations(_ToArrayOps().visit(tree))
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            return None
+        if isinstance(node, ast.Name) and node.id not in COLUMNS and node.id not in FUNCTIONS:
+            return None
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords
+        ):
+            return None
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            return None
+        if isinstance(node, ast.Call):
+            _check_call_args(node)
+
+    return compile(tree, '<signal expression>', 'eval')
+
+
+def evaluate_expression(code, frame: pd.DataFrame) -> np.ndarray:
+    """
+    Evaluate a compiled expression over one ticker's time-sorted rows
+
+    Args:
+        code: Result of compile_expression
+        frame: Rows for a single ticker, oldest first
+
+    Returns:
+        Array aligned with the frame's rows
+    """
+    namespace: Dict[str, object] = dict(FUNCTIONS)
+    for column in COLUMNS:
+        if column in frame.columns:
+            namespace[column] = frame[column].to_numpy(dtype=np.float64)
+
+    result = eval(code, {'__builtins__': {}}, namespace)
+    return np.broadcast_to(np.asarray(result), (len(frame),))
@@ -2,8 +2,9 @@
 Simple pre-defined strategies for testing
 """
 from datetime import datetime
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Dict, Optional
 
 
 class RotationStrategy:
@@ -12,29 +13,65 @@ class RotationStrategy:
     def __init__(self, buy_every_n_days: int, hold_for_days: int):
         self.buy_every_n_days = buy_every_n_days
         self.hold_for_days = hold_for_days
-        self.last_entry_date = None
-        self.days_since_last_entry = 0
+        
+        # Entry schedule, computed once per market data frame
+        self._entry_mask: Optional[np.ndarray] = None
+        self._bar_index: Dict[pd.Timestamp, int] = {}
+        self._entry_mask_source: Optional[pd.DataFrame] = None
+    
+    def prepare(self, market_data: pd.DataFrame):
+        """Build the entry schedule for market_data (usable as a strategy prepare hook)"""
+        self.precompute(market_data.index.get_level_values('timestamp').unique().sort_values())
+        self._entry_mask_source = market_data
     
-    def entry_signal(self, market_data: pd.DataFrame, ticker: str, timestamp: datetime) -> bool:
+    def precompute(self, timestamps) -> np.ndarray:
         """
-        Generate entry signal: Buy every N days
+        Precompute the entry schedule for all bar timestamps
+        
+        The first bar is an entry, and each following entry is the first bar at
+        least N calendar days after the previous one.
+        
+        Args:
+            timestamps: Sorted bar timestamps (array-like of datetime64)
+        
+        Returns:
+            Boolean entry mask aligned with timestamps
         """
-        # On first day, buy
-        if self.last_entry_date is None:
-            self.last_entry_date = timestamp
-            self.days_since_last_entry = 0
-            return True
+        timestamps = pd.DatetimeIndex(timestamps)
+        day_offsets = (timestamps.values - timestamps.values[0]).astype('timedelta64[D]').astype(np.int64)
         
-        # Calculate days since last entry
-        days_diff = (timestamp - self.last_entry_date).days
+        entry_mask = np.zeros(len(day_offsets), dtype=bool)
+        last_entry_day = None
+        for i, day in enumerate(day_offsets.tolist()):
+            if last_entry_day is None or day - last_entry_day >= self.buy_every_n_days:
+                entry_mask[i] = True
+                last_entry_day = day
         
-        # If it's been N days or more, buy again
-        if days_diff >= self.buy_every_n_days:
-            self.last_entry_date = timestamp
-            self.days_since_last_entry = 0
-            return True
+        self._entry_mask = entry_mask
+        self._bar_index = {ts: i for i, ts in enumerate(timestamps)}
+        return entry_mask
+    
+    def entry_signal(
+        self,
+        market_data: pd.DataFrame,
+        ticker: str,
+        timestamp: datetime,
+        bar_index: Optional[int] = None
+    ) -> bool:
+        """
+        Generate entry signal: Buy every N days
         
-        return False
+        Callers that already know the bar's position in the timeline can pass
+        bar_index to skip the timestamp lookup.
+        """
+        if market_data is not self._entry_mask_source:
+            self.prepare(market_data)
+        
+        if bar_index is None:
+            bar_index = self._bar_index.get(timestamp)
+            if bar_index is None:
+                return False
+        return bool(self._entry_mask[bar_index])
     
     def exit_signal(
         self, 
@@ -63,11 +100,11 @@ def create_rotation_strategy_functions(buy_every_n_days: int, hold_for_days: int
     """
     strategy = RotationStrategy(buy_every_n_days, hold_for_days)
     
-    def entry_func(market_data, ticker, timestamp):
-        return strategy.entry_signal(market_data, ticker, timestamp)
+    # Hand out the bound method directly rather than wrapping it in another frame
+    entry_func = strategy.entry_signal
     
-    def exit_func(market_data, ticker, timestamp, position):
-        return strategy.exit_signal(market_data, ticker, timestamp, position)
+    # Exits are handled by the time-based exit in the strategy engine
+    exit_func = lambda market_data, ticker, timestamp, position: False
     
     return entry_func, exit_func
 
@@ -3,13 +3,150 @@ Strategy Engine Module
 Handles signal generation, position sizing, and exit conditions
 """
 from typing import Dict, Optional, Callable, List, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+import math
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
+import asyncio
+import heapq
+
+from .signal_expressions import compile_expression, evaluate_expression
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+def _sma_crossover_kernel(close: np.ndarray, fast: int = 5, slow: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Running-sum fast/slow SMA crossover over one ticker's close series
+    
+    Keeps NaN-aware window sums so each bar is O(1) instead of re-averaging
+    the window. No signal is emitted until `slow` rows of history exist.
+    
+    Returns:
+        (fast > slow, fast < slow) boolean arrays aligned with `close`
+    """
+    n = close.shape[0]
+    above = np.zeros(n, dtype=np.bool_)
+    below = np.zeros(n, dtype=np.bool_)
+    sum_fast = 0.0
+    sum_slow = 0.0
+    count_fast = 0
+    count_slow = 0
+    for i in range(n):
+        x = close[i]
+        if not np.isnan(x):
+            sum_fast += x
+            sum_slow += x
+            count_fast += 1
+            count_slow += 1
+        if i >= fast:
+            old = close[i - fast]
+            if not np.isnan(old):
+                sum_fast -= old
+                count_fast -= 1
+        if i >= slow:
+            old = close[i - slow]
+            if not np.isnan(old):
+                sum_slow -= old
+                count_slow -= 1
+        if i >= slow - 1 and count_fast > 0 and count_slow > 0:
+            ma_fast = sum_fast / count_fast
+            ma_slow = sum_slow / count_slow
+            above[i] = ma_fast > ma_slow
+            below[i] = ma_fast < ma_slow
+    return above, below
+
+
+def _sma_crossover_pandas(close: np.ndarray, fast: int = 5, slow: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """Fallback for _sma_crossover_kernel when numba is not installed"""
+    series = pd.Series(close)
+    ma_fast = series.rolling(fast, min_periods=1).mean().to_numpy(dtype=float, copy=True)
+    ma_slow = series.rolling(slow, min_periods=1).mean().to_numpy(dtype=float, copy=True)
+    ma_slow[:slow - 1] = np.nan
+    return ma_fast > ma_slow, ma_fast < ma_slow
+
+
+if NUMBA_AVAILABLE:
+    _sma_crossover_nan_aware = njit(cache=True)(_sma_crossover_kernel)
+else:
+    _sma_crossover_nan_aware = _sma_crossover_pandas
+
+
+def _sma_crossover_talib(close: np.ndarray, fast: int = 5, slow: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+    """TA-Lib SMA crossover; series with gaps use the NaN-aware path instead"""
+    if np.isnan(close).any():
+        return _sma_crossover_nan_aware(close, fast, slow)
+    ma_fast = talib.SMA(close, timeperiod=fast)
+    ma_slow = talib.SMA(close, timeperiod=slow)
+    return ma_fast > ma_slow, ma_fast < ma_slow
+
+
+_sma_crossover_signals = _sma_crossover_talib if TALIB_AVAILABLE else _sma_crossover_nan_aware
+
+
+NS_PER_DAY = 86_400_000_000_000
+
+
+@dataclass
+class OpenBook:
+    """Column-wise (SoA) snapshot of open positions for batched exit checks"""
+    entry_price: np.ndarray  # float64
+    current_price: np.ndarray  # float64
+    highest_price: np.ndarray  # float64
+    entry_time_ns: np.ndarray  # int64, epoch nanoseconds
+    ticker_idx: np.ndarray  # int32, column in the strategy's signal cache (-1 if unknown)
+    
+    def __len__(self) -> int:
+        return len(self.entry_price)
+    
+    @classmethod
+    def from_positions(
+        cls,
+        positions: List['Position'],
+        ticker_idx: Optional[Dict[str, int]] = None
+    ) -> 'OpenBook':
+        """Pack Position objects into column arrays (row i is positions[i])"""
+        n = len(positions)
+        ticker_idx = ticker_idx or {}
+        return cls(
+            entry_price=np.fromiter((p.entry_price for p in positions), dtype=np.float64, count=n),
+            current_price=np.fromiter((p.current_price for p in positions), dtype=np.float64, count=n),
+            highest_price=np.fromiter((p.highest_price for p in positions), dtype=np.float64, count=n),
+            entry_time_ns=np.fromiter((p.entry_time_ns for p in positions), dtype=np.int64, count=n),
+            ticker_idx=np.fromiter((ticker_idx.get(p.ticker, -1) for p in positions), dtype=np.int32, count=n),
+        )
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, in O(n) without a full sort
+    
+    NaN scores rank last; ties keep their original order.
+    """
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    n = len(scores)
+    kth = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[:k - len(above)]
+    chosen = np.concatenate([above, ties])
+    return chosen[np.lexsort((chosen, -scores[chosen]))]
+
+
 class StrategyEngine:
     """Manages strategy signals and position sizing"""
     
@@ -29,7 +166,8 @@ class StrategyEngine:
         ranking_logic: Optional[str] = None,
         stop_loss_type: str = "fixed-percent",
         use_trailing_stops: bool = False,
-        trailing_stop_distance: Optional[float] = None
+        trailing_stop_distance: Optional[float] = None,
+        max_concurrent_finchat: Optional[int] = None
     ):
         self.entry_logic = entry_logic
         self.exit_logic = exit_logic
@@ -50,12 +188,214 @@ class StrategyEngine:
         self.use_trailing_stops = use_trailing_stops
         self.trailing_stop_distance = trailing_stop_distance
         
+        # Percent settings as fractions, so hot-path checks only multiply
+        self._stop_loss_frac = stop_loss / 100 if stop_loss is not None else None
+        self._take_profit_frac = take_profit / 100 if take_profit is not None else None
+        self._trailing_stop_frac = trailing_stop_distance / 100 if trailing_stop_distance is not None else None
+        self._portfolio_frac = portfolio_percent / 100 if portfolio_percent is not None else None
+        self._risk_frac = risk_percent / 100 if risk_percent is not None else None
+        
+        # Holding period for the time-based exit in ns; "at least N whole days"
+        # is equivalent to "at least ceil(N) days" of elapsed time
+        self._time_exit_ns = (
+            math.ceil(time_based_exit) * NS_PER_DAY if time_based_exit is not None else None
+        )
+        
+        # Position sizing function for position_sizing_method, bound once
+        self._size_fn = self._select_size_fn()
+        
+        # Symbolic entry/exit expressions, compiled once (None for plain-text logic)
+        self._entry_expr = compile_expression(entry_logic, boolean=True)
+        self._exit_expr = compile_expression(exit_logic, boolean=True)
+        self._ranking_expr = compile_expression(ranking_logic)
+        
         # Compiled signal functions
         self.entry_signal_func: Optional[Callable] = None
         self.exit_signal_func: Optional[Callable] = None
         
+        # Dispatch flags for the signal functions, cached by the setters
+        self._entry_is_finchat = False
+        self._entry_async_func: Optional[Callable] = None
+        self._exit_is_finchat = False
+        self._exit_async_func: Optional[Callable] = None
+        
+        # Optional hook run by prepare() so custom signal functions can
+        # precompute their own per-backtest lookups
+        self.prepare_func: Optional[Callable] = None
+        
+        # Bound on in-flight FinChat calls per bar (semaphore created on first use)
+        self.max_concurrent_finchat = max_concurrent_finchat
+        self._finchat_semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Default-logic signals, precomputed per backtest as
+        # [n_timestamps, n_tickers] boolean matrices (see precompute_signal_cache)
+        self._signal_cache_source: Optional[pd.DataFrame] = None
+        self._entry_signals: Optional[np.ndarray] = None
+        self._exit_signals: Optional[np.ndarray] = None
+        self._scores: Optional[np.ndarray] = None  # ranking_logic scores, if compiled
+        self._time_idx: Dict[pd.Timestamp, int] = {}
+        self.ticker_idx: Dict[str, int] = {}
+        self.idx_ticker: List[str] = []
+        self._present: Optional[np.ndarray] = None  # [n_timestamps, n_tickers]: row exists at bar
+        
+        # Per-ticker time-sorted frames (ticker level dropped)
+        self._by_ticker: Dict[str, pd.DataFrame] = {}
+        self._by_ticker_source: Optional[pd.DataFrame] = None
+        
+        # Memoized default-logic MAs for data without a prepared signal cache
+        self._ma_pair = lru_cache(maxsize=4096)(self._compute_ma_pair)
+        self._ma_pair_source: Optional[pd.DataFrame] = None
+        
         logger.info("Strategy engine initialized")
     
+    def prepare(self, market_data: pd.DataFrame):
+        """
+        Precompute per-backtest lookup structures (call once before the bar loop)
+        
+        Args:
+            market_data: Market data DataFrame with (timestamp, ticker) MultiIndex
+        """
+        self.precompute_ticker_frames(market_data)
+        self.precompute_signal_cache(market_data)
+        if self.prepare_func is not None:
+            self.prepare_func(market_data)
+    
+    def precompute_ticker_frames(self, market_data: pd.DataFrame):
+        """Split market data into a ticker -> time-sorted DataFrame dict"""
+        self._by_ticker = {
+            ticker: ticker_data.droplevel('ticker')
+            for ticker, ticker_data in market_data.sort_index().groupby(level='ticker', sort=False)
+        }
+        self._by_ticker_source = market_data
+    
+    def _ticker_history(self, market_data: pd.DataFrame, ticker: str) -> Optional[pd.DataFrame]:
+        """Time-sorted rows for one ticker, or None if the ticker has no data"""
+        if market_data is self._by_ticker_source:
+            return self._by_ticker.get(ticker)
+        if ticker not in market_data.index.unique(level='ticker'):
+            return None
+        return market_data.xs(ticker, level='ticker').sort_index()
+    
+    def precompute_signal_cache(self, market_data: pd.DataFrame):
+        """
+        Precompute the entry/exit signals used by the default logic
+        
+        Symbolic entry/exit expressions (see signal_expressions) are evaluated
+        over each ticker's full history; otherwise the 5/20-bar MA crossover is
+        used, which fires only once a ticker has 20 rows of history.
+        
+        Each bar maps to the ticker's latest row at or before that bar, matching
+        a per-call "rows up to timestamp" lookup.
+        """
+        timestamps = market_data.index.get_level_values('timestamp').unique().sort_values()
+        tickers = market_data.index.get_level_values('ticker').unique()
+        
+        self._time_idx = {ts: i for i, ts in enumerate(timestamps)}
+        self.ticker_idx = {ticker: i for i, ticker in enumerate(tickers)}
+        self.idx_ticker = list(tickers)
+        self._present = np.zeros((len(timestamps), len(tickers)), dtype=bool)
+        self._present[
+            timestamps.get_indexer(market_data.index.get_level_values('timestamp')),
+            tickers.get_indexer(market_data.index.get_level_values('ticker'))
+        ] = True
+        self._entry_signals = np.zeros((len(timestamps), len(tickers)), dtype=bool)
+        self._exit_signals = np.zeros((len(timestamps), len(tickers)), dtype=bool)
+        self._scores = None
+        if self._ranking_expr is not None:
+            self._scores = np.full((len(timestamps), len(tickers)), np.nan)
+        self._signal_cache_source = market_data
+        
+        if market_data is not self._by_ticker_source:
+            self.precompute_ticker_frames(market_data)
+        
+        use_crossover = self._entry_expr is None or self._exit_expr is None
+        for ticker, ticker_data in self._by_ticker.items():
+            above = below = None
+            if use_crossover and 'close' in ticker_data.columns:
+                above, below = _sma_crossover_signals(ticker_data['close'].to_numpy(dtype=np.float64), 5, 20)
+            
+            if self._entry_expr is not None:
+                above = self._evaluate_signal_expression(self._entry_expr, ticker_data, ticker)
+            if self._exit_expr is not None:
+                below = self._evaluate_signal_expression(self._exit_expr, ticker_data, ticker)
+            
+            ticker_times = ticker_data.index.values
+            rows = np.searchsorted(ticker_times, timestamps.values, side='right') - 1
+            has_row = rows >= 0
+            col = self.ticker_idx[ticker]
+            if above is not None:
+                self._entry_signals[has_row, col] = above[rows[has_row]]
+            if below is not None:
+                self._exit_signals[has_row, col] = below[rows[has_row]]
+            if self._scores is not None:
+                scores = self._evaluate_signal_expression(self._ranking_expr, ticker_data, ticker, np.float64)
+                self._scores[has_row, col] = scores[rows[has_row]]
+        
+        logger.info(f"Precomputed entry/exit signals for {len(tickers)} tickers over {len(timestamps)} bars")
+    
+    def _evaluate_signal_expression(
+        self,
+        code,
+        ticker_data: pd.DataFrame,
+        ticker: str,
+        dtype=bool
+    ) -> np.ndarray:
+        """Evaluate a compiled expression for one ticker (all False / NaN on error)"""
+        try:
+            return evaluate_expression(code, ticker_data).astype(dtype)
+        except Exception as e:
+            logger.error("Error evaluating expression for %s: %s", ticker, e)
+            if dtype is bool:
+                return np.zeros(len(ticker_data), dtype=bool)
+            return np.full(len(ticker_data), np.nan)
+    
+    def _ticker_columns(self, tickers: List[str]) -> Optional[np.ndarray]:
+        """Signal-cache column per ticker, or None if any ticker is not cached"""
+        try:
+            return np.fromiter((self.ticker_idx[ticker] for ticker in tickers), dtype=np.intp, count=len(tickers))
+        except KeyError:
+            return None
+    
+    def _signal_cache_lookup(
+        self,
+        market_data: pd.DataFrame,
+        ticker: str,
+        timestamp: datetime
+    ) -> Optional[Tuple[int, int]]:
+        """Return (time_idx, ticker_idx) into the signal cache, or None if not cached"""
+        if market_data is not self._signal_cache_source:
+            return None
+        t_idx = self._time_idx.get(timestamp)
+        tk_idx = self.ticker_idx.get(ticker)
+        if t_idx is None or tk_idx is None:
+            return None
+        return t_idx, tk_idx
+    
+    def _default_entry_signals(
+        self,
+        market_data: pd.DataFrame,
+        timestamp: datetime,
+        eligible_tickers: List[str]
+    ) -> Optional[List[str]]:
+        """
+        Vectorized default entry logic over all eligible tickers at one bar
+        
+        Returns:
+            List of tickers with entry signals, or None if the signal cache does not
+            cover this bar/universe (caller falls back to the per-ticker loop)
+        """
+        if market_data is not self._signal_cache_source or not eligible_tickers:
+            return None
+        t_idx = self._time_idx.get(timestamp)
+        if t_idx is None:
+            return None
+        cols = self._ticker_columns(eligible_tickers)
+        if cols is None:
+            return None
+        
+        mask = self._entry_signals[t_idx]
+        return [self.idx_ticker[col] for col in cols[mask[cols]]]
+    
     async def generate_entry_signals_async(
         self,
         market_data: pd.DataFrame,
@@ -73,15 +413,26 @@ class StrategyEngine:
         Returns:
             List of tickers with entry signals
         """
-        signals = []
+        # Default logic with a prepared cache: one row compare for all tickers
+        if self.entry_signal_func is None and self.entry_logic:
+            fast_signals = self._default_entry_signals(market_data, timestamp, eligible_tickers)
+            if fast_signals is not None:
+                return fast_signals
         
-        for ticker in eligible_tickers:
-            try:
-                if await self._check_entry_signal_async(market_data, ticker, timestamp):
-                    signals.append(ticker)
-            except Exception as e:
-                logger.error(f"Error checking entry signal for {ticker}: {str(e)}")
-                continue
+        results = await asyncio.gather(
+            *[self._check_entry_signal_async(market_data, ticker, timestamp) for ticker in eligible_tickers],
+            return_exceptions=True
+        )
+        
+        signals = []
+        for ticker, result in zip(eligible_tickers, results):
+            if isinstance(result, BaseException):
+                # Cancellation (and other non-Exception exits) must propagate, not read as a signal
+                if not isinstance(result, Exception):
+                    raise result
+                logger.error("Error checking entry signal for %s: %s", ticker, result)
+            elif result:
+                signals.append(ticker)
         
         return signals
     
@@ -102,17 +453,28 @@ class StrategyEngine:
         Returns:
             List of tickers with entry signals
         """
-        signals = []
+        # Default logic with a prepared cache: one row compare for all tickers
+        if self.entry_signal_func is None and self.entry_logic:
+            fast_signals = self._default_entry_signals(market_data, timestamp, eligible_tickers)
+            if fast_signals is not None:
+                return fast_signals
+        
+        mask = np.zeros(len(eligible_tickers), dtype=bool)
         
-        for ticker in eligible_tickers:
+        for i, ticker in enumerate(eligible_tickers):
             try:
-                if self._check_entry_signal(market_data, ticker, timestamp):
-                    signals.append(ticker)
+                mask[i] = bool(self._check_entry_signal(market_data, ticker, timestamp))
             except Exception as e:
-                logger.error(f"Error checking entry signal for {ticker}: {str(e)}")
+                logger.error("Error checking entry signal for %s: %s", ticker, e)
                 continue
         
-        return signals
+        return [eligible_tickers[i] for i in np.flatnonzero(mask)]
+    
+    def _get_finchat_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent FinChat signal calls"""
+        if self._finchat_semaphore is None:
+            self._finchat_semaphore = asyncio.Semaphore(self.max_concurrent_finchat or 16)
+        return self._finchat_semaphore
     
     async def _check_entry_signal_async(
         self,
@@ -126,10 +488,11 @@ class StrategyEngine:
         # If custom entry function is provided, check if it's FinChat-based
         if self.entry_signal_func is not None:
             # Check if this is a FinChat function
-            if hasattr(self.entry_signal_func, '_is_finchat') and self.entry_signal_func._is_finchat:
+            if self._entry_is_finchat:
                 # Call the async function
-                if hasattr(self.entry_signal_func, '_async_func'):
-                    return await self.entry_signal_func._async_func(market_data, ticker, timestamp)
+                if self._entry_async_func is not None:
+                    async with self._get_finchat_semaphore():
+                        return await self._entry_async_func(market_data, ticker, timestamp)
             else:
                 # Regular sync function
                 return self.entry_signal_func(market_data, ticker, timestamp)
@@ -137,7 +500,8 @@ class StrategyEngine:
         # If entry logic string is provided but no custom function was set,
         # try default logic (fallback)
         if self.entry_logic:
-            logger.debug(f"No custom entry function set, using default logic for {ticker}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("No custom entry function set, using default logic for %s", ticker)
             return self._default_entry_logic(market_data, ticker, timestamp)
         
         # No entry logic defined - return False
@@ -160,7 +524,7 @@ class StrategyEngine:
         # If custom entry function is provided, use it
         if self.entry_signal_func is not None:
             # Check if this is a FinChat function (needs async handling)
-            if hasattr(self.entry_signal_func, '_is_finchat') and self.entry_signal_func._is_finchat:
+            if self._entry_is_finchat:
                 # For FinChat, we need async handling - return False here, will be handled in async version
                 logger.warning("FinChat entry signal detected but called from sync context - use async version")
                 return False
@@ -169,12 +533,81 @@ class StrategyEngine:
         # If entry logic string is provided but no custom function was set,
         # try default logic (fallback)
         if self.entry_logic:
-            logger.debug(f"No custom entry function set, using default logic for {ticker}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("No custom entry function set, using default logic for %s", ticker)
             return self._default_entry_logic(market_data, ticker, timestamp)
         
         # No entry logic defined - return False
         return False
     
+    def _expression_value_at(
+        self,
+        code,
+        market_data: pd.DataFrame,
+        ticker: str,
+        timestamp: datetime,
+        dtype=bool
+    ):
+        """Evaluate a compiled expression for one ticker at one bar (None if no history)"""
+        ticker_data = self._ticker_history(market_data, ticker)
+        if ticker_data is None:
+            return None
+        
+        history = ticker_data.loc[:timestamp]
+        if history.empty:
+            return None
+        return self._evaluate_signal_expression(code, history, ticker, dtype)[-1]
+    
+    def _recent_closes(
+        self,
+        market_data: pd.DataFrame,
+        ticker: str,
+        timestamp: datetime,
+        window: int
+    ) -> Optional[pd.Series]:
+        """
+        Last `window` closes for a ticker up to timestamp
+        
+        Returns:
+            Close series, or None if the ticker has no close data or fewer
+            than `window` rows of history
+        """
+        if 'close' not in market_data.columns:
+            return None
+        
+        ticker_data = self._ticker_history(market_data, ticker)
+        if ticker_data is None:
+            return None
+        
+        recent_data = ticker_data.loc[:timestamp].tail(window)
+        if len(recent_data) < window:
+            return None
+        return recent_data['close']
+    
+    def _recent_ma_pair(
+        self,
+        market_data: pd.DataFrame,
+        ticker: str,
+        timestamp: datetime
+    ) -> Optional[Tuple[float, float]]:
+        """
+        5/20-bar close averages for a ticker at one bar, shared by entry and exit
+        
+        Memoized per (ticker, timestamp); the memo is reset when called with a
+        different market data frame.
+        """
+        if market_data is not self._ma_pair_source:
+            self._ma_pair.cache_clear()
+            self._ma_pair_source = market_data
+        return self._ma_pair(ticker, timestamp)
+    
+    def _compute_ma_pair(self, ticker: str, timestamp: datetime) -> Optional[Tuple[float, float]]:
+        """Uncached body of _recent_ma_pair (None with under 20 rows of history)"""
+        recent_close = self._recent_closes(self._ma_pair_source, ticker, timestamp, 20)
+        if recent_close is None:
+            return None
+        return recent_close.tail(5).mean(), recent_close.mean()
+    
     def _default_entry_logic(
         self,
         market_data: pd.DataFrame,
@@ -182,59 +615,92 @@ class StrategyEngine:
         timestamp: datetime
     ) -> bool:
         """Default entry logic - simple example"""
-        try:
-            # Get recent data for ticker
-            ticker_data = market_data.xs(ticker, level='ticker')
-            recent_data = ticker_data[ticker_data.index <= timestamp].tail(20)
-            
-            if len(recent_data) < 20:
-                return False
-            
-            # Simple moving average crossover
-            if 'close' in recent_data.columns:
-                ma_fast = recent_data['close'].tail(5).mean()
-                ma_slow = recent_data['close'].tail(20).mean()
-                
-                # Entry signal: fast MA crosses above slow MA
-                return ma_fast > ma_slow
-            
-            return False
-        except:
+        cache_idx = self._signal_cache_lookup(market_data, ticker, timestamp)
+        if cache_idx is not None:
+            # Entry signal: fast MA above slow MA
+            return bool(self._entry_signals[cache_idx])
+        
+        if self._entry_expr is not None:
+            return bool(self._expression_value_at(self._entry_expr, market_data, ticker, timestamp))
+        
+        # Simple moving average crossover
+        ma_pair = self._recent_ma_pair(market_data, ticker, timestamp)
+        if ma_pair is None:
             return False
+        ma_fast, ma_slow = ma_pair
+        
+        # Entry signal: fast MA crosses above slow MA
+        return ma_fast > ma_slow
+    
+    def check_exit_signals_batch(
+        self,
+        positions: List['Position'],
+        timestamp: datetime
+    ) -> List[str]:
+        """
+        Evaluate rule-based exits (stops, take profit, time) for many positions
+        
+        Priority order: Stop Loss -> Trailing Stop -> Take Profit -> Time Exit
+        
+        Args:
+            positions: Open positions to check
+            timestamp: Current timestamp
+        
+        Returns:
+            Exit reason per position, aligned with `positions` ("" if none hit)
+        """
+        if not positions:
+            return []
+        
+        book = OpenBook.from_positions(positions, self.ticker_idx)
+        rows = slice(None)
+        no_hit = np.zeros(len(book), dtype=bool)
+        
+        stop_hit = no_hit
+        if self._stop_loss_frac is not None:
+            stop_hit = self._check_stop_loss(book, rows)
+        
+        trail_hit = no_hit
+        if self.use_trailing_stops and self._trailing_stop_frac is not None:
+            trail_hit = self._check_trailing_stop(book, rows)
+        
+        tp_hit = no_hit
+        if self._take_profit_frac is not None:
+            tp_hit = self._check_take_profit(book, rows)
+        
+        time_hit = no_hit
+        if self._time_exit_ns is not None:
+            now_ns = pd.Timestamp(timestamp).value
+            time_hit = self._check_time_exit(book, rows, now_ns)
+        
+        reasons = np.select(
+            [stop_hit, trail_hit, tp_hit, time_hit],
+            ["stop_loss", "trailing_stop", "take_profit", "time_exit"],
+            default=""
+        )
+        return reasons.tolist()
     
     async def check_exit_signal_async(
         self,
         market_data: pd.DataFrame,
         ticker: str,
         timestamp: datetime,
-        position: 'Position'
+        position: 'Position',
+        rule_reason: Optional[str] = None
     ) -> Tuple[bool, str]:
         """
         Async version of exit signal check (for FinChat COT calls)
-        """
-        # Priority order: Stop Loss -> Take Profit -> Time Exit -> Strategy Exit
-        
-        # 1. Check stop loss
-        if self.stop_loss is not None:
-            if self._check_stop_loss(position):
-                return True, "stop_loss"
-        
-        # 2. Check trailing stop
-        if self.use_trailing_stops and self.trailing_stop_distance is not None:
-            if self._check_trailing_stop(position):
-                return True, "trailing_stop"
         
-        # 3. Check take profit
-        if self.take_profit is not None:
-            if self._check_take_profit(position):
-                return True, "take_profit"
-        
-        # 4. Check time-based exit
-        if self.time_based_exit is not None:
-            if self._check_time_exit(position, timestamp):
-                return True, "time_exit"
+        Args:
+            rule_reason: Result of check_exit_signals_batch for this position,
+                if already computed for the bar
+        """
+        if rule_reason is None:
+            rule_reason = self.check_exit_signals_batch([position], timestamp)[0]
+        if rule_reason:
+            return True, rule_reason
         
-        # 5. Check strategy exit signal (may be FinChat-based)
+        # Check strategy exit signal (may be FinChat-based)
         if await self._check_strategy_exit_async(market_data, ticker, timestamp, position):
             return True, "strategy_signal"
         
@@ -245,47 +711,36 @@ class StrategyEngine:
         market_data: pd.DataFrame,
         ticker: str,
         timestamp: datetime,
-        position: 'Position'
+        position: 'Position',
+        rule_reason: Optional[str] = None
     ) -> Tuple[bool, str]:
         """
         Check if any exit condition is met
         
+        Args:
+            rule_reason: Result of check_exit_signals_batch for this position,
+                if already computed for the bar
+        
         Returns:
             (should_exit, exit_reason)
         """
-        # Priority order: Stop Loss -> Take Profit -> Time Exit -> Strategy Exit
-        
-        # 1. Check stop loss
-        if self.stop_loss is not None:
-            if self._check_stop_loss(position):
-                return True, "stop_loss"
-        
-        # 2. Check trailing stop
-        if self.use_trailing_stops and self.trailing_stop_distance is not None:
-            if self._check_trailing_stop(position):
-                return True, "trailing_stop"
+        # Priority order: rule-based exits (see check_exit_signals_batch) -> Strategy Exit
+        if rule_reason is None:
+            rule_reason = self.check_exit_signals_batch([position], timestamp)[0]
+        if rule_reason:
+            return True, rule_reason
         
-        # 3. Check take profit
-        if self.take_profit is not None:
-            if self._check_take_profit(position):
-                return True, "take_profit"
-        
-        # 4. Check time-based exit
-        if self.time_based_exit is not None:
-            if self._check_time_exit(position, timestamp):
-                return True, "time_exit"
-        
-        # 5. Check strategy exit signal
+        # Check strategy exit signal
         if self._check_strategy_exit(market_data, ticker, timestamp, position):
             return True, "strategy_signal"
         
         return False, ""
     
-    def _check_stop_loss(self, position: 'Position') -> bool:
-        """Check if stop loss is hit"""
+    def _check_stop_loss(self, book: OpenBook, rows) -> np.ndarray:
+        """Check which rows of the book hit their stop loss"""
         if self.stop_loss_type == "fixed-percent":
-            stop_price = position.entry_price * (1 - self.stop_loss / 100)
-            return position.current_price <= stop_price
+            stop_price = book.entry_price[rows] * (1 - self._stop_loss_frac)
+            return book.current_price[rows] <= stop_price
         elif self.stop_loss_type == "dollar-based":
             # Implement dollar-based stop loss
             pass
@@ -293,22 +748,21 @@ class StrategyEngine:
             # Implement volatility-based stop loss (ATR)
             pass
         
-        return False
+        return np.zeros(len(book.entry_price[rows]), dtype=bool)
     
-    def _check_trailing_stop(self, position: 'Position') -> bool:
-        """Check if trailing stop is hit"""
-        trailing_stop = position.highest_price * (1 - self.trailing_stop_distance / 100)
-        return position.current_price <= trailing_stop
+    def _check_trailing_stop(self, book: OpenBook, rows) -> np.ndarray:
+        """Check which rows of the book hit their trailing stop"""
+        trailing_stop = book.highest_price[rows] * (1 - self._trailing_stop_frac)
+        return book.current_price[rows] <= trailing_stop
     
-    def _check_take_profit(self, position: 'Position') -> bool:
-        """Check if take profit is hit"""
-        take_profit_price = position.entry_price * (1 + self.take_profit / 100)
-        return position.current_price >= take_profit_price
+    def _check_take_profit(self, book: OpenBook, rows) -> np.ndarray:
+        """Check which rows of the book hit their take profit"""
+        take_profit_price = book.entry_price[rows] * (1 + self._take_profit_frac)
+        return book.current_price[rows] >= take_profit_price
     
-    def _check_time_exit(self, position: 'Position', timestamp: datetime) -> bool:
-        """Check if time-based exit is triggered"""
-        days_held = (timestamp - position.entry_timestamp).days
-        return days_held >= self.time_based_exit
+    def _check_time_exit(self, book: OpenBook, rows, now_ns: int) -> np.ndarray:
+        """Check which rows of the book have reached the time-based exit"""
+        return (now_ns - book.entry_time_ns[rows]) >= self._time_exit_ns
     
     async def _check_strategy_exit_async(
         self,
@@ -321,10 +775,10 @@ class StrategyEngine:
         # If custom exit function is provided, check if it's FinChat-based
         if self.exit_signal_func is not None:
             # Check if this is a FinChat function
-            if hasattr(self.exit_signal_func, '_is_finchat') and self.exit_signal_func._is_finchat:
+            if self._exit_is_finchat:
                 # Call the async function
-                if hasattr(self.exit_signal_func, '_async_func'):
-                    return await self.exit_signal_func._async_func(market_data, ticker, timestamp, position)
+                if self._exit_async_func is not None:
+                    return await self._exit_async_func(market_data, ticker, timestamp, position)
             else:
                 # Regular sync function
                 return self.exit_signal_func(market_data, ticker, timestamp, position)
@@ -332,7 +786,8 @@ class StrategyEngine:
         # If exit logic string is provided but no custom function was set,
         # try default logic (fallback)
         if self.exit_logic:
-            logger.debug(f"No custom exit function set, using default logic for {ticker}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("No custom exit function set, using default logic for %s", ticker)
             return self._default_exit_logic(market_data, ticker, timestamp, position)
         
         return False
@@ -348,7 +803,7 @@ class StrategyEngine:
         # If custom exit function is provided, use it
         if self.exit_signal_func is not None:
             # Check if this is a FinChat function (needs async handling)
-            if hasattr(self.exit_signal_func, '_is_finchat') and self.exit_signal_func._is_finchat:
+            if self._exit_is_finchat:
                 # For FinChat, we need async handling - return False here, will be handled in async version
                 logger.warning("FinChat exit signal detected but called from sync context - use async version")
                 return False
@@ -357,7 +812,8 @@ class StrategyEngine:
         # If exit logic string is provided but no custom function was set,
         # try default logic (fallback)
         if self.exit_logic:
-            logger.debug(f"No custom exit function set, using default logic for {ticker}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("No custom exit function set, using default logic for %s", ticker)
             return self._default_exit_logic(market_data, ticker, timestamp, position)
         
         return False
@@ -370,25 +826,22 @@ class StrategyEngine:
         position: 'Position'
     ) -> bool:
         """Default exit logic - simple example"""
-        try:
-            # Get recent data for ticker
-            ticker_data = market_data.xs(ticker, level='ticker')
-            recent_data = ticker_data[ticker_data.index <= timestamp].tail(20)
-            
-            if len(recent_data) < 20:
-                return False
-            
-            # Simple moving average crossover
-            if 'close' in recent_data.columns:
-                ma_fast = recent_data['close'].tail(5).mean()
-                ma_slow = recent_data['close'].tail(20).mean()
-                
-                # Exit signal: fast MA crosses below slow MA
-                return ma_fast < ma_slow
-            
-            return False
-        except:
+        cache_idx = self._signal_cache_lookup(market_data, ticker, timestamp)
+        if cache_idx is not None:
+            # Exit signal: fast MA below slow MA
+            return bool(self._exit_signals[cache_idx])
+        
+        if self._exit_expr is not None:
+            return bool(self._expression_value_at(self._exit_expr, market_data, ticker, timestamp))
+        
+        # Simple moving average crossover
+        ma_pair = self._recent_ma_pair(market_data, ticker, timestamp)
+        if ma_pair is None:
             return False
+        ma_fast, ma_slow = ma_pair
+        
+        # Exit signal: fast MA crosses below slow MA
+        return ma_fast < ma_slow
     
     def calculate_position_size(
         self,
@@ -403,46 +856,54 @@ class StrategyEngine:
         Returns:
             Number of shares to buy
         """
-        if self.position_sizing_method == "fixed-shares":
-            # Fixed number of shares per order
+        return self._size_fn(current_price, portfolio_value)
+    
+    def _select_size_fn(self) -> Callable[[float, float], float]:
+        """Pick the sizing function for position_sizing_method once, at init"""
+        method = self.position_sizing_method
+        if method == "fixed-shares":
             if self.fixed_dollar_amount is None:
-                logger.error("Fixed shares amount not specified (use fixedDollarAmount field)")
-                return 0.0
-            shares = self.fixed_dollar_amount  # In this mode, fixedDollarAmount represents shares
-        
-        elif self.position_sizing_method == "fixed-dollar":
+                return self._size_invalid("Fixed shares amount not specified (use fixedDollarAmount field)")
+            return self._size_fixed_shares
+        if method == "fixed-dollar":
             if self.fixed_dollar_amount is None:
-                logger.error("Fixed dollar amount not specified")
-                return 0.0
-            shares = self.fixed_dollar_amount / current_price
-        
-        elif self.position_sizing_method == "portfolio-percent":
+                return self._size_invalid("Fixed dollar amount not specified")
+            return self._size_fixed_dollar
+        if method == "portfolio-percent":
             if self.portfolio_percent is None:
-                logger.error("Portfolio percent not specified")
-                return 0.0
-            position_value = portfolio_value * (self.portfolio_percent / 100)
-            shares = position_value / current_price
-        
-        elif self.position_sizing_method == "risk-based":
+                return self._size_invalid("Portfolio percent not specified")
+            return self._size_portfolio_percent
+        if method == "risk-based":
             if self.risk_percent is None or self.stop_loss is None:
-                logger.error("Risk percent or stop loss not specified")
-                return 0.0
-            
-            # Risk-based position sizing
-            risk_amount = portfolio_value * (self.risk_percent / 100)
-            stop_distance = current_price * (self.stop_loss / 100)
-            shares = risk_amount / stop_distance if stop_distance > 0 else 0.0
-        
-        else:
-            logger.error(f"Unknown position sizing method: {self.position_sizing_method}")
+                return self._size_invalid("Risk percent or stop loss not specified")
+            return self._size_risk_based
+        return self._size_invalid(f"Unknown position sizing method: {method}")
+    
+    @staticmethod
+    def _size_invalid(message: str) -> Callable[[float, float], float]:
+        """Sizing function for an invalid config: logs and sizes every entry at 0"""
+        def size_invalid(current_price: float, portfolio_value: float) -> float:
+            logger.error(message)
             return 0.0
-        
-        # Round down to avoid fractional shares (unless fractional trading allowed)
-        # Skip rounding for fixed-shares method since it's already an integer
-        if self.position_sizing_method != "fixed-shares":
-            shares = int(shares)
-        
-        return shares
+        return size_invalid
+    
+    def _size_fixed_shares(self, current_price: float, portfolio_value: float) -> float:
+        """Fixed number of shares per order (fixedDollarAmount holds the share count, no rounding)"""
+        return self.fixed_dollar_amount
+    
+    def _size_fixed_dollar(self, current_price: float, portfolio_value: float) -> float:
+        """Whole shares worth fixed_dollar_amount"""
+        return int(self.fixed_dollar_amount / current_price)
+    
+    def _size_portfolio_percent(self, current_price: float, portfolio_value: float) -> float:
+        """Whole shares worth portfolio_percent of the portfolio"""
+        return int(portfolio_value * self._portfolio_frac / current_price)
+    
+    def _size_risk_based(self, current_price: float, portfolio_value: float) -> float:
+        """Whole shares risking risk_percent of the portfolio down to the stop loss"""
+        risk_amount = portfolio_value * self._risk_frac
+        stop_distance = current_price * self._stop_loss_frac
+        return int(risk_amount / stop_distance) if stop_distance > 0 else 0
     
     def rank_signals(
         self,
@@ -466,15 +927,41 @@ class StrategyEngine:
         if len(signals) <= max_positions:
             return signals
         
-        # If ranking logic is provided, use it
-        if self.ranking_logic:
-            # In production, this would parse and apply custom ranking logic
-            pass
+        # If ranking logic is a score expression, keep the highest scores
+        if self._ranking_expr is not None:
+            if max_positions <= 0:
+                return []
+            scores = self._signal_scores(market_data, timestamp, signals)
+            if scores is not None:
+                return [signals[i] for i in _top_k_indices(scores, max_positions)]
+            
+            def score_fn(ticker: str) -> float:
+                value = self._expression_value_at(self._ranking_expr, market_data, ticker, timestamp, np.float64)
+                return -np.inf if value is None or np.isnan(value) else float(value)
+            
+            return heapq.nlargest(max_positions, signals, key=score_fn)
         
         # Default: random selection or by liquidity
         # For now, just return first N signals
         return signals[:max_positions]
     
+    def _signal_scores(
+        self,
+        market_data: pd.DataFrame,
+        timestamp: datetime,
+        tickers: List[str]
+    ) -> Optional[np.ndarray]:
+        """Cached ranking scores for tickers at one bar, or None if not cached"""
+        if self._scores is None or market_data is not self._signal_cache_source:
+            return None
+        t_idx = self._time_idx.get(timestamp)
+        if t_idx is None:
+            return None
+        cols = self._ticker_columns(tickers)
+        if cols is None:
+            return None
+        return self._scores[t_idx, cols]
+    
     def filter_eligible_universe(
         self,
         all_tickers: List[str],
@@ -499,21 +986,31 @@ class StrategyEngine:
             pass
         
         # Basic filtering: remove tickers with no data at current timestamp
-        eligible = []
-        for ticker in all_tickers:
-            try:
-                if (timestamp, ticker) in market_data.index:
-                    eligible.append(ticker)
-            except:
-                continue
-        
-        return eligible
+        if market_data is self._signal_cache_source:
+            t_idx = self._time_idx.get(timestamp)
+            if t_idx is None:
+                return []
+            cols = np.fromiter(
+                (self.ticker_idx.get(ticker, -1) for ticker in all_tickers), dtype=np.intp, count=len(all_tickers)
+            )
+            cols = cols[cols >= 0]
+            return [self.idx_ticker[col] for col in cols[self._present[t_idx, cols]]]
+        
+        return [ticker for ticker in all_tickers if (timestamp, ticker) in market_data.index]
     
     def set_entry_signal_function(self, func: Callable):
         """Set custom entry signal function"""
         self.entry_signal_func = func
+        self._entry_is_finchat = bool(getattr(func, '_is_finchat', False))
+        self._entry_async_func = getattr(func, '_async_func', None)
     
     def set_exit_signal_function(self, func: Callable):
         """Set custom exit signal function"""
         self.exit_signal_func = func
+        self._exit_is_finchat = bool(getattr(func, '_is_finchat', False))
+        self._exit_async_func = getattr(func, '_async_func', None)
+    
+    def set_prepare_function(self, func: Callable):
+        """Set a hook called with the market data once before the bar loop"""
+        self.prepare_func = func
 
@@ -3,34 +3,206 @@ Strategy Parser Module
 Parses natural language strategy descriptions and FinChat COT prompts into executable signal functions
 """
 import re
-from typing import Callable, Optional, Dict, List
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, Dict, List, NamedTuple
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import logging
 
+from .finchat_cache import CacheKey, FinChatResponseCache, get_finchat_cache, make_cache_key
+from .strategy import NS_PER_DAY
+
 logger = logging.getLogger(__name__)
 
+# Natural-language patterns recognised by parse_entry_logic / parse_exit_logic,
+# in priority order: when a string matches several, the first pattern listed
+# wins regardless of where it appears in the string.
+# Matching is case-insensitive on the raw string (no lowercased copy), and
+# strategy strings are ASCII, so re.ASCII keeps \s/\d off the Unicode tables.
+_ENTRY_PATTERNS = (
+    ('first_day', re.compile(r'buy\s+on\s+(?:the\s+)?first\s+day', re.IGNORECASE | re.ASCII)),
+    ('every_n', re.compile(r'buy\s+every\s+(?P<n>\d+)\s+(?:business\s+)?days?', re.IGNORECASE | re.ASCII)),
+    ('immediate', re.compile(r'buy\s+(?:immediately|now)', re.IGNORECASE | re.ASCII)),
+)
+_EXIT_PATTERNS = (
+    ('hold_until_end', re.compile(r'hold\s+until\s+(?:the\s+)?end', re.IGNORECASE | re.ASCII)),
+    ('after_n', re.compile(r'(?:sell|exit)\s+after\s+(?P<n>\d+)\s+days?', re.IGNORECASE | re.ASCII)),
+    ('never', re.compile(r'never\s+exit|hold\s+forever', re.IGNORECASE | re.ASCII)),
+)
+
+
+@dataclass(frozen=True)
+class LogicSpec:
+    """Parsed form of a natural-language entry/exit rule (which closure to build)"""
+    kind: str
+    n_days: Optional[int] = None
+
+
+def _match_first_pattern(patterns, text: str) -> Optional[LogicSpec]:
+    """LogicSpec for the highest-priority pattern found anywhere in text"""
+    for kind, pattern in patterns:
+        match = pattern.search(text)
+        if match is not None:
+            n = match.groupdict().get('n')
+            return LogicSpec(kind, int(n) if n is not None else None)
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _compile_entry_spec(entry_logic: str) -> Optional[LogicSpec]:
+    """Match entry logic text against the known patterns (memoized across parsers)"""
+    # first_day: "Buy on (the) first day"; every_n: "Buy every N (business) days";
+    # immediate: "Buy immediately" / "Buy now"
+    return _match_first_pattern(_ENTRY_PATTERNS, entry_logic)
+
+
+@lru_cache(maxsize=1024)
+def _compile_exit_spec(exit_logic: str) -> Optional[LogicSpec]:
+    """Match exit logic text against the known patterns (memoized across parsers)"""
+    # hold_until_end: "Hold until (the) end"; after_n: "Sell/Exit after N days";
+    # never: "Never exit" / "Hold forever"
+    return _match_first_pattern(_EXIT_PATTERNS, exit_logic)
+
+
+# COT responses at least this long are parsed in a worker thread so other
+# in-flight FinChat requests keep being serviced
+_COT_PARSE_OFFLOAD_CHARS = 256 * 1024
+
+
+def _cot_date(timestamp: datetime) -> str:
+    """Format a timestamp as mm/dd/yyyy for FinChat COT parameters (avoids strftime)"""
+    return f"{timestamp.month:02d}/{timestamp.day:02d}/{timestamp.year:04d}"
+
+
+def _timestamp_ns(timestamp: datetime) -> int:
+    """Epoch nanoseconds of a bar timestamp (no conversion for pd.Timestamp)"""
+    if isinstance(timestamp, pd.Timestamp):
+        return timestamp.value
+    return pd.Timestamp(timestamp).value
+
+
+class TickerArrays(NamedTuple):
+    """One ticker's rows as contiguous arrays, oldest first"""
+    ts: np.ndarray  # int64 epoch nanoseconds
+    close: Optional[np.ndarray]  # float64, None if market data has no close column
+
+
+def precompute_ticker_arrays(market_data: pd.DataFrame) -> Dict[str, TickerArrays]:
+    """
+    Split (timestamp, ticker) market data into time-sorted per-ticker arrays
+
+    One sort over the whole frame replaces per-ticker xs()/boolean-mask calls,
+    so signal closures can use arr.ts[-1] or np.searchsorted(arr.ts, ...).
+    """
+    index = market_data.index
+    codes, tickers = pd.factorize(index.get_level_values('ticker'))
+    # as_unit: pandas may store non-nanosecond resolutions; keep ns to match Timestamp.value
+    ts = pd.DatetimeIndex(index.get_level_values('timestamp')).as_unit('ns').asi8
+    order = np.lexsort((ts, codes))
+    ts = ts[order]
+    close = market_data['close'].to_numpy(dtype=np.float64)[order] if 'close' in market_data.columns else None
+
+    # Row ranges of each ticker in the sorted order
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(codes[order])) + 1, [len(order)]))
+    arrays = {}
+    for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        arrays[tickers[i]] = TickerArrays(
+            ts=ts[lo:hi],
+            close=close[lo:hi] if close is not None else None
+        )
+    return arrays
+
 
 class StrategyParser:
     """Parses strategy logic strings and FinChat COT prompts into executable functions"""
     
-    def __init__(self, finchat_client=None, signal_tracker=None):
+    def __init__(
+        self,
+        finchat_client=None,
+        signal_tracker=None,
+        finchat_cache: Optional[FinChatResponseCache] = None,
+        finchat_cache_ttl: Optional[float] = None
+    ):
         """
         Initialize strategy parser
         
         Args:
             finchat_client: Optional FinChatClient instance for COT execution
             signal_tracker: Optional list to track FinChat signals for monitoring
+            finchat_cache: Optional cache for parsed COT signals (process-wide cache if not provided)
+            finchat_cache_ttl: Optional expiry in seconds for cached COT signals
         """
         self.finchat_client = finchat_client
         self.signal_tracker = signal_tracker  # List to append signals to
+        self.finchat_cache = finchat_cache if finchat_cache is not None else get_finchat_cache()
+        self.finchat_cache_ttl = finchat_cache_ttl
         self.backtest_start: Optional[datetime] = None
         self.backtest_end: Optional[datetime] = None
+        self._backtest_end_ns: Optional[int] = None  # backtest_end as epoch nanoseconds
+        
+        # Per-ticker arrays, memoized for one market data frame
+        self._ticker_arrays: Dict[str, TickerArrays] = {}
+        self._ticker_arrays_source: Optional[pd.DataFrame] = None
+        
+        # In-flight COT calls by cache key, so duplicate requests share one call
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+    
+    def _get_ticker_arrays(self, market_data: pd.DataFrame) -> Dict[str, TickerArrays]:
+        """Per-ticker arrays for market_data (built once per market data frame)"""
+        if market_data is not self._ticker_arrays_source:
+            self._ticker_arrays = precompute_ticker_arrays(market_data)
+            self._ticker_arrays_source = market_data
+        return self._ticker_arrays
+    
+    async def _single_flight(self, cache_key: CacheKey, fetch: Callable[[], Awaitable[bool]]) -> bool:
+        """
+        Run fetch() at most once at a time per cache key
+        
+        Callers arriving while a call for the same key is in flight await its
+        result instead of issuing a duplicate COT request.
+        """
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            result = await fetch()
+            future.set_result(result)
+            return result
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[cache_key]
+    
+    def _track_signal(self, tracked_keys: set, cache_key: CacheKey, record: Dict):
+        """Append a COT signal record to the tracker, once per cache key per run"""
+        if self.signal_tracker is None or cache_key in tracked_keys:
+            return
+        tracked_keys.add(cache_key)
+        self.signal_tracker.append(record)
+    
+    async def _parse_cot_content(self, content: str) -> Dict:
+        """
+        Parse a COT response, off the event loop when it is large
+        
+        parse_cot_result is a handful of substring scans, so typical responses
+        are parsed inline; a thread hop would cost more than the parse.
+        """
+        if len(content) >= _COT_PARSE_OFFLOAD_CHARS:
+            return await asyncio.to_thread(self.finchat_client.parse_cot_result, content)
+        return self.finchat_client.parse_cot_result(content)
     
     def set_backtest_range(self, start: datetime, end: datetime):
         """Set the backtest date range for time-based strategies"""
         self.backtest_start = start
         self.backtest_end = end
+        self._backtest_end_ns = _timestamp_ns(end) if end is not None else None
     
     def parse_entry_logic(
         self,
@@ -59,21 +231,14 @@ class StrategyParser:
         if not entry_logic:
             return None
         
-        entry_logic_lower = entry_logic.lower().strip()
-        
-        # Pattern: "Buy on first day" or "Buy on the first day"
-        if re.search(r'buy\s+on\s+(the\s+)?first\s+day', entry_logic_lower):
-            return self._create_first_day_entry()
-        
-        # Pattern: "Buy every N days" or "Buy every N business days"
-        match = re.search(r'buy\s+every\s+(\d+)\s+(business\s+)?days?', entry_logic_lower)
-        if match:
-            n_days = int(match.group(1))
-            return self._create_every_n_days_entry(n_days)
-        
-        # Pattern: "Buy immediately" or "Buy now"
-        if re.search(r'buy\s+(immediately|now)', entry_logic_lower):
-            return self._create_immediate_entry()
+        spec = _compile_entry_spec(entry_logic)
+        if spec is not None:
+            if spec.kind == 'first_day':
+                return self._create_first_day_entry()
+            if spec.kind == 'every_n':
+                return self._create_every_n_days_entry(spec.n_days)
+            if spec.kind == 'immediate':
+                return self._create_immediate_entry()
         
         logger.warning(f"Could not parse entry logic: {entry_logic}. Using default logic.")
         return None
@@ -107,105 +272,78 @@ class StrategyParser:
         if not exit_logic:
             return None
         
-        exit_logic_lower = exit_logic.lower().strip()
-        
-        # Pattern: "Hold until end" or "Hold until the end"
-        if re.search(r'hold\s+until\s+(the\s+)?end', exit_logic_lower):
-            return self._create_hold_until_end_exit()
-        
-        # Pattern: "Sell after N days" or "Exit after N days"
-        match = re.search(r'(sell|exit)\s+after\s+(\d+)\s+days?', exit_logic_lower)
-        if match:
-            n_days = int(match.group(2))
-            return self._create_exit_after_n_days(n_days)
-        
-        # Pattern: "Never exit" or "Hold forever"
-        if re.search(r'(never\s+exit|hold\s+forever)', exit_logic_lower):
-            return self._create_never_exit()
+        spec = _compile_exit_spec(exit_logic)
+        if spec is not None:
+            if spec.kind == 'hold_until_end':
+                return self._create_hold_until_end_exit()
+            if spec.kind == 'after_n':
+                return self._create_exit_after_n_days(spec.n_days)
+            if spec.kind == 'never':
+                return self._create_never_exit()
         
         logger.warning(f"Could not parse exit logic: {exit_logic}. Using default logic.")
         return None
     
     def _create_finchat_entry(self, cot_slug: str) -> Callable:
         """Create entry function that calls FinChat COT and evaluates result"""
-        # Cache results to avoid calling COT multiple times for same ticker/timestamp
-        cot_cache: Dict[str, Dict[str, bool]] = {}
+        # COT calls that failed in this run (not cached, so later runs retry them)
+        failed_keys = set()
+        # Cache keys already recorded on the signal tracker in this run
+        tracked_keys = set()
         
-        async def entry_signal_async(
-            market_data: pd.DataFrame,
-            ticker: str,
-            timestamp: datetime
-        ) -> bool:
-            # Create cache key
-            cache_key = f"{ticker}_{timestamp.date()}"
-            
-            # Check cache
-            if cache_key in cot_cache:
-                return cot_cache[cache_key].get("signal", False)
-            
+        async def request_entry_signal(ticker: str, timestamp: datetime, date_str: str, cache_key: CacheKey) -> bool:
+            """Call the COT for one ticker/date and cache the parsed signal"""
             try:
-                # Format date as mm/dd/yyyy for FinChat COT
-                date_str = timestamp.strftime("%m/%d/%Y")
-                
                 # Call FinChat COT with required parameters
-                logger.info(f"Calling FinChat COT {cot_slug} for entry signal: {ticker} at {timestamp}")
+                logger.info("Calling FinChat COT %s for entry signal: %s at %s", cot_slug, ticker, timestamp)
                 result = await self.finchat_client.run_cot(
                     cot_slug=cot_slug,
                     ticker=ticker,
-                    additional_params={
-                        "stock_symbol": ticker,  # Required parameter name
-                        "date": date_str  # Date in mm/dd/yyyy format
-                    }
+                    additional_params=[
+                        ("stock_symbol", ticker),  # Required parameter name
+                        ("date", date_str)  # Date in mm/dd/yyyy format
+                    ]
                 )
                 
                 # Parse result to get signal
-                parsed = self.finchat_client.parse_cot_result(result["content"])
+                parsed = await self._parse_cot_content(result["content"])
                 signal = parsed.get("signal", "hold")
                 confidence = parsed.get("confidence", 0.5)
                 reasoning = parsed.get("reasoning", "")
                 
-                # Log detailed information
-                print(f"\n{'='*80}")
-                print(f"ENTRY SIGNAL - {ticker} @ {timestamp.strftime('%Y-%m-%d')} ({date_str})")
-                print(f"{'='*80}")
-                print(f"COT Slug: {cot_slug}")
-                print(f"Parameters: stock_symbol={ticker}, date={date_str}")
-                print(f"Signal: {signal.upper()}")
-                print(f"Confidence: {confidence:.2f}")
-                print(f"\nCOT Response Content:")
-                print(f"{'-'*80}")
-                print(result["content"][:1000])  # First 1000 chars
-                if len(result["content"]) > 1000:
-                    print(f"\n... (truncated, total length: {len(result['content'])} chars)")
-                print(f"{'-'*80}")
-                print(f"Parsed Reasoning: {reasoning[:200]}")
-                print(f"{'='*80}\n")
+                # Full COT response is kept on the signal tracker; only log it at debug level
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "ENTRY %s @ %s slug=%s signal=%s conf=%.2f reasoning=%.200s",
+                        ticker, date_str, cot_slug, signal, confidence, reasoning
+                    )
                 
                 # Track signal for results
-                if self.signal_tracker is not None:
-                    self.signal_tracker.append({
-                        "type": "entry",
-                        "ticker": ticker,
-                        "timestamp": timestamp.isoformat(),
-                        "date": date_str,  # Date in mm/dd/yyyy format
-                        "cot_slug": cot_slug,
-                        "signal": signal,
-                        "confidence": confidence,
-                        "cot_response": result["content"][:2000],  # First 2000 chars
-                        "parsed_reasoning": reasoning[:500]
-                    })
+                record = {
+                    "type": "entry",
+                    "ticker": ticker,
+                    "timestamp": timestamp.isoformat(),
+                    "date": date_str,  # Date in mm/dd/yyyy format
+                    "cot_slug": cot_slug,
+                    "signal": signal,
+                    "confidence": confidence,
+                    "cot_response": result["content"][:2000],  # First 2000 chars
+                    "parsed_reasoning": reasoning[:500]
+                }
+                self._track_signal(tracked_keys, cache_key, record)
                 
                 logger.info(
-                    f"FinChat COT entry result for {ticker}: signal={signal}, "
-                    f"confidence={confidence:.2f}"
+                    "FinChat COT entry result for %s: signal=%s, confidence=%.2f",
+                    ticker, signal, confidence
                 )
                 
-                # Cache result
-                cot_cache[cache_key] = {
+                # Cache result, with the tracker record so cache hits still report the signal
+                await self.finchat_cache.aset(cache_key, {
                     "signal": signal == "buy",
                     "confidence": confidence,
-                    "reasoning": parsed.get("reasoning", "")
-                }
+                    "reasoning": parsed.get("reasoning", ""),
+                    "tracker": record
+                }, ttl=self.finchat_cache_ttl)
                 
                 # Return True if signal is "buy"
                 return signal == "buy"
@@ -213,9 +351,36 @@ class StrategyParser:
             except Exception as e:
                 logger.error(f"Error calling FinChat COT for entry signal: {e}")
                 # On error, return False (don't enter)
-                cot_cache[cache_key] = {"signal": False, "error": str(e)}
+                failed_keys.add(cache_key)
                 return False
         
+        async def entry_signal_async(
+            market_data: pd.DataFrame,
+            ticker: str,
+            timestamp: datetime
+        ) -> bool:
+            # Format date as mm/dd/yyyy for FinChat COT
+            date_str = _cot_date(timestamp)
+            
+            # Cache key covers every input sent to the COT
+            cache_key = make_cache_key(kind="entry", cot_slug=cot_slug, stock_symbol=ticker, date=date_str)
+            
+            # Check cache (entries without a tracker record predate it and are refetched)
+            cached = await self.finchat_cache.aget(cache_key)
+            if cached is not None and "tracker" in cached:
+                self._track_signal(tracked_keys, cache_key, {
+                    **cached["tracker"],
+                    "timestamp": timestamp.isoformat()
+                })
+                return cached.get("signal", False)
+            if cache_key in failed_keys:
+                return False
+            
+            # Concurrent callers for the same key share one in-flight COT call
+            return await self._single_flight(
+                cache_key, lambda: request_entry_signal(ticker, timestamp, date_str, cache_key)
+            )
+        
         # Wrap async function to work with sync interface
         # Note: This will need to be called from async context
         def entry_signal(market_data: pd.DataFrame, ticker: str, timestamp: datetime) -> bool:
@@ -232,101 +397,77 @@ class StrategyParser:
     
     def _create_finchat_exit(self, cot_slug: str, upside_threshold: Optional[float] = None, downside_threshold: Optional[float] = None) -> Callable:
         """Create exit function that calls FinChat COT and evaluates result"""
-        # Cache results to avoid calling COT multiple times for same ticker/timestamp
-        cot_cache: Dict[str, Dict[str, bool]] = {}
+        # Use thresholds from config, default to 0.01 if not provided
+        upside_thresh = upside_threshold if upside_threshold is not None else 0.01
+        downside_thresh = downside_threshold if downside_threshold is not None else 0.01
         
-        async def exit_signal_async(
-            market_data: pd.DataFrame,
-            ticker: str,
-            timestamp: datetime,
-            position
-        ) -> bool:
-            if position is None:
-                return False
-            
-            # Create cache key
-            cache_key = f"{ticker}_{timestamp.date()}"
-            
-            # Check cache
-            if cache_key in cot_cache:
-                return cot_cache[cache_key].get("signal", False)
-            
+        # COT calls that failed in this run (not cached, so later runs retry them)
+        failed_keys = set()
+        # Cache keys already recorded on the signal tracker in this run
+        tracked_keys = set()
+        
+        async def request_exit_signal(ticker: str, timestamp: datetime, position, date_str: str, cache_key: CacheKey) -> bool:
+            """Call the COT for one ticker/date and cache the parsed signal"""
             try:
-                # Format date as mm/dd/yyyy for FinChat COT
-                date_str = timestamp.strftime("%m/%d/%Y")
-                
-                # Use thresholds from config, default to 0.01 if not provided
-                upside_thresh = upside_threshold if upside_threshold is not None else 0.01
-                downside_thresh = downside_threshold if downside_threshold is not None else 0.01
-                
                 # Call FinChat COT with required parameters
-                logger.info(f"Calling FinChat COT {cot_slug} for exit signal: {ticker} at {timestamp}")
+                logger.info("Calling FinChat COT %s for exit signal: %s at %s", cot_slug, ticker, timestamp)
                 result = await self.finchat_client.run_cot(
                     cot_slug=cot_slug,
                     ticker=ticker,  # Will be mapped to stock_symbol in run_cot
-                    additional_params={
-                        "stock_symbol": ticker,  # Required parameter name
-                        "date": date_str,  # Date in mm/dd/yyyy format
-                        "upside_threshold": str(upside_thresh),  # As decimal (e.g., "0.01" for 1%)
-                        "downside_threshold": str(downside_thresh)  # As decimal (e.g., "0.01" for 1%)
-                    }
+                    additional_params=[
+                        # Stable parameters first, per-call date last (see build_cot_message)
+                        ("stock_symbol", ticker),  # Required parameter name
+                        ("upside_threshold", str(upside_thresh)),  # As decimal (e.g., "0.01" for 1%)
+                        ("downside_threshold", str(downside_thresh)),  # As decimal (e.g., "0.01" for 1%)
+                        ("date", date_str)  # Date in mm/dd/yyyy format
+                    ]
                 )
                 
                 # Parse result to get signal
-                parsed = self.finchat_client.parse_cot_result(result["content"])
+                parsed = await self._parse_cot_content(result["content"])
                 signal = parsed.get("signal", "hold")
                 confidence = parsed.get("confidence", 0.5)
                 reasoning = parsed.get("reasoning", "")
                 
-                # Log detailed information
-                print(f"\n{'='*80}")
-                print(f"EXIT SIGNAL - {ticker} @ {timestamp.strftime('%Y-%m-%d')} ({date_str})")
-                print(f"{'='*80}")
-                print(f"COT Slug: {cot_slug}")
-                print(f"Parameters: stock_symbol={ticker}, date={date_str}, upside_threshold={upside_thresh}, downside_threshold={downside_thresh}")
-                print(f"Position Entry: {position.entry_timestamp.strftime('%Y-%m-%d')} @ ${position.entry_price:.2f}")
-                print(f"Current Price: ${position.current_price:.2f}")
-                print(f"Signal: {signal.upper()}")
-                print(f"Confidence: {confidence:.2f}")
-                print(f"\nCOT Response Content:")
-                print(f"{'-'*80}")
-                print(result["content"][:1000])  # First 1000 chars
-                if len(result["content"]) > 1000:
-                    print(f"\n... (truncated, total length: {len(result['content'])} chars)")
-                print(f"{'-'*80}")
-                print(f"Parsed Reasoning: {reasoning[:200]}")
-                print(f"{'='*80}\n")
+                # Full COT response is kept on the signal tracker; only log it at debug level
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "EXIT %s @ %s slug=%s signal=%s conf=%.2f entry=%.2f current=%.2f reasoning=%.200s",
+                        ticker, date_str, cot_slug, signal, confidence,
+                        position.entry_price, position.current_price, reasoning
+                    )
                 
                 # Track signal for results
-                if self.signal_tracker is not None:
-                    self.signal_tracker.append({
-                        "type": "exit",
-                        "ticker": ticker,
-                        "timestamp": timestamp.isoformat(),
-                        "date": date_str,  # Date in mm/dd/yyyy format
-                        "cot_slug": cot_slug,
-                        "position_entry_date": position.entry_timestamp.isoformat(),
-                        "position_entry_price": position.entry_price,
-                        "current_price": float(position.current_price),
-                        "upside_threshold": upside_thresh,
-                        "downside_threshold": downside_thresh,
-                        "signal": signal,
-                        "confidence": confidence,
-                        "cot_response": result["content"][:2000],  # First 2000 chars
-                        "parsed_reasoning": reasoning[:500]
-                    })
+                record = {
+                    "type": "exit",
+                    "ticker": ticker,
+                    "timestamp": timestamp.isoformat(),
+                    "date": date_str,  # Date in mm/dd/yyyy format
+                    "cot_slug": cot_slug,
+                    "position_entry_date": position.entry_timestamp.isoformat(),
+                    "position_entry_price": position.entry_price,
+                    "current_price": float(position.current_price),
+                    "upside_threshold": upside_thresh,
+                    "downside_threshold": downside_thresh,
+                    "signal": signal,
+                    "confidence": confidence,
+                    "cot_response": result["content"][:2000],  # First 2000 chars
+                    "parsed_reasoning": reasoning[:500]
+                }
+                self._track_signal(tracked_keys, cache_key, record)
                 
                 logger.info(
-                    f"FinChat COT exit result for {ticker}: signal={signal}, "
-                    f"confidence={confidence:.2f}"
+                    "FinChat COT exit result for %s: signal=%s, confidence=%.2f",
+                    ticker, signal, confidence
                 )
                 
-                # Cache result
-                cot_cache[cache_key] = {
+                # Cache result, with the tracker record so cache hits still report the signal
+                await self.finchat_cache.aset(cache_key, {
                     "signal": signal in ["sell", "exit"],
                     "confidence": confidence,
-                    "reasoning": parsed.get("reasoning", "")
-                }
+                    "reasoning": parsed.get("reasoning", ""),
+                    "tracker": record
+                }, ttl=self.finchat_cache_ttl)
                 
                 # Return True if signal is "sell" or "exit"
                 return signal in ["sell", "exit"]
@@ -334,8 +475,50 @@ class StrategyParser:
             except Exception as e:
                 logger.error(f"Error calling FinChat COT for exit signal: {e}")
                 # On error, return False (don't exit)
-                cot_cache[cache_key] = {"signal": False, "error": str(e)}
+                failed_keys.add(cache_key)
+                return False
+        
+        async def exit_signal_async(
+            market_data: pd.DataFrame,
+            ticker: str,
+            timestamp: datetime,
+            position
+        ) -> bool:
+            if position is None:
                 return False
+            
+            # Format date as mm/dd/yyyy for FinChat COT
+            date_str = _cot_date(timestamp)
+            
+            # Cache key covers every input sent to the COT
+            cache_key = make_cache_key(
+                kind="exit",
+                cot_slug=cot_slug,
+                stock_symbol=ticker,
+                date=date_str,
+                upside_threshold=upside_thresh,
+                downside_threshold=downside_thresh
+            )
+            
+            # Check cache (entries without a tracker record predate it and are refetched)
+            cached = await self.finchat_cache.aget(cache_key)
+            if cached is not None and "tracker" in cached:
+                # Position fields describe this run's position, not the one that was cached
+                self._track_signal(tracked_keys, cache_key, {
+                    **cached["tracker"],
+                    "timestamp": timestamp.isoformat(),
+                    "position_entry_date": position.entry_timestamp.isoformat(),
+                    "position_entry_price": position.entry_price,
+                    "current_price": float(position.current_price)
+                })
+                return cached.get("signal", False)
+            if cache_key in failed_keys:
+                return False
+            
+            # Concurrent callers for the same key share one in-flight COT call
+            return await self._single_flight(
+                cache_key, lambda: request_exit_signal(ticker, timestamp, position, date_str, cache_key)
+            )
         
         # Wrap async function to work with sync interface
         def exit_signal(
@@ -356,51 +539,34 @@ class StrategyParser:
     
     def _create_first_day_entry(self) -> Callable:
         """Create entry function that triggers on the first trading day"""
-        first_timestamp_seen = {}
-        first_day_triggered = {}
+        # Tickers that already had their first-day entry; only the first bar
+        # seen for a ticker can trigger, so membership is the whole state
+        triggered = set()
         
         def entry_signal(market_data: pd.DataFrame, ticker: str, timestamp: datetime) -> bool:
-            # Track the first timestamp we see for this ticker
-            if ticker not in first_timestamp_seen:
-                first_timestamp_seen[ticker] = timestamp
-                first_day_triggered[ticker] = True
-                logger.info(f"First day entry signal for {ticker} at {timestamp}")
-                return True
-            
-            # Check if this is still the first day (same date as first timestamp)
-            first_date = first_timestamp_seen[ticker].date()
-            current_date = timestamp.date()
-            
-            # If we haven't triggered yet and it's still the first day, trigger
-            if ticker not in first_day_triggered and current_date == first_date:
-                first_day_triggered[ticker] = True
-                logger.info(f"First day entry signal for {ticker} at {timestamp}")
-                return True
-            
-            return False
+            if ticker in triggered:
+                return False
+            triggered.add(ticker)
+            logger.info("First day entry signal for %s at %s", ticker, timestamp)
+            return True
         
         return entry_signal
     
     def _create_every_n_days_entry(self, n_days: int) -> Callable:
         """Create entry function that triggers every N days"""
-        last_entry_date = {}
-        days_since_last_entry = {}
+        # Last entry time per ticker as int64 nanoseconds
+        last_entry_ns: Dict[str, int] = {}
+        n_days_ns = n_days * NS_PER_DAY
         
         def entry_signal(market_data: pd.DataFrame, ticker: str, timestamp: datetime) -> bool:
-            if ticker not in last_entry_date:
-                # First entry
-                last_entry_date[ticker] = timestamp
-                days_since_last_entry[ticker] = 0
-                logger.debug(f"First entry signal for {ticker} at {timestamp}")
-                return True
+            now_ns = _timestamp_ns(timestamp)
+            last_ns = last_entry_ns.get(ticker)
             
-            # Calculate days since last entry
-            days_diff = (timestamp - last_entry_date[ticker]).days
-            
-            if days_diff >= n_days:
-                last_entry_date[ticker] = timestamp
-                days_since_last_entry[ticker] = 0
-                logger.debug(f"Every {n_days} days entry signal for {ticker} at {timestamp}")
+            # First entry, or at least N whole days since the last one
+            if last_ns is None or now_ns - last_ns >= n_days_ns:
+                last_entry_ns[ticker] = now_ns
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Every %d days entry signal for %s at %s", n_days, ticker, timestamp)
                 return True
             
             return False
@@ -430,20 +596,20 @@ class StrategyParser:
             if position is None:
                 return False
             
-            # Get all timestamps for this ticker
+            # Get the last timestamp for this ticker
             try:
-                ticker_data = market_data.xs(ticker, level='ticker')
-                all_timestamps = ticker_data.index.tolist()
+                arrays = self._get_ticker_arrays(market_data).get(ticker)
                 
-                if not all_timestamps:
+                if arrays is None or len(arrays.ts) == 0:
                     return False
                 
-                # Check if this is the last timestamp
-                last_timestamp = max(all_timestamps)
-                
                 # Exit if we're at or past the last timestamp
-                if timestamp >= last_timestamp:
-                    logger.info(f"Hold until end exit signal for {ticker} at {timestamp} (last timestamp: {last_timestamp})")
+                last_ns = arrays.ts[-1]
+                if _timestamp_ns(timestamp) >= last_ns:
+                    logger.info(
+                        "Hold until end exit signal for %s at %s (last timestamp: %s)",
+                        ticker, timestamp, pd.Timestamp(last_ns)
+                    )
                     return True
             except Exception as e:
                 logger.warning(f"Error checking hold until end for {ticker}: {e}")
@@ -457,6 +623,9 @@ class StrategyParser:
     
     def _create_exit_after_n_days(self, n_days: int) -> Callable:
         """Create exit function that exits after N days"""
+        # Resolved once at parse time: (t - entry).days >= n  <=>  t - entry >= n days
+        min_hold_ns = n_days * NS_PER_DAY
+        
         def exit_signal(
             market_data: pd.DataFrame,
             ticker: str,
@@ -466,9 +635,10 @@ class StrategyParser:
             if position is None:
                 return False
             
-            days_held = (timestamp - position.entry_timestamp).days
-            if days_held >= n_days:
-                logger.debug(f"Exit after {n_days} days signal for {ticker} at {timestamp}")
+            # Integer nanoseconds against the entry time precomputed on the Position
+            if _timestamp_ns(timestamp) - position.entry_time_ns >= min_hold_ns:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Exit after %d days signal for %s at %s", n_days, ticker, timestamp)
                 return True
             return False
         
@@ -483,9 +653,8 @@ class StrategyParser:
             position
         ) -> bool:
             # Only exit at the very end
-            if self.backtest_end and timestamp >= self.backtest_end:
-                return True
-            return False
+            end_ns = self._backtest_end_ns
+            return end_ns is not None and _timestamp_ns(timestamp) >= end_ns
         
         return exit_signal
 
@@ -502,7 +671,8 @@ def parse_strategy_logic(
     exit_finchat_slug: Optional[str] = None,
     upside_threshold: Optional[float] = None,
     downside_threshold: Optional[float] = None,
-    signal_tracker: Optional[List] = None
+    signal_tracker: Optional[List] = None,
+    finchat_cache: Optional[FinChatResponseCache] = None
 ) -> tuple[Optional[Callable], Optional[Callable]]:
     """
     Parse entry and exit logic strings or FinChat COT slugs into executable functions
@@ -517,11 +687,16 @@ def parse_strategy_logic(
         exit_prompt_type: Type of exit prompt ("string", "url", "finchat-slug")
         entry_finchat_slug: FinChat COT slug for entry logic
         exit_finchat_slug: FinChat COT slug for exit logic
+        finchat_cache: Optional cache for parsed COT signals
     
     Returns:
         Tuple of (entry_function, exit_function)
     """
-    parser = StrategyParser(finchat_client=finchat_client, signal_tracker=signal_tracker)
+    parser = StrategyParser(
+        finchat_client=finchat_client,
+        signal_tracker=signal_tracker,
+        finchat_cache=finchat_cache
+    )
     
     if backtest_start and backtest_end:
         parser.set_backtest_range(backtest_start, backtest_end)
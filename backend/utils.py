@@ -2,18 +2,97 @@
 Utility Functions Module
 Helper functions for calculations and data processing
 """
-from typing import Dict, Optional, Tuple, Any
-from datetime import datetime, timedelta
+import re
+from typing import Callable, Dict, FrozenSet, Optional, Tuple, Any, Union
+from datetime import date, datetime, timedelta
+from enum import IntEnum
+from functools import lru_cache
 import logging
 import numpy as np
+import pandas as pd
+
+from .signal_expressions import compile_expression
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+class CommissionType(IntEnum):
+    """Commission schedules, resolved once from the config string"""
+    PER_TRADE = 0
+    PER_SHARE = 1
+    PER_CONTRACT = 2
+
+
+_COMMISSION_TYPE_NAMES: Dict[str, CommissionType] = {
+    "per-trade": CommissionType.PER_TRADE,
+    "per-share": CommissionType.PER_SHARE,
+    "per-contract": CommissionType.PER_CONTRACT,
+}
+
+
+def resolve_commission_type(commission_type: Union[str, CommissionType, None]) -> Optional[CommissionType]:
+    """
+    Map a config commission type to CommissionType
+    
+    Args:
+        commission_type: "per-trade", "per-share", "per-contract" or a CommissionType
+    
+    Returns:
+        CommissionType, or None if the type is unknown
+    """
+    if isinstance(commission_type, CommissionType):
+        return commission_type
+    return _COMMISSION_TYPE_NAMES.get(commission_type)
+
+
+def make_commission_fn(
+    commission_type: Union[str, CommissionType],
+    commission_amount: float
+) -> Callable[[float, float], float]:
+    """
+    Bind a commission schedule once, for per-trade use
+    
+    Args:
+        commission_type: "per-trade", "per-share", "per-contract" or a CommissionType
+        commission_amount: Commission amount
+    
+    Returns:
+        Function (shares, price) -> commission cost
+    """
+    kind = resolve_commission_type(commission_type)
+    if kind == CommissionType.PER_TRADE:
+        return lambda shares, price: commission_amount
+    elif kind == CommissionType.PER_SHARE:
+        return lambda shares, price: commission_amount * abs(shares)
+    elif kind == CommissionType.PER_CONTRACT:
+        # For options trading
+        return lambda shares, price: commission_amount * (abs(shares) / 100)
+    else:
+        logger.warning(f"Unknown commission type: {commission_type}")
+        return lambda shares, price: 0.0
+
+
+# Bound schedules reused by the scalar helpers, so repeated calls with the
+# same settings do not rebuild their closures
+_cached_commission_fn = lru_cache(maxsize=64)(make_commission_fn)
+
+
 def calculate_commission(
     shares: float,
     price: float,
-    commission_type: str,
+    commission_type: Union[str, CommissionType],
     commission_amount: float
 ) -> float:
     """
@@ -22,29 +101,67 @@ def calculate_commission(
     Args:
         shares: Number of shares
         price: Price per share
-        commission_type: "per-trade", "per-share", "per-contract"
+        commission_type: "per-trade", "per-share", "per-contract" or a CommissionType
         commission_amount: Commission amount
     
     Returns:
         Commission cost
     """
-    if commission_type == "per-trade":
-        return commission_amount
-    elif commission_type == "per-share":
-        return commission_amount * abs(shares)
-    elif commission_type == "per-contract":
-        # For options trading
-        contracts = abs(shares) / 100
-        return commission_amount * contracts
-    else:
-        logger.warning(f"Unknown commission type: {commission_type}")
-        return 0.0
+    return _cached_commission_fn(commission_type, commission_amount)(shares, price)
+
+
+def make_total_cost_fn(
+    commission_type: Union[str, CommissionType],
+    commission_amount: float,
+    exchange_fees: float,
+    slippage: float
+) -> Callable[..., Tuple[float, float, float]]:
+    """
+    Bind a backtest's fee and slippage settings once
+    
+    Args:
+        commission_type: Commission type
+        commission_amount: Commission amount
+        exchange_fees: Exchange fees as percentage
+        slippage: Slippage as percentage
+    
+    Returns:
+        Function (shares, price, is_buy=True) -> (execution_price, total_cost, total_fees),
+        equivalent to calculate_total_cost with these settings
+    """
+    commission_fn = make_commission_fn(commission_type, commission_amount)
+    buy_factor = 1 + slippage / 100
+    sell_factor = 1 - slippage / 100
+    fee_rate = exchange_fees / 100
+    
+    def total_cost(shares: float, price: float, is_buy: bool = True) -> Tuple[float, float, float]:
+        # Apply slippage (worse price for trader)
+        execution_price = price * (buy_factor if is_buy else sell_factor)
+        
+        # Calculate gross value
+        gross_value = abs(shares) * execution_price
+        
+        # Total fees: commission + exchange fees
+        total_fees = commission_fn(shares, execution_price) + gross_value * fee_rate
+        
+        # Total cost (for buys) or net proceeds (for sells)
+        if is_buy:
+            total_cost = gross_value + total_fees
+        else:
+            total_cost = gross_value - total_fees
+        
+        return execution_price, total_cost, total_fees
+    
+    return total_cost
+
+
+_cached_total_cost_fn = lru_cache(maxsize=64)(make_total_cost_fn)
 
 
 def calculate_total_cost(
     shares: float,
     price: float,
-    commission_type: str,
+    commission_type: Union[str, CommissionType],
     commission_amount: float,
     exchange_fees: float,
     slippage: float,
@@ -65,31 +182,51 @@ def calculate_total_cost(
     Returns:
         (execution_price, total_cost, total_fees)
     """
-    # Apply slippage (worse price for trader)
-    if is_buy:
-        execution_price = price * (1 + slippage / 100)
-    else:
-        execution_price = price * (1 - slippage / 100)
-    
-    # Calculate gross value
-    gross_value = abs(shares) * execution_price
-    
-    # Calculate commission
-    commission = calculate_commission(shares, execution_price, commission_type, commission_amount)
-    
-    # Calculate exchange fees
-    exchange_fee = gross_value * (exchange_fees / 100)
-    
-    # Total fees
-    total_fees = commission + exchange_fee
+    return _cached_total_cost_fn(commission_type, commission_amount, exchange_fees, slippage)(
+        shares, price, is_buy
+    )
+
+
+def _close_price(bar_data: Dict[str, float]) -> Optional[float]:
+    return bar_data.get('close')
+
+
+def _midpoint_price(bar_data: Dict[str, float]) -> Optional[float]:
+    high = bar_data.get('high')
+    low = bar_data.get('low')
+    if high is not None and low is not None:
+        return (high + low) / 2
+    return None
+
+
+def _next_bar_open_price(bar_data: Dict[str, float]) -> Optional[float]:
+    # This should be handled by using next bar's open price
+    # For now, return None to indicate we need to wait
+    return None
+
+
+# Execution price handler per entry timing
+_EXECUTION_PRICE_HANDLERS = {
+    "same-bar-close": _close_price,
+    "midpoint": _midpoint_price,
+    # VWAP calculation would require volume data
+    # For simplicity, using close price as proxy
+    "vwap": _close_price,
+    "next-bar-open": _next_bar_open_price,
+}
+
+
+def execution_price_fn(entry_timing: str) -> Callable[[Dict[str, float]], Optional[float]]:
+    """
+    Resolve the execution price handler for an entry timing once
     
-    # Total cost (for buys) or net proceeds (for sells)
-    if is_buy:
-        total_cost = gross_value + total_fees
-    else:
-        total_cost = gross_value - total_fees
+    Args:
+        entry_timing: "next-bar-open", "same-bar-close", "midpoint", "vwap"
     
-    return execution_price, total_cost, total_fees
+    Returns:
+        Function mapping a bar (dict or Series with OHLCV) to a price or None
+    """
+    return _EXECUTION_PRICE_HANDLERS.get(entry_timing, _close_price)
 
 
 def get_execution_price(
@@ -106,33 +243,43 @@ def get_execution_price(
     Returns:
         Execution price or None if not available
     """
-    if entry_timing == "same-bar-close":
-        return bar_data.get('close')
-    elif entry_timing == "midpoint":
-        high = bar_data.get('high')
-        low = bar_data.get('low')
-        if high is not None and low is not None:
-            return (high + low) / 2
-    elif entry_timing == "vwap":
-        # VWAP calculation would require volume data
-        # For simplicity, using close price as proxy
-        return bar_data.get('close')
-    elif entry_timing == "next-bar-open":
-        # This should be handled by using next bar's open price
-        # For now, return None to indicate we need to wait
+    return execution_price_fn(entry_timing)(bar_data)
+
+
+# Weekday names accepted in tradingDays, as datetime.weekday() numbers
+_WEEKDAY_NAME_TO_INT = {
+    "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
+    "Friday": 4, "Saturday": 5, "Sunday": 6,
+}
+
+
+def build_trading_day_mask(trading_days: Optional[list]) -> Optional[FrozenSet[int]]:
+    """
+    Resolve weekday names to a set of weekday numbers once per backtest
+    
+    Args:
+        trading_days: List of allowed weekday names (e.g., ["Monday", "Tuesday"])
+    
+    Returns:
+        Frozenset of allowed weekday numbers, or None if no restriction.
+        Unrecognized names are ignored (they never matched before either).
+    """
+    if not trading_days:
         return None
-    else:
-        return bar_data.get('close')
+    return frozenset(
+        _WEEKDAY_NAME_TO_INT[name] for name in trading_days if name in _WEEKDAY_NAME_TO_INT
+    )
 
 
-def is_trading_day(timestamp: datetime, trading_days: list) -> bool:
+def is_trading_day(timestamp: datetime, trading_days: Union[list, FrozenSet[int], None]) -> bool:
     """
     Check if timestamp falls on an allowed trading day
     Automatically skips weekends (Saturday and Sunday) and US market holidays
     
     Args:
         timestamp: Datetime to check
-        trading_days: List of allowed weekday names (e.g., ["Monday", "Tuesday"])
+        trading_days: List of allowed weekday names (e.g., ["Monday", "Tuesday"]),
+                      or a mask from build_trading_day_mask.
                       If empty, defaults to Monday-Friday excluding holidays
     
     Returns:
@@ -143,17 +290,46 @@ def is_trading_day(timestamp: datetime, trading_days: list) -> bool:
     if weekday >= 5:  # Saturday or Sunday
         return False
     
-    # Check if it's a US market holiday
-    if _is_us_market_holiday(timestamp):
+    # If trading_days is specified, check if this weekday is allowed
+    if trading_days is not None and not isinstance(trading_days, frozenset):
+        trading_days = build_trading_day_mask(trading_days)
+    if trading_days is not None and weekday not in trading_days:
         return False
     
-    # If trading_days list is specified, check if this weekday is allowed
-    if trading_days:
-        weekday_name = timestamp.strftime("%A")
-        return weekday_name in trading_days
+    # Check if it's a US market holiday
+    return not _is_us_market_holiday(timestamp)
+
+
+def trading_day_flags(
+    timestamps: pd.DatetimeIndex,
+    trading_days: Union[list, FrozenSet[int], None]
+) -> np.ndarray:
+    """
+    Vectorized is_trading_day over a whole timestamp index
+    
+    Weekday rules are applied as array ops; the holiday calendar is evaluated
+    once per distinct remaining date.
     
-    # Default: allow Monday-Friday (already checked weekends above)
-    return True
+    Args:
+        timestamps: Bar timestamps
+        trading_days: Weekday names or a mask from build_trading_day_mask
+    
+    Returns:
+        Boolean array, True where is_trading_day would return True
+    """
+    if trading_days is not None and not isinstance(trading_days, frozenset):
+        trading_days = build_trading_day_mask(trading_days)
+    
+    weekdays = timestamps.dayofweek.to_numpy()
+    allowed = weekdays < 5
+    if trading_days is not None:
+        allowed &= np.isin(weekdays, list(trading_days))
+    
+    dates = timestamps.normalize()
+    holidays = [date for date in dates[allowed].unique() if _is_us_market_holiday(date)]
+    if holidays:
+        allowed &= ~dates.isin(holidays)
+    return allowed
 
 
 def _is_us_market_holiday(date: datetime) -> bool:
@@ -250,36 +426,108 @@ def _is_us_market_holiday(date: datetime) -> bool:
     return False
 
 
-def calculate_atr(prices: list, period: int = 14) -> float:
+def _wilder_atr_kernel(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> float:
     """
-    Calculate Average True Range (ATR)
+    Wilder-smoothed ATR over bars 1..N-1
+
+    Seeded with the mean of the first `period` true ranges, then
+    atr = (atr * (period - 1) + tr) / period for each later bar.
+    """
+    n = high.shape[0]
+    atr = 0.0
+    for i in range(1, n):
+        tr = max(
+            high[i] - low[i],
+            abs(high[i] - close[i - 1]),
+            abs(low[i] - close[i - 1])
+        )
+        if i <= period:
+            atr += tr
+            if i == period:
+                atr /= period
+        else:
+            atr = (atr * (period - 1) + tr) / period
+    return atr
+
+
+if NUMBA_AVAILABLE:
+    _wilder_atr = njit(cache=True)(_wilder_atr_kernel)
+else:
+    _wilder_atr = _wilder_atr_kernel
+
+
+def calculate_atr_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = 14,
+    smoothing: str = "simple"
+) -> float:
+    """
+    Calculate Average True Range (ATR) from parallel high/low/close arrays
+    
+    Contiguous float64 columns feed both the NumPy path and the numba
+    Wilder kernel directly, with no per-bar tuples.
     
     Args:
-        prices: List of (high, low, close) tuples
+        high: High prices, oldest first
+        low: Low prices, oldest first
+        close: Close prices, oldest first
         period: ATR period
+        smoothing: "simple" (mean of the last `period` true ranges) or
+            "wilder" (recursive Wilder smoothing over the whole series)
     
     Returns:
         ATR value
     """
-    if len(prices) < period + 1:
+    if len(close) < period + 1:
         return 0.0
     
-    true_ranges = []
-    for i in range(1, len(prices)):
-        high = prices[i][0]
-        low = prices[i][1]
-        prev_close = prices[i-1][2]
-        
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        true_ranges.append(tr)
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    
+    if smoothing == "wilder":
+        return float(_wilder_atr(high, low, close, period))
+    
+    prev_close = close[:-1]
+    true_ranges = np.maximum(
+        high[1:] - low[1:],
+        np.maximum(np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close))
+    )
     
     # Calculate average
-    atr = sum(true_ranges[-period:]) / period
-    return atr
+    return float(true_ranges[-period:].mean())
+
+
+def calculate_atr(prices: Union[list, np.ndarray], period: int = 14, smoothing: str = "simple") -> float:
+    """
+    Calculate Average True Range (ATR)
+    
+    Args:
+        prices: List of (high, low, close) tuples, or an (N, 3) array.
+            Callers holding separate columns should use calculate_atr_arrays.
+        period: ATR period
+        smoothing: "simple" or "wilder" (see calculate_atr_arrays)
+    
+    Returns:
+        ATR value
+    """
+    if len(prices) < period + 1:
+        return 0.0
+    
+    ohlc = np.asarray(prices, dtype=np.float64)
+    return calculate_atr_arrays(ohlc[:, 0], ohlc[:, 1], ohlc[:, 2], period, smoothing)
+
+
+# Cheap shape check before datetime.fromisoformat: YYYY-MM-DD or YYYYMMDD prefix
+_ISO_DATE_RE = re.compile(r'\d{4}-?\d{2}-?\d{2}', re.ASCII)
+
+
+@lru_cache(maxsize=128)
+def _parse_iso_datetime(value: str) -> datetime:
+    """ISO-8601 string (with optional trailing Z) to datetime, memoized across configs"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
 
 def validate_backtest_config(config: dict) -> Tuple[bool, str]:
@@ -293,48 +541,68 @@ def validate_backtest_config(config: dict) -> Tuple[bool, str]:
         (is_valid, error_message)
     """
     # Check market data
-    if not config.get('marketData'):
+    market_data = config.get('marketData')
+    if not market_data:
         return False, "Market data configuration is required"
     
-    market_data = config['marketData']
-    
     if not market_data.get('tickers'):
         return False, "Tickers are required"
     
-    if not market_data.get('startDate') or not market_data.get('endDate'):
-        return False, "Start date and end date are required"
-    
-    # Validate date order
     start_date = market_data.get('startDate')
     end_date = market_data.get('endDate')
+    if not start_date or not end_date:
+        return False, "Start date and end date are required"
     
+    # Validate date order
     if isinstance(start_date, str):
-        start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+        if not _ISO_DATE_RE.match(start_date):
+            return False, f"Invalid start date: {start_date}"
+        start_date = _parse_iso_datetime(start_date)
     if isinstance(end_date, str):
-        end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+        if not _ISO_DATE_RE.match(end_date):
+            return False, f"Invalid end date: {end_date}"
+        end_date = _parse_iso_datetime(end_date)
     
     if start_date >= end_date:
         return False, "Start date must be before end date"
     
     # Check portfolio settings
-    if not config.get('portfolioRisk'):
+    portfolio_risk = config.get('portfolioRisk')
+    if not portfolio_risk:
         return False, "Portfolio and risk settings are required"
     
-    portfolio_risk = config['portfolioRisk']
-    
-    if not portfolio_risk.get('initialCapital'):
+    initial_capital = portfolio_risk.get('initialCapital')
+    if not initial_capital:
         return False, "Initial capital is required"
     
-    if portfolio_risk.get('initialCapital', 0) <= 0:
+    if initial_capital <= 0:
         return False, "Initial capital must be positive"
     
     # Check strategy settings
-    if not config.get('strategy'):
+    strategy = config.get('strategy')
+    if not strategy:
         return False, "Strategy definition is required"
     
+    # Symbolic expressions with bad arguments fail here rather than per ticker mid-run
+    for key, boolean in (('entryLogic', True), ('exitLogic', True), ('rankingLogic', False)):
+        try:
+            compile_expression(strategy.get(key), boolean=boolean)
+        except ValueError as e:
+            return False, f"Invalid {key}: {e}"
+    
     return True, "OK"
 
 
+# Whitespace removed from ticker lists (symbols never contain spaces)
+_TICKER_STRIP_TABLE = str.maketrans('', '', ' \t\r\n')
+
+
+@lru_cache(maxsize=256)
+def _parse_tickers_cached(tickers_string: str) -> Tuple[str, ...]:
+    # One translate + upper + split pass instead of strip/upper per ticker
+    return tuple(filter(None, tickers_string.translate(_TICKER_STRIP_TABLE).upper().split(',')))
+
+
 def parse_tickers(tickers_string: str) -> list:
     """
     Parse comma-separated ticker string into list
@@ -348,18 +616,27 @@ def parse_tickers(tickers_string: str) -> list:
     if not tickers_string:
         return []
     
-    tickers = [t.strip().upper() for t in tickers_string.split(',')]
-    return [t for t in tickers if t]
+    # Parsing is memoized; callers get their own list to mutate
+    return list(_parse_tickers_cached(tickers_string))
+
+
+_format_currency = "${:,.2f}".format
+
+# Bound str.format per decimal count, built on first use
+_PERCENT_FORMATS: Dict[int, Callable[[float], str]] = {}
 
 
 def format_currency(value: float) -> str:
     """Format value as currency string"""
-    return f"${value:,.2f}"
+    return _format_currency(value)
 
 
 def format_percent(value: float, decimals: int = 2) -> str:
     """Format value as percentage string"""
-    return f"{value:.{decimals}f}%"
+    formatter = _PERCENT_FORMATS.get(decimals)
+    if formatter is None:
+        formatter = _PERCENT_FORMATS[decimals] = f"{{:.{decimals}f}}%".format
+    return formatter(value)
 
 
 def get_week_start(date: datetime) -> datetime:
@@ -369,6 +646,17 @@ def get_week_start(date: datetime) -> datetime:
     return week_start.replace(hour=0, minute=0, second=0, microsecond=0)
 
 
+def week_start_labels(timestamps: pd.DatetimeIndex) -> np.ndarray:
+    """
+    get_week_start for a whole index at once
+    
+    Returns:
+        datetime64 array holding the Monday 00:00 of each timestamp's week
+    """
+    days = timestamps.normalize()
+    return (days - pd.to_timedelta(timestamps.dayofweek, unit='D')).to_numpy()
+
+
 def apply_borrow_cost(
     position_value: float,
     borrow_cost: float,
@@ -390,34 +678,93 @@ def apply_borrow_cost(
     return daily_cost * days_held
 
 
+# Per-type converter for numpy values (None for non-numpy types), filled on first sight
+_NUMPY_CONVERTERS: Dict[type, Optional[Callable[[Any], Any]]] = {}
+
+# Exact types convert_numpy_types returns unchanged without further checks
+_NATIVE_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _numpy_converter(obj_type: type) -> Optional[Callable[[Any], Any]]:
+    """Native-type converter for a numpy scalar/array type, memoized by type"""
+    try:
+        return _NUMPY_CONVERTERS[obj_type]
+    except KeyError:
+        pass
+    
+    if issubclass(obj_type, np.integer):
+        converter = int
+    # np.float_ removed in NumPy 2.0; np.floating covers every float width
+    elif issubclass(obj_type, np.floating):
+        converter = float
+    elif issubclass(obj_type, np.ndarray):
+        converter = np.ndarray.tolist
+    elif issubclass(obj_type, np.bool_):
+        converter = bool
+    else:
+        converter = None
+    _NUMPY_CONVERTERS[obj_type] = converter
+    return converter
+
+
+def numpy_json_default(obj: Any) -> Any:
+    """
+    `default=` hook for json.dump / json.dumps
+    
+    Converts numpy scalars and arrays to native types; anything else the
+    encoder cannot handle (e.g. datetimes) is stringified as with default=str.
+    The encoder walks the structure itself, so no convert_numpy_types pre-pass
+    is needed.
+    """
+    converter = _numpy_converter(type(obj))
+    return converter(obj) if converter is not None else str(obj)
+
+
+def _msgspec_enc_hook(obj: Any) -> Any:
+    """msgspec enc_hook: numpy scalars/arrays to native types, Timestamps to datetime"""
+    converter = _numpy_converter(type(obj))
+    if converter is not None:
+        return converter(obj)
+    if isinstance(obj, pd.Timestamp):
+        return obj.to_pydatetime()
+    raise TypeError(f"Unsupported type: {type(obj)}")
+
+
+def _convert_numpy_types_py(obj: Any) -> Any:
+    obj_type = type(obj)
+    if obj_type in _NATIVE_SCALAR_TYPES:
+        return obj
+    if isinstance(obj, dict):
+        return {key: _convert_numpy_types_py(value) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [_convert_numpy_types_py(item) for item in obj]
+    elif isinstance(obj, set):
+        return {_convert_numpy_types_py(item) for item in obj}
+    
+    converter = _numpy_converter(obj_type)
+    return converter(obj) if converter is not None else obj
+
+
 def convert_numpy_types(obj: Any) -> Any:
     """
     Recursively convert numpy types to native Python types for JSON serialization
     
+    Uses msgspec's C tree walker when installed; structures holding types it
+    cannot represent fall back to the pure-Python walk, which leaves them as-is.
+    
     Args:
         obj: Object that may contain numpy types
     
     Returns:
         Object with numpy types converted to Python types
     """
-    # Check for numpy integer types
-    if isinstance(obj, (np.integer, np.int_, np.intc, np.intp, np.int8,
-                        np.int16, np.int32, np.int64, np.uint8, np.uint16,
-                        np.uint32, np.uint64)):
-        return int(obj)
-    # Check for numpy float types (np.float_ removed in NumPy 2.0)
-    elif isinstance(obj, (np.floating, np.float16, np.float32, np.float64)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, set):
-        return {convert_numpy_types(item) for item in obj}
-    else:
-        return obj
-
+    if MSGSPEC_AVAILABLE:
+        try:
+            return msgspec.to_builtins(
+                obj,
+                builtin_types=(datetime, date, timedelta),
+                enc_hook=_msgspec_enc_hook
+            )
+        except TypeError:
+            pass
+    return _convert_numpy_types_py(obj)
@@ -5,8 +5,40 @@ Period: Jan 1, 2025 to March 31, 2025
 """
 import asyncio
 import json
+import sys
 from datetime import datetime
+import pandas as pd
 from backend.backtest_engine import BacktestEngine
+from backend.utils import numpy_json_default
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: uvloop's libuv event loop cuts asyncio scheduling overhead for the
+# concurrent data/FinChat requests; asyncio.run picks up the installed policy
+try:
+    import uvloop
+    uvloop.install()
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def save_results(results: dict, output_file: str):
+    """Write results as indented JSON (orjson when installed, stdlib json otherwise)"""
+    if ORJSON_AVAILABLE:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=numpy_json_default
+            ))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2, default=numpy_json_default)
 
 
 async def run_fxy_backtest():
@@ -167,14 +199,20 @@ async def run_fxy_backtest():
         if trades:
             print(f"All Trades ({len(trades)} total):")
             print("-" * 60)
-            for i, trade in enumerate(trades, 1):
-                print(f"  Trade {i}:")
-                print(f"    Entry: {trade.get('Entry Date')} @ ${trade.get('Entry Price', 0):.2f}")
-                print(f"    Exit:  {trade.get('Exit Date')} @ ${trade.get('Exit Price', 0):.2f}")
-                print(f"    Shares: {trade.get('Shares', 0)}")
-                print(f"    P&L: ${trade.get('P&L', 0):,.2f} ({trade.get('P&L %', 0):.2f}%)")
-                print(f"    Reason: {trade.get('Exit Reason', 'N/A')}")
-                print()
+            # Columnar trade table: derived columns computed once over the whole log
+            trade_log = pd.DataFrame(trades)
+            trade_log.index = pd.RangeIndex(1, len(trade_log) + 1, name='Trade')
+            if 'P&L' in trade_log.columns:
+                trade_log['Cum P&L'] = trade_log['P&L'].cumsum()
+            money = '${:,.2f}'.format
+            formatters = {
+                column: money
+                for column in ('Entry Price', 'Exit Price', 'P&L', 'Cum P&L')
+                if column in trade_log.columns
+            }
+            if 'P&L %' in trade_log.columns:
+                formatters['P&L %'] = '{:.2f}%'.format
+            sys.stdout.write(trade_log.to_string(formatters=formatters) + "\n\n")
         else:
             print("No trades executed.")
             print()
@@ -184,16 +222,19 @@ async def run_fxy_backtest():
         if positions:
             print("Open Positions:")
             print("-" * 60)
+            lines = []
             for pos in positions:
-                print(f"  {pos.get('ticker')}: {pos.get('shares')} shares @ ${pos.get('entry_price', 0):.2f}")
-                print(f"    Current: ${pos.get('current_price', 0):.2f}")
-                print(f"    P&L: ${pos.get('pnl', 0):,.2f} ({pos.get('pnl_percent', 0):.2f}%)")
-                print()
+                lines.append(
+                    f"  {pos.get('ticker')}: {pos.get('shares')} shares @ ${pos.get('entry_price', 0):.2f}\n"
+                    f"    Current: ${pos.get('current_price', 0):.2f}\n"
+                    f"    P&L: ${pos.get('pnl', 0):,.2f} ({pos.get('pnl_percent', 0):.2f}%)\n"
+                    f"\n"
+                )
+            sys.stdout.write("".join(lines))
         
         # Save full results to file
         output_file = 'fxy_backtest_results.json'
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        save_results(results, output_file)
         
         print(f"Full results saved to: {output_file}")
         print()
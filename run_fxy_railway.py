@@ -3,220 +3,406 @@
 CLI script to run FXY backtest via Railway API endpoint
 Period: Jan 1, 2025 to March 31, 2025
 Uses FinChat COT for entry/exit signals
+
+Pass tickers as arguments (e.g. `run_fxy_railway.py FXY FXE`) to submit and
+follow several backtests concurrently.
 """
-import requests
+import aiohttp
+import asyncio
+import gzip
+import hashlib
 import json
+import random
+import shutil
+import sys
 import time
 import os
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Railway backend URL
 RAILWAY_URL = os.getenv("RAILWAY_URL", "https://backtester-2-production.up.railway.app")
 
-def create_fxy_backtest_config():
-    """Create FXY backtest configuration"""
+# Connection pool shared by every Railway call (keep-alive, TLS reused).
+# Each running job holds one status stream open, so the pool grows with the
+# number of jobs plus headroom for submits and fallback polls.
+MAX_CONNECTIONS = int(os.getenv("RAILWAY_MAX_CONNECTIONS", "8"))
+POOL_HEADROOM = 4
+KEEPALIVE_SECONDS = 60
+
+# Request bodies are sent gzip-compressed; aiohttp already asks for (and
+# transparently decodes) gzip-compressed responses
+GZIP_JSON_HEADERS = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+# Results bodies are written to disk in chunks of this many bytes
+RESULTS_CHUNK_SIZE = 64 * 1024
+
+# Completed results cached on disk by config hash; set RESULTS_CACHE_DIR=""
+# to always resubmit
+RESULTS_CACHE_DIR = os.path.expanduser(os.getenv("RESULTS_CACHE_DIR", "~/.backtester_cache"))
+
+# Status polling backoff: 1s, 1.7s, 2.9s, ... capped at 30s, plus jitter
+POLL_MIN_INTERVAL = 1.0
+POLL_MAX_INTERVAL = 30.0
+POLL_BACKOFF = 1.7
+POLL_JITTER = 0.5
+
+# Backtest definition shared by every run; create_fxy_backtest_config copies it
+# and fills in the run name, ticker and period
+_FXY_CONFIG_TEMPLATE = {
+    "name": "{ticker} FinChat COT Backtest - {ts}",
+    "data": {
+        "marketData": {
+            "tickers": "FXY",
+            "fields": ["open", "high", "low", "close", "volume", "adjusted_close"],
+            "frequency": "daily",
+            "startDate": "2025-01-01",
+            "endDate": "2025-01-15",
+            "includeDividends": True,
+            "includeSplits": True,
+            "includeDelistings": False,
+            "benchmark": None
+        },
+        "strategy": {
+            "entryPromptType": "finchat-slug",
+            "entryFinChatSlug": "conditional-stock-purchase",
+            "exitPromptType": "finchat-slug",
+            "exitFinChatSlug": "conditional-stock-sell-trigger",
+            "upsideThreshold": 0.01,  # 0.01 = 1% as decimal
+            "downsideThreshold": 0.01,  # 0.01 = 1% as decimal
+            "positionSizingMethod": "fixed-dollar",
+            "fixedDollarAmount": 10000.0,  # $10,000 notional per trade
+            "maxPositions": 1,
+            "eligibleSymbols": "FXY",
+            "takeProfit": None,
+            "stopLoss": None,
+            "timeBasedExit": None,
+            "rankingLogic": None
+        },
+        "portfolioRisk": {
+            "initialCapital": 100000.0,
+            "leverageAllowed": False,
+            "maxLeverage": 1.0,
+            "maxSingleAssetPercent": 100.0,
+            "maxSectorPercent": 100.0,
+            "maxNetExposure": 100.0,
+            "stopLossType": "fixed-percent",
+            "useTrailingStops": False,
+            "trailingStopDistance": None,
+            "maxDailyDrawdown": None,
+            "maxWeeklyDrawdown": None
+        },
+        "tradingExecution": {
+            "entryTiming": "same-bar-close",  # Execute at close of signal bar
+            "orderType": "market",
+            "commissionType": "per-trade",
+            "commissionAmount": 1.0,
+            "exchangeFees": 0.0,
+            "slippage": 0.0,
+            "tradingDays": [],
+            "handleMissingData": "skip",
+            "shortSellingAllowed": False,
+            "borrowCost": 0.0
+        },
+        "mtm": {
+            "mtmFrequency": "every-bar",
+            "mtmPrice": "close",
+            "baseCurrency": "USD",
+            "fxFrequency": "daily",
+            "mtmFXSeparately": False,
+            "adjustForSplitsDividends": True,
+            "bookDividendCashflows": False
+        },
+        "rebalancing": {
+            "rebalancingType": None,
+            "dropDelisted": False,
+            "dropBelowThresholds": False,
+            "exitIneligible": False,
+            "rebalancingMethod": "full",
+            "minShares": 1,
+            "minNotional": 0.0
+        },
+        "output": {
+            "basicMetrics": ["Total Return", "CAGR", "Max Drawdown", "Volatility"],
+            "ratioMetrics": ["Sharpe Ratio", "Sortino Ratio", "Calmar Ratio"],
+            "tradeStats": ["Win Rate", "Average Win/Loss", "Profit Factor", "Average Holding Period"],
+            "outputFormats": ["Equity Curve", "Trade Log"],
+            "benchmarkSymbol": None,
+            "benchmarkMetrics": []
+        },
+        "implementation": {
+            "programmingEnv": "python",
+            "dataFormat": "json",
+            "columnNames": "timestamp,open,high,low,close,volume",
+            "dateFormat": "YYYY-MM-DD"
+        }
+    }
+}
+
+def create_fxy_backtest_config(ticker="FXY", start_date="2025-01-01", end_date="2025-01-15"):
+    """
+    Create FXY backtest configuration (ticker and period overridable)
+    
+    Only the dicts that vary per run are copied; the other sections are shared
+    with the template and must be treated as read-only.
+    """
+    data = _FXY_CONFIG_TEMPLATE["data"]
     return {
-        "name": f"FXY FinChat COT Backtest - {datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        "name": _FXY_CONFIG_TEMPLATE["name"].format(ticker=ticker, ts=datetime.now().strftime('%Y%m%d_%H%M%S')),
         "data": {
-            "marketData": {
-                "tickers": "FXY",
-                "fields": ["open", "high", "low", "close", "volume", "adjusted_close"],
-                "frequency": "daily",
-                "startDate": "2025-01-01",
-                "endDate": "2025-01-15",
-                "includeDividends": True,
-                "includeSplits": True,
-                "includeDelistings": False,
-                "benchmark": None
-            },
-            "strategy": {
-                "entryPromptType": "finchat-slug",
-                "entryFinChatSlug": "conditional-stock-purchase",
-                "exitPromptType": "finchat-slug",
-                "exitFinChatSlug": "conditional-stock-sell-trigger",
-                "upsideThreshold": 0.01,  # 0.01 = 1% as decimal
-                "downsideThreshold": 0.01,  # 0.01 = 1% as decimal
-                "positionSizingMethod": "fixed-dollar",
-                "fixedDollarAmount": 10000.0,  # $10,000 notional per trade
-                "maxPositions": 1,
-                "eligibleSymbols": "FXY",
-                "takeProfit": None,
-                "stopLoss": None,
-                "timeBasedExit": None,
-                "rankingLogic": None
-            },
-            "portfolioRisk": {
-                "initialCapital": 100000.0,
-                "leverageAllowed": False,
-                "maxLeverage": 1.0,
-                "maxSingleAssetPercent": 100.0,
-                "maxSectorPercent": 100.0,
-                "maxNetExposure": 100.0,
-                "stopLossType": "fixed-percent",
-                "useTrailingStops": False,
-                "trailingStopDistance": None,
-                "maxDailyDrawdown": None,
-                "maxWeeklyDrawdown": None
-            },
-            "tradingExecution": {
-                "entryTiming": "same-bar-close",  # Execute at close of signal bar
-                "orderType": "market",
-                "commissionType": "per-trade",
-                "commissionAmount": 1.0,
-                "exchangeFees": 0.0,
-                "slippage": 0.0,
-                "tradingDays": [],
-                "handleMissingData": "skip",
-                "shortSellingAllowed": False,
-                "borrowCost": 0.0
-            },
-            "mtm": {
-                "mtmFrequency": "every-bar",
-                "mtmPrice": "close",
-                "baseCurrency": "USD",
-                "fxFrequency": "daily",
-                "mtmFXSeparately": False,
-                "adjustForSplitsDividends": True,
-                "bookDividendCashflows": False
-            },
-            "rebalancing": {
-                "rebalancingType": None,
-                "dropDelisted": False,
-                "dropBelowThresholds": False,
-                "exitIneligible": False,
-                "rebalancingMethod": "full",
-                "minShares": 1,
-                "minNotional": 0.0
-            },
-            "output": {
-                "basicMetrics": ["Total Return", "CAGR", "Max Drawdown", "Volatility"],
-                "ratioMetrics": ["Sharpe Ratio", "Sortino Ratio", "Calmar Ratio"],
-                "tradeStats": ["Win Rate", "Average Win/Loss", "Profit Factor", "Average Holding Period"],
-                "outputFormats": ["Equity Curve", "Trade Log"],
-                "benchmarkSymbol": None,
-                "benchmarkMetrics": []
-            },
-            "implementation": {
-                "programmingEnv": "python",
-                "dataFormat": "json",
-                "columnNames": "timestamp,open,high,low,close,volume",
-                "dateFormat": "YYYY-MM-DD"
-            }
-        }
+            **data,
+            "marketData": {**data["marketData"], "tickers": ticker, "startDate": start_date, "endDate": end_date},
+            "strategy": {**data["strategy"], "eligibleSymbols": ticker},
+        },
     }
 
-def submit_backtest():
-    """Submit backtest to Railway API"""
+def save_results(results, output_file):
+    """Write results as indented JSON (orjson when installed, stdlib json otherwise)"""
+    if ORJSON_AVAILABLE:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+
+def parse_json(data):
+    """Parse a JSON document from str or bytes (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity literals (json.dumps' default) are not strict JSON
+            pass
+    return json.loads(data)
+
+def encode_json(payload):
+    """Compact JSON bytes (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+def gzip_json(body):
+    """Gzip-compressed request body from encoded JSON bytes (sent with GZIP_JSON_HEADERS)"""
+    return gzip.compress(body)
+
+def config_cache_key(config):
+    """SHA-256 of the backtest definition (the run name is excluded)"""
+    canonical = json.dumps(config["data"], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def results_file(job_id):
+    """Local file the full results of a job are saved to"""
+    return f'fxy_railway_results_{job_id[:8]}.json'
+
+def load_cached_results(key):
+    """Cached results for a config key, or None"""
+    if not RESULTS_CACHE_DIR:
+        return None
+    try:
+        with open(os.path.join(RESULTS_CACHE_DIR, f"{key}.json"), 'rb') as f:
+            return parse_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+def store_cached_results(key, source_file):
+    """Copy a saved results file into the cache (atomically, so readers never see a partial file)"""
+    if not RESULTS_CACHE_DIR:
+        return
+    try:
+        os.makedirs(RESULTS_CACHE_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_CACHE_DIR, f"{key}.json")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.copyfile(source_file, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"✗ Could not cache results: {e}")
+
+async def error_detail(response):
+    """Best-effort `detail` message from an error response"""
+    try:
+        error_data = await response.json(content_type=None)
+        return f"  Error: {error_data.get('detail', 'Unknown error')}"
+    except Exception:
+        return f"  Response: {await response.text()}"
+
+async def check_health(session):
+    """Check the Railway backend is up"""
+    print("Checking Railway backend health...")
+    try:
+        async with session.get(f"{RAILWAY_URL}/health", timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+        print(f"✓ Railway backend is healthy")
+        return True
+    except Exception as e:
+        print(f"✗ Railway backend health check failed: {e}")
+        return False
+
+async def submit_backtest(session, ticker="FXY", start_date="2025-01-01", end_date="2025-01-15", config=None, body=None):
+    """Submit backtest to Railway API (body: the config already encoded with encode_json)"""
     print("=" * 80)
-    print("FXY Backtest via Railway API")
+    print(f"{ticker} Backtest via Railway API")
     print("=" * 80)
     print()
     print(f"Railway URL: {RAILWAY_URL}")
-    print(f"Ticker: FXY")
-    print(f"Period: 2025-01-01 to 2025-01-15")
+    print(f"Ticker: {ticker}")
+    print(f"Period: {start_date} to {end_date}")
     print(f"Entry COT: conditional-stock-purchase")
     print(f"Exit COT: conditional-stock-sell-trigger")
     print()
     
-    # Check health first
-    print("Checking Railway backend health...")
-    try:
-        health_response = requests.get(f"{RAILWAY_URL}/health", timeout=10)
-        health_response.raise_for_status()
-        print(f"✓ Railway backend is healthy")
-    except Exception as e:
-        print(f"✗ Railway backend health check failed: {e}")
-        return None
-    
     # Submit backtest
-    print()
-    print("Submitting backtest job...")
-    config = create_fxy_backtest_config()
+    print(f"[{ticker}] Submitting backtest job...")
+    if body is None:
+        if config is None:
+            config = create_fxy_backtest_config(ticker, start_date, end_date)
+        body = encode_json(config)
     
     try:
-        response = requests.post(
+        async with session.post(
             f"{RAILWAY_URL}/run_backtest",
-            json=config,
-            headers={"Content-Type": "application/json"},
-            timeout=30
-        )
-        response.raise_for_status()
+            data=gzip_json(body),
+            headers=GZIP_JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status >= 400:
+                print(f"✗ [{ticker}] Failed to submit backtest: HTTP {response.status}")
+                print(await error_detail(response))
+                return None
+            data = await response.json()
         
-        data = response.json()
         job_id = data.get('job_id')
-        print(f"✓ Backtest job submitted")
+        print(f"✓ [{ticker}] Backtest job submitted")
         print(f"  Job ID: {job_id}")
         print(f"  Status: {data.get('status')}")
         print()
         
         return job_id
     except Exception as e:
-        print(f"✗ Failed to submit backtest: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            try:
-                error_data = e.response.json()
-                print(f"  Error: {error_data.get('detail', 'Unknown error')}")
-            except:
-                print(f"  Response: {e.response.text}")
+        print(f"✗ [{ticker}] Failed to submit backtest: {e}")
         return None
 
-def poll_status(job_id, max_wait=600):
-    """Poll for backtest completion"""
+def report_failure(job_id, data):
+    """Print the error details carried by a failed job's final status"""
+    print(f"\n✗ Backtest {job_id[:8]} failed")
+    if 'error' in data:
+        print(f"  Error: {data['error']}")
+    if 'error_traceback' in data:
+        print(f"\n  Traceback:")
+        print(f"  {data['error_traceback'][:500]}")
+
+async def iter_sse_data(response):
+    """
+    Yield the parsed `data:` payloads of a Server-Sent Events response
+    
+    Splits lines itself rather than using StreamReader line iteration, which
+    rejects lines longer than its buffer (a completed event can carry the
+    full results).
+    """
+    pending = bytearray()
+    async for chunk in response.content.iter_any():
+        parts = chunk.split(b"\n")
+        pending += parts[0]
+        for part in parts[1:]:
+            if pending.startswith(b"data:"):
+                yield parse_json(bytes(pending[len(b"data:"):]))
+            pending = bytearray(part)
+
+async def stream_status(session, job_id, start_time, max_wait):
+    """
+    Follow job status over the backend's Server-Sent Events stream
+    
+    Returns:
+        The terminal (completed/failed) status payload, or None if the backend
+        has no stream endpoint or the stream ended without a terminal status
+    """
+    try:
+        async with session.get(
+            f"{RAILWAY_URL}/backtest_status_stream/{job_id}",
+            params={"include_results": "true"},
+            headers={"Accept": "text/event-stream"},
+            timeout=aiohttp.ClientTimeout(total=max_wait, sock_connect=10)
+        ) as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            
+            async for data in iter_sse_data(response):
+                status = data.get('status')
+                elapsed = int(time.time() - start_time)
+                
+                print(f"[{elapsed:4d}s] {job_id[:8]} Status: {status}")
+                
+                if status == "completed":
+                    print(f"\n✓ Backtest {job_id[:8]} completed in {elapsed} seconds")
+                    return data
+                elif status == "failed":
+                    return data
+    except Exception as e:
+        print(f"✗ Status stream error, falling back to polling: {e}")
+    return None
+
+async def poll_status(session, job_id, max_wait=600):
+    """
+    Wait for backtest completion, streaming status events when the backend supports it
+    
+    Returns:
+        The terminal status payload (with inline `results` when completed and
+        the backend provides them), or None if the job did not finish in time
+    """
     if not job_id:
         return None
     
-    print("=" * 80)
-    print("Polling for Backtest Completion")
-    print("=" * 80)
-    print()
-    print("Note: FinChat COT calls may take time. This could take several minutes...")
-    print()
+    print(f"Waiting for backtest {job_id[:8]} (FinChat COT calls may take several minutes)...")
     
     start_time = time.time()
-    check_interval = 5
+    attempts = 0
+    
+    data = await stream_status(session, job_id, start_time, max_wait)
+    if data is not None:
+        return data
     
     while time.time() - start_time < max_wait:
+        # Poll fast while the job may finish quickly, then back off
+        check_interval = (
+            min(POLL_MAX_INTERVAL, POLL_MIN_INTERVAL * POLL_BACKOFF ** attempts)
+            + random.uniform(0, POLL_JITTER)
+        )
+        attempts += 1
         try:
-            response = requests.get(f"{RAILWAY_URL}/backtest_status/{job_id}", timeout=10)
-            response.raise_for_status()
+            async with session.get(
+                f"{RAILWAY_URL}/backtest_status/{job_id}",
+                params={"include_results": "true"},
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
             
-            data = response.json()
             status = data.get('status')
             elapsed = int(time.time() - start_time)
             
-            print(f"[{elapsed:4d}s] Status: {status}")
+            print(f"[{elapsed:4d}s] {job_id[:8]} Status: {status}")
             
             if status == "completed":
-                print(f"\n✓ Backtest completed in {elapsed} seconds")
-                return True
+                print(f"\n✓ Backtest {job_id[:8]} completed in {elapsed} seconds")
+                return data
             elif status == "failed":
-                print(f"\n✗ Backtest failed")
-                # Try to get error details
-                try:
-                    error_response = requests.get(f"{RAILWAY_URL}/backtest_results/{job_id}", timeout=10)
-                    if error_response.status_code == 200:
-                        error_data = error_response.json()
-                        if 'error' in error_data:
-                            print(f"  Error: {error_data['error']}")
-                        if 'error_traceback' in error_data:
-                            print(f"\n  Traceback:")
-                            print(f"  {error_data['error_traceback'][:500]}")
-                except:
-                    pass
-                if 'error' in data:
-                    print(f"  Error: {data['error']}")
-                return False
+                return data
             
-            time.sleep(check_interval)
+            await asyncio.sleep(check_interval)
         except Exception as e:
             print(f"✗ Error checking status: {e}")
-            time.sleep(check_interval)
+            await asyncio.sleep(check_interval)
     
-    print(f"\n✗ Backtest did not complete within {max_wait} seconds")
-    return False
+    print(f"\n✗ Backtest {job_id[:8]} did not complete within {max_wait} seconds")
+    return None
 
-def get_results(job_id):
-    """Get backtest results"""
+async def get_results(session, job_id, results=None):
+    """Get backtest results (fetched unless already delivered with the final status)"""
     if not job_id:
         return None
     
@@ -226,99 +412,236 @@ def get_results(job_id):
     print("=" * 80)
     print()
     
+    if results is not None:
+        output_file = results_file(job_id)
+        save_results(results, output_file)
+        display_results(results)
+        print(f"Full results saved to: {output_file}")
+        print()
+        return results
+    
     try:
-        response = requests.get(f"{RAILWAY_URL}/backtest_results/{job_id}", timeout=30)
-        response.raise_for_status()
+        async with session.get(
+            f"{RAILWAY_URL}/backtest_results/{job_id}", timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status >= 400:
+                print(f"✗ Failed to get results: HTTP {response.status}")
+                print(await error_detail(response))
+                return None
+            # Write the body to disk as it arrives instead of buffering it
+            # and re-serializing it later
+            output_file = results_file(job_id)
+            with open(output_file, 'wb') as f:
+                async for chunk in response.content.iter_chunked(RESULTS_CHUNK_SIZE):
+                    f.write(chunk)
         
-        results = response.json()
+        with open(output_file, 'rb') as f:
+            results = parse_json(f.read())
         
-        # Display summary
-        summary = results.get('summary', {})
+        display_results(results)
+        print(f"Full results saved to: {output_file}")
+        print()
         
-        print("Performance Metrics:")
+        return results
+    except Exception as e:
+        print(f"✗ Failed to get results: {e}")
+        return None
+
+def display_results(results):
+    """Print the summary, FinChat signals and trades"""
+    # Display summary
+    summary = results.get('summary', {})
+    
+    print("Performance Metrics:")
+    print("-" * 80)
+    print(f"  Initial Capital:    ${summary.get('initial_capital', 0):,.2f}")
+    print(f"  Final Value:        ${summary.get('final_value', 0):,.2f}")
+    print(f"  Total Return:       {summary.get('total_return', 0):.2f}%")
+    print(f"  CAGR:              {summary.get('cagr', 0):.2f}%")
+    print(f"  Max Drawdown:      {summary.get('max_drawdown', 0):.2f}%")
+    print(f"  Volatility:        {summary.get('volatility', 0):.2f}%")
+    print()
+    
+    print("Trade Statistics:")
+    print("-" * 80)
+    print(f"  Total Trades:      {summary.get('total_trades', 0)}")
+    print(f"  Winning Trades:    {summary.get('winning_trades', 0)}")
+    print(f"  Losing Trades:     {summary.get('losing_trades', 0)}")
+    print(f"  Win Rate:          {summary.get('win_rate', 0):.2f}%")
+    print()
+    
+    # Display FinChat signals
+    finchat_signals = results.get('finchat_signals', [])
+    if finchat_signals:
+        print(f"FinChat COT Signals ({len(finchat_signals)} total):")
         print("-" * 80)
-        print(f"  Initial Capital:    ${summary.get('initial_capital', 0):,.2f}")
-        print(f"  Final Value:        ${summary.get('final_value', 0):,.2f}")
-        print(f"  Total Return:       {summary.get('total_return', 0):.2f}%")
-        print(f"  CAGR:              {summary.get('cagr', 0):.2f}%")
-        print(f"  Max Drawdown:      {summary.get('max_drawdown', 0):.2f}%")
-        print(f"  Volatility:        {summary.get('volatility', 0):.2f}%")
+        for i, signal in enumerate(finchat_signals, 1):
+            signal_type = signal.get('type', 'unknown').upper()
+            ticker = signal.get('ticker', 'N/A')
+            timestamp = signal.get('timestamp', 'N/A')
+            cot_signal = signal.get('signal', 'N/A').upper()
+            confidence = signal.get('confidence', 0)
+            cot_response = signal.get('cot_response', '')[:500]  # First 500 chars
+    
+            print(f"\n  Signal {i} - {signal_type} ({ticker})")
+            print(f"    Date: {timestamp}")
+            print(f"    Signal: {cot_signal}")
+            print(f"    Confidence: {confidence:.2f}")
+            if signal_type == 'ENTRY':
+                print(f"    Day of Month: {signal.get('day_of_month', 'N/A')}")
+            elif signal_type == 'EXIT':
+                print(f"    Entry Price: ${signal.get('position_entry_price', 0):.2f}")
+                print(f"    Yesterday Price: ${signal.get('yesterday_price', 0):.2f}")
+                print(f"    Today Price: ${signal.get('today_price', 0):.2f}")
+            print(f"    COT Response:")
+            print(f"      {cot_response}")
+            if len(signal.get('cot_response', '')) > 500:
+                print(f"      ... (truncated)")
+            print()
+    else:
+        print("No FinChat signals recorded.")
         print()
-        
-        print("Trade Statistics:")
+    
+    # Display all trades
+    trades = results.get('trades', [])
+    if trades:
+        print(f"All Trades ({len(trades)} total):")
         print("-" * 80)
-        print(f"  Total Trades:      {summary.get('total_trades', 0)}")
-        print(f"  Winning Trades:    {summary.get('winning_trades', 0)}")
-        print(f"  Losing Trades:     {summary.get('losing_trades', 0)}")
-        print(f"  Win Rate:          {summary.get('win_rate', 0):.2f}%")
+        for i, trade in enumerate(trades, 1):
+            print(f"  Trade {i}:")
+            print(f"    Entry: {trade.get('Entry Date')} @ ${trade.get('Entry Price', 0):.2f}")
+            print(f"    Exit:  {trade.get('Exit Date')} @ ${trade.get('Exit Price', 0):.2f}")
+            print(f"    Shares: {trade.get('Shares', 0)}")
+            print(f"    P&L: ${trade.get('P&L', 0):,.2f} ({trade.get('P&L %', 0):.2f}%)")
+            print(f"    Reason: {trade.get('Exit Reason', 'N/A')}")
+            print()
+    else:
+        print("No trades executed.")
+        print()
+
+async def submit_backtests(session, configs):
+    """
+    Submit several configs in one /run_backtests call
+    
+    Falls back to one /run_backtest call per config if the backend has no
+    batch endpoint.
+    
+    Returns:
+        Job IDs in config order (None where submission failed)
+    """
+    print(f"Submitting {len(configs)} backtest jobs in one request...")
+    # Encode each config once; the batch body and the per-config fallback reuse the bytes
+    bodies = [encode_json(config) for config in configs]
+    try:
+        async with session.post(
+            f"{RAILWAY_URL}/run_backtests",
+            data=gzip_json(b'{"configs":[' + b",".join(bodies) + b"]}"),
+            headers=GZIP_JSON_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 404:
+                return await asyncio.gather(*(
+                    submit_backtest(
+                        session,
+                        config["data"]["marketData"]["tickers"],
+                        config["data"]["marketData"]["startDate"],
+                        config["data"]["marketData"]["endDate"],
+                        body=body
+                    )
+                    for config, body in zip(configs, bodies)
+                ))
+            if response.status >= 400:
+                print(f"✗ Failed to submit backtests: HTTP {response.status}")
+                print(await error_detail(response))
+                return [None] * len(configs)
+            data = await response.json()
+    except Exception as e:
+        print(f"✗ Failed to submit backtests: {e}")
+        return [None] * len(configs)
+    
+    job_ids = data.get('job_ids', [])
+    print(f"✓ {len(job_ids)} backtest jobs submitted")
+    for config, job_id in zip(configs, job_ids):
+        print(f"  {config['data']['marketData']['tickers']}: {job_id}")
+    print()
+    return job_ids
+
+async def follow_job(session, ticker, job_id, cache_key, max_wait=600):
+    """Wait for a submitted job, fetch its results and cache them"""
+    if not job_id:
+        print(f"\n[{ticker}] Failed to submit backtest. Check Railway backend status.")
+        return None
+    
+    final_status = await poll_status(session, job_id, max_wait=max_wait)
+    if final_status and final_status.get('status') == "failed":
+        report_failure(job_id, final_status)
+    if not final_status or final_status.get('status') != "completed":
+        print(f"\n[{ticker}] Backtest did not complete. Check Railway logs for details.")
+        return None
+    
+    results = await get_results(session, job_id, final_status.get('results'))
+    if results is not None:
+        store_cached_results(cache_key, results_file(job_id))
+    return results
+
+def cached_results_for(ticker, cache_key):
+    """Print and return cached results for a config, or None"""
+    cached = load_cached_results(cache_key)
+    if cached is not None:
+        print(f"[{ticker}] Using cached results for this configuration ({cache_key[:12]})")
+        display_results(cached)
+        output_file = results_file(cached.get('job_id') or cache_key)
+        shutil.copyfile(os.path.join(RESULTS_CACHE_DIR, f"{cache_key}.json"), output_file)
+        print(f"Full results saved to: {output_file}")
+        print()
+    return cached
+
+async def run_one(session, ticker, start_date="2025-01-01", end_date="2025-01-15", max_wait=600):
+    """Submit one backtest, wait for it and fetch its results (or reuse cached results)"""
+    config = create_fxy_backtest_config(ticker, start_date, end_date)
+    cache_key = config_cache_key(config)
+    cached = cached_results_for(ticker, cache_key)
+    if cached is not None:
+        return cached
+    
+    job_id = await submit_backtest(session, ticker, start_date, end_date, config=config)
+    return await follow_job(session, ticker, job_id, cache_key, max_wait=max_wait)
+
+async def main(tickers, start_date="2025-01-01", end_date="2025-01-15"):
+    """Run one backtest per ticker: one batch submit, then follow the jobs concurrently"""
+    connector = aiohttp.TCPConnector(
+        limit=max(MAX_CONNECTIONS, len(tickers) + POOL_HEADROOM),
+        keepalive_timeout=KEEPALIVE_SECONDS,
+        ttl_dns_cache=300
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
+        if not await check_health(session):
+            print("\nFailed to submit backtest. Check Railway backend status.")
+            return []
         print()
         
-        # Display FinChat signals
-        finchat_signals = results.get('finchat_signals', [])
-        if finchat_signals:
-            print(f"FinChat COT Signals ({len(finchat_signals)} total):")
-            print("-" * 80)
-            for i, signal in enumerate(finchat_signals, 1):
-                signal_type = signal.get('type', 'unknown').upper()
-                ticker = signal.get('ticker', 'N/A')
-                timestamp = signal.get('timestamp', 'N/A')
-                cot_signal = signal.get('signal', 'N/A').upper()
-                confidence = signal.get('confidence', 0)
-                cot_response = signal.get('cot_response', '')[:500]  # First 500 chars
-                
-                print(f"\n  Signal {i} - {signal_type} ({ticker})")
-                print(f"    Date: {timestamp}")
-                print(f"    Signal: {cot_signal}")
-                print(f"    Confidence: {confidence:.2f}")
-                if signal_type == 'ENTRY':
-                    print(f"    Day of Month: {signal.get('day_of_month', 'N/A')}")
-                elif signal_type == 'EXIT':
-                    print(f"    Entry Price: ${signal.get('position_entry_price', 0):.2f}")
-                    print(f"    Yesterday Price: ${signal.get('yesterday_price', 0):.2f}")
-                    print(f"    Today Price: ${signal.get('today_price', 0):.2f}")
-                print(f"    COT Response:")
-                print(f"      {cot_response}")
-                if len(signal.get('cot_response', '')) > 500:
-                    print(f"      ... (truncated)")
-                print()
-        else:
-            print("No FinChat signals recorded.")
-            print()
+        if len(tickers) == 1:
+            return [await run_one(session, tickers[0], start_date, end_date)]
         
-        # Display all trades
-        trades = results.get('trades', [])
-        if trades:
-            print(f"All Trades ({len(trades)} total):")
-            print("-" * 80)
-            for i, trade in enumerate(trades, 1):
-                print(f"  Trade {i}:")
-                print(f"    Entry: {trade.get('Entry Date')} @ ${trade.get('Entry Price', 0):.2f}")
-                print(f"    Exit:  {trade.get('Exit Date')} @ ${trade.get('Exit Price', 0):.2f}")
-                print(f"    Shares: {trade.get('Shares', 0)}")
-                print(f"    P&L: ${trade.get('P&L', 0):,.2f} ({trade.get('P&L %', 0):.2f}%)")
-                print(f"    Reason: {trade.get('Exit Reason', 'N/A')}")
-                print()
-        else:
-            print("No trades executed.")
-            print()
+        results = {}
+        pending = []
+        for ticker in tickers:
+            config = create_fxy_backtest_config(ticker, start_date, end_date)
+            cache_key = config_cache_key(config)
+            results[ticker] = cached_results_for(ticker, cache_key)
+            if results[ticker] is None:
+                pending.append((ticker, config, cache_key))
         
-        # Save results
-        output_file = f'fxy_railway_results_{job_id[:8]}.json'
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
-        print(f"Full results saved to: {output_file}")
-        print()
+        if pending:
+            job_ids = await submit_backtests(session, [config for _, config, _ in pending])
+            fetched = await asyncio.gather(*(
+                follow_job(session, ticker, job_id, cache_key)
+                for (ticker, _, cache_key), job_id in zip(pending, job_ids)
+            ))
+            for (ticker, _, _), ticker_results in zip(pending, fetched):
+                results[ticker] = ticker_results
         
-        return results
-    except Exception as e:
-        print(f"✗ Failed to get results: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            try:
-                error_data = e.response.json()
-                print(f"  Error: {error_data.get('detail', 'Unknown error')}")
-            except:
-                print(f"  Response: {e.response.text}")
-        return None
+        return [results[ticker] for ticker in tickers]
 
 if __name__ == "__main__":
     print()
@@ -326,23 +649,9 @@ if __name__ == "__main__":
     print("Using FinChat COT for entry/exit signals")
     print()
     
-    # Submit backtest
-    job_id = submit_backtest()
+    all_results = asyncio.run(main(sys.argv[1:] or ["FXY"]))
     
-    if job_id:
-        # Poll for completion
-        completed = poll_status(job_id, max_wait=600)  # 10 minutes max
-        
-        if completed:
-            # Get results
-            results = get_results(job_id)
-            
-            if results:
-                print("=" * 80)
-                print("Backtest completed successfully!")
-                print("=" * 80)
-        else:
-            print("\nBacktest did not complete. Check Railway logs for details.")
-    else:
-        print("\nFailed to submit backtest. Check Railway backend status.")
-
+    if all_results and all(all_results):
+        print("=" * 80)
+        print("Backtest completed successfully!")
+        print("=" * 80)
@@ -4,11 +4,16 @@ Run IBM backtest: buy 100 shares every 3 trading days, sell after 6 trading days
 Period: 2024-05-01 to 2025-05-01
 """
 import asyncio
+import sys
 from datetime import datetime
-from typing import Dict
+from typing import Dict, FrozenSet, Optional
+
+import pandas as pd
 
 from backend.backtest_engine import BacktestEngine
 
+SEP = "-" * 40
+
 
 class EveryNthTradingDayStrategy:
     """Helper to trigger entries every N trading days and exit after holding M trading days."""
@@ -16,29 +21,70 @@ class EveryNthTradingDayStrategy:
     def __init__(self, n_buy_days: int, hold_days: int):
         self.n_buy_days = n_buy_days
         self.hold_days = hold_days
-        self.last_buy_index: Dict[str, int] = {}
+        # Per-ticker cross-sections, {timestamp: trading-day position} and
+        # entry-day sets, filled by prepare() before the bar loop (or on first
+        # use) and dropped when a different market_data arrives
+        self._view_cache: Dict[str, pd.DataFrame] = {}
+        self._idx_cache: Dict[str, Dict[pd.Timestamp, int]] = {}
+        self._entry_ts: Dict[str, FrozenSet[pd.Timestamp]] = {}
+        self._market_data_source = None
+        self._tickers: FrozenSet[str] = frozenset()
+
+    def _bind(self, market_data) -> None:
+        """Drop the cached lookups if market_data is not the frame they were built from."""
+        if market_data is not self._market_data_source:
+            self._view_cache.clear()
+            self._idx_cache.clear()
+            self._entry_ts.clear()
+            self._market_data_source = market_data
+            self._tickers = frozenset(market_data.index.unique(level="ticker"))
+
+    def _view(self, market_data, ticker: str) -> Optional[pd.DataFrame]:
+        """Memoized market_data.xs(ticker, level="ticker"), or None if the ticker is absent."""
+        self._bind(market_data)
+        if ticker not in self._tickers:
+            return None
+        view = self._view_cache.get(ticker)
+        if view is None:
+            view = market_data.xs(ticker, level="ticker")
+            self._view_cache[ticker] = view
+        return view
+
+    def _positions(self, market_data, ticker: str) -> Dict[pd.Timestamp, int]:
+        """{timestamp: position among the ticker's trading days} (empty if the ticker is absent)."""
+        ticker_view = self._view(market_data, ticker)
+        positions = self._idx_cache.get(ticker)
+        if positions is None:
+            positions = {} if ticker_view is None else {ts: i for i, ts in enumerate(ticker_view.index)}
+            self._idx_cache[ticker] = positions
+        return positions
+
+    def _entry_days(self, market_data, ticker: str) -> FrozenSet[pd.Timestamp]:
+        """Every n_buy_days-th trading day of the ticker, counted from its first bar."""
+        ticker_view = self._view(market_data, ticker)
+        entry_days = self._entry_ts.get(ticker)
+        if entry_days is None:
+            entry_days = frozenset() if ticker_view is None else frozenset(ticker_view.index[::self.n_buy_days])
+            self._entry_ts[ticker] = entry_days
+        return entry_days
+
+    def prepare(self, market_data) -> None:
+        """Build every ticker's lookups up front so the signal callbacks only do dict/set hits."""
+        self._bind(market_data)
+        for ticker in self._tickers:
+            self._positions(market_data, ticker)
+            self._entry_days(market_data, ticker)
 
     def should_buy(self, market_data, ticker: str, timestamp: datetime) -> bool:
         """Return True if we should enter on this trading day."""
-        try:
-            ticker_data = market_data.xs(ticker, level="ticker")
-            idx = ticker_data.index.get_loc(timestamp)
-        except Exception:
-            return False
-
-        last_idx = self.last_buy_index.get(ticker)
-        if last_idx is None or idx - last_idx >= self.n_buy_days:
-            self.last_buy_index[ticker] = idx
-            return True
-        return False
+        return timestamp in self._entry_days(market_data, ticker)
 
     def should_exit(self, market_data, ticker: str, timestamp: datetime, position) -> bool:
         """Exit once we've held for the configured number of trading days."""
-        try:
-            ticker_data = market_data.xs(ticker, level="ticker")
-            current_idx = ticker_data.index.get_loc(timestamp)
-            entry_idx = ticker_data.index.get_loc(position.entry_timestamp)
-        except Exception:
+        positions = self._positions(market_data, ticker)
+        current_idx = positions.get(timestamp)
+        entry_idx = positions.get(position.entry_timestamp)
+        if current_idx is None or entry_idx is None:
             return False
 
         return (current_idx - entry_idx) >= self.hold_days
@@ -61,6 +107,9 @@ async def run_backtest():
             "exitLogic": "custom",
             "timeBasedExit": None,
             "maxPositions": 10,
+            # 100 shares per entry (fixedDollarAmount is the share count)
+            "positionSizingMethod": "fixed-shares",
+            "fixedDollarAmount": 100,
         },
         "portfolioRisk": {
             "initialCapital": 1_000_000.0,
@@ -86,11 +135,7 @@ async def run_backtest():
     helper = EveryNthTradingDayStrategy(n_buy_days=3, hold_days=6)
     engine.strategy.set_entry_signal_function(helper.should_buy)
     engine.strategy.set_exit_signal_function(helper.should_exit)
-
-    def fixed_hundred_shares(ticker, current_price, portfolio_value, cash_available):
-        return 100
-
-    engine.strategy.calculate_position_size = fixed_hundred_shares
+    engine.strategy.set_prepare_function(helper.prepare)
 
     print("Running backtest...")
     results = await engine.run()
@@ -98,14 +143,19 @@ async def run_backtest():
     summary = results.get("summary", {})
     trades = results.get("trades", [])
     print("\n=== TRADE LOG (all trades) ===")
-    for idx, trade in enumerate(trades, 1):
-        print(f"Trade {idx}:")
-        print(f"  Entry: {trade.get('Entry Date')} @ ${trade.get('Entry Price')}")
-        print(f"  Exit:  {trade.get('Exit Date')} @ ${trade.get('Exit Price')}")
-        print(f"  Shares: {trade.get('Shares')}")
-        print(f"  P&L: ${trade.get('P&L')} ({trade.get('P&L %')}%)")
-        print(f"  Reason: {trade.get('Exit Reason')}")
-        print("-" * 40)
+    # Build the whole log and write it once
+    trade_blocks = [
+        f"Trade {idx}:\n"
+        f"  Entry: {trade.get('Entry Date')} @ ${trade.get('Entry Price')}\n"
+        f"  Exit:  {trade.get('Exit Date')} @ ${trade.get('Exit Price')}\n"
+        f"  Shares: {trade.get('Shares')}\n"
+        f"  P&L: ${trade.get('P&L')} ({trade.get('P&L %')}%)\n"
+        f"  Reason: {trade.get('Exit Reason')}\n"
+        f"{SEP}\n"
+        for idx, trade in enumerate(trades, 1)
+    ]
+    sys.stdout.write("".join(trade_blocks))
+    sys.stdout.flush()
 
     print("\n=== SUMMARY ===")
     for key, value in summary.items():
@@ -3,12 +3,30 @@
 CLI script to test backend API endpoints using IBM as test symbol
 Tests all API functions: health, run_backtest, status, results, list, delete
 """
-import requests
+import aiohttp
+import asyncio
+import gzip
 import json
 import time
 import sys
 import os
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import islice
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional: ijson reads the summary and sample trades from the saved results
+# without loading the whole payload
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 # Configuration
 # Change this to your Railway backend URL for production testing
@@ -16,6 +34,57 @@ API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 TEST_TICKER = "IBM"
 TEST_START_DATE = "2024-05-01"
 TEST_END_DATE = "2025-05-01"
+# Status polling: backoff cap and server-side long-poll hold, in seconds
+MAX_POLL_INTERVAL = 10.0
+STATUS_WAIT_SECONDS = 30
+# Transient failures (gateway errors, dropped connections, timeouts) are
+# retried with exponential backoff; see request_json
+RETRY_STATUSES = (502, 503, 504)
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+# Request bodies are sent gzip-compressed (level 1: nearly all of the size win
+# for little CPU); aiohttp already asks for and decodes gzip responses
+GZIP_JSON_HEADERS = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+# Results bodies are written to disk in chunks of this many bytes
+RESULTS_CHUNK_SIZE = 64 * 1024
+
+class HTTPStatusError(Exception):
+    """4xx/5xx response, with its decoded body"""
+    
+    def __init__(self, status, url, data):
+        super().__init__(f"{status} Error for url: {url}")
+        self.status = status
+        self.data = data
+
+# Results summary and sample-trade blocks; missing numeric fields render as 0
+# and missing trade dates as None
+SUMMARY_TEMPLATE = "\n".join([
+    "",
+    "=" * 70,
+    "BACKTEST RESULTS SUMMARY",
+    "=" * 70,
+    "  Initial Capital:    ${initial_capital:,.2f}",
+    "  Final Value:        ${final_value:,.2f}",
+    "  Total Return:       {total_return:.2f}%",
+    "  CAGR:              {cagr:.2f}%",
+    "  Max Drawdown:      {max_drawdown:.2f}%",
+    "  Volatility:        {volatility:.2f}%",
+    "  Sharpe Ratio:      {sharpe_ratio:.2f}",
+    "  Sortino Ratio:     {sortino_ratio:.2f}",
+    "  Calmar Ratio:      {calmar_ratio:.2f}",
+    "  Total Trades:      {total_trades}",
+    "  Winning Trades:    {winning_trades}",
+    "  Losing Trades:     {losing_trades}",
+    "  Win Rate:          {win_rate:.2f}%",
+    "  Profit Factor:     {profit_factor:.2f}",
+])
+TRADE_TEMPLATE = "\n".join([
+    "    Trade {index}:",
+    "      Entry: {Entry Date} @ ${Entry Price:.2f}",
+    "      Exit:  {Exit Date} @ ${Exit Price:.2f}",
+    "      P&L: ${P&L:,.2f} ({P&L %:.2f}%)",
+])
+TRADE_DATE_DEFAULTS = {"Entry Date": None, "Exit Date": None}
 
 # Colors for terminal output
 class Colors:
@@ -26,10 +95,14 @@ class Colors:
     END = '\033[0m'
     BOLD = '\033[1m'
 
+# No escape sequences when piped to a file or CI log
+if not sys.stdout.isatty():
+    for _name in ('GREEN', 'RED', 'YELLOW', 'BLUE', 'END', 'BOLD'):
+        setattr(Colors, _name, '')
+
 def print_header(text):
-    print(f"\n{Colors.BOLD}{Colors.BLUE}{'='*70}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{text.center(70)}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.BLUE}{'='*70}{Colors.END}\n")
+    rule = f"{Colors.BOLD}{Colors.BLUE}{'='*70}{Colors.END}"
+    sys.stdout.write(f"\n{rule}\n{Colors.BOLD}{Colors.BLUE}{text.center(70)}{Colors.END}\n{rule}\n\n")
 
 def print_success(text):
     print(f"{Colors.GREEN}✓ {text}{Colors.END}")
@@ -40,21 +113,104 @@ def print_error(text):
 def print_info(text):
     print(f"{Colors.YELLOW}ℹ {text}{Colors.END}")
 
-def test_health_check():
+async def request_json(session, method, path, timeout=10, **kwargs):
+    """
+    Send a request to the API and return (status, decoded JSON body)
+    
+    Failed connection attempts are retried for every method. Gateway errors,
+    dropped connections and timeouts are retried for GET/DELETE only, so a
+    submit the server may have received is never sent twice.
+    
+    Raises:
+        HTTPStatusError: for 4xx/5xx responses
+    """
+    url = f"{API_BASE_URL}{path}"
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        can_retry = attempt < RETRY_ATTEMPTS
+        try:
+            async with session.request(
+                method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+            ) as response:
+                status = response.status
+                body = await response.read()
+        except aiohttp.ClientConnectorError:
+            # Never reached the server, so even a POST is safe to resend
+            if not can_retry:
+                raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if method == "POST" or not can_retry:
+                raise
+        else:
+            if not (status in RETRY_STATUSES and method != "POST" and can_retry):
+                break
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+    
+    try:
+        data = parse_json(body)
+    except ValueError:
+        data = body.decode("utf-8", errors="replace")
+    if status >= 400:
+        raise HTTPStatusError(status, url, data)
+    return status, data
+
+def parse_json(data):
+    """Decode a JSON document from str or bytes (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _isoformat_utc_z(obj):
+    """json `default=` hook: UTC datetimes as ISO 8601 with a Z suffix (orjson's OPT_UTC_Z)"""
+    if isinstance(obj, datetime):
+        return obj.isoformat().replace("+00:00", "Z")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_json(payload):
+    """JSON request body bytes (orjson when installed); datetimes are encoded as ISO 8601"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_UTC_Z)
+    return json.dumps(payload, default=_isoformat_utc_z).encode("utf-8")
+
+def read_results_preview(path, n_trades=3):
+    """
+    Read the summary and first trades from a saved results file
+    
+    Returns:
+        (summary, first n_trades trades, total number of trades)
+    """
+    if IJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            summary = next(ijson.items(f, 'summary', use_float=True), {})
+        with open(path, 'rb') as f:
+            trades = ijson.items(f, 'trades.item', use_float=True)
+            sample = list(islice(trades, n_trades))
+            n_total = len(sample) + sum(1 for _ in trades)
+        return summary, sample, n_total
+    
+    with open(path, 'rb') as f:
+        data = parse_json(f.read())
+    trades = data.get('trades', [])
+    return data.get('summary', {}), trades[:n_trades], len(trades)
+
+async def test_health_check(session):
     """Test GET /health endpoint"""
+    try:
+        _, data = await request_json(session, "GET", "/health")
+        error = None
+    except Exception as e:
+        error = e
+    
     print_header("TEST 1: Health Check")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        if error:
+            raise error
         print_success("Health check passed")
         print(f"  Status: {data.get('status')}")
         print(f"  Timestamp: {data.get('timestamp')}")
         print(f"  Active Backtests: {data.get('active_backtests', 0)}")
         return True
-    except requests.exceptions.ConnectionError:
+    except aiohttp.ClientConnectionError:
         print_error(f"Could not connect to {API_BASE_URL}")
         print_info("Make sure the backend is running: uvicorn backend.main:app --reload")
         return False
@@ -62,15 +218,19 @@ def test_health_check():
         print_error(f"Health check failed: {str(e)}")
         return False
 
-def test_root_endpoint():
+async def test_root_endpoint(session):
     """Test GET / endpoint"""
+    try:
+        _, data = await request_json(session, "GET", "/")
+        error = None
+    except Exception as e:
+        error = e
+    
     print_header("TEST 2: Root Endpoint")
     
     try:
-        response = requests.get(f"{API_BASE_URL}/", timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        if error:
+            raise error
         print_success("Root endpoint accessible")
         print(f"  Message: {data.get('message')}")
         print(f"  Version: {data.get('version')}")
@@ -80,107 +240,112 @@ def test_root_endpoint():
         print_error(f"Root endpoint test failed: {str(e)}")
         return False
 
+# Backtest definition shared by every run (treat as read-only);
+# create_ibm_backtest_config stamps the run name and timestamp around it
+_IBM_BACKTEST_DATA = {
+    "marketData": {
+        "tickers": TEST_TICKER,
+        "fields": ["open", "high", "low", "close", "volume"],
+        "frequency": "daily",
+        "startDate": TEST_START_DATE,
+        "endDate": TEST_END_DATE,
+        "includeDividends": True,
+        "includeSplits": True,
+        "includeDelistings": False,
+        "benchmark": None
+    },
+    "strategy": {
+        "entryLogic": "Buy every 3 business days",
+        "entryPromptType": "string",
+        "entryFinChatUrl": None,
+        "entryFinChatPrompt": "Buy every 3 business days",
+        "exitLogic": "Sell after 6 business days",
+        "exitPromptType": "string",
+        "exitFinChatUrl": None,
+        "exitFinChatPrompt": "Sell after 6 business days",
+        "takeProfit": None,
+        "stopLoss": None,
+        "timeBasedExit": 6,
+        "positionSizingMethod": "fixed-dollar",
+        "fixedDollarAmount": 10000.0,
+        "portfolioPercent": None,
+        "riskPercent": None,
+        "maxPositions": 10,
+        "eligibleSymbols": TEST_TICKER,
+        "rankingLogic": None
+    },
+    "portfolioRisk": {
+        "initialCapital": 100000.0,
+        "leverageAllowed": False,
+        "maxLeverage": 1.0,
+        "maxSingleAssetPercent": 100.0,
+        "maxSectorPercent": 100.0,
+        "maxNetExposure": 100.0,
+        "stopLossType": "fixed-percent",
+        "takeProfitRules": None,
+        "useTrailingStops": False,
+        "trailingStopDistance": None,
+        "maxDailyDrawdown": None,
+        "maxWeeklyDrawdown": None
+    },
+    "tradingExecution": {
+        "entryTiming": "next-bar-open",
+        "orderType": "market",
+        "limitOrderLogic": None,
+        "commissionType": "per-trade",
+        "commissionAmount": 1.0,
+        "exchangeFees": 0.0,
+        "slippage": 0.0,
+        "tradingDays": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
+        "handleMissingData": "forward-fill",
+        "shortSellingAllowed": False,
+        "borrowCost": 0.0,
+        "shortConstraints": None
+    },
+    "mtm": {
+        "mtmFrequency": "daily",
+        "mtmPrice": "close",
+        "baseCurrency": "USD",
+        "fxFrequency": "daily",
+        "mtmFXSeparately": False,
+        "adjustForSplitsDividends": True,
+        "bookDividendCashflows": True
+    },
+    "rebalancing": {
+        "rebalancingType": None,
+        "dropDelisted": False,
+        "dropBelowThresholds": False,
+        "exitIneligible": False,
+        "rebalancingMethod": "full",
+        "minShares": 1,
+        "minNotional": 0.0
+    },
+    "output": {
+        "basicMetrics": ["Total Return", "CAGR", "Max Drawdown", "Volatility"],
+        "ratioMetrics": ["Sharpe Ratio", "Sortino Ratio", "Calmar Ratio"],
+        "tradeStats": ["Win Rate", "Average Win/Loss", "Profit Factor", "Average Holding Period"],
+        "outputFormats": ["Equity Curve", "Trade Log"],
+        "benchmarkSymbol": None,
+        "benchmarkMetrics": []
+    },
+    "implementation": {
+        "programmingEnv": "python",
+        "dataFormat": "json",
+        "columnNames": "timestamp,open,high,low,close,volume",
+        "dateFormat": "YYYY-MM-DD"
+    }
+}
+
 def create_ibm_backtest_config():
-    """Create a test backtest configuration for IBM"""
+    """Create a test backtest configuration for IBM (timestamp is a UTC datetime, see encode_json)"""
+    now = datetime.now(timezone.utc)
     return {
-        "name": f"IBM Test Backtest - {datetime.now().strftime('%Y%m%d_%H%M%S')}",
-        "timestamp": datetime.now().isoformat() + "Z",
-        "data": {
-            "marketData": {
-                "tickers": TEST_TICKER,
-                "fields": ["open", "high", "low", "close", "volume"],
-                "frequency": "daily",
-                "startDate": TEST_START_DATE,
-                "endDate": TEST_END_DATE,
-                "includeDividends": True,
-                "includeSplits": True,
-                "includeDelistings": False,
-                "benchmark": None
-            },
-            "strategy": {
-                "entryLogic": "Buy every 3 business days",
-                "entryPromptType": "string",
-                "entryFinChatUrl": None,
-                "entryFinChatPrompt": "Buy every 3 business days",
-                "exitLogic": "Sell after 6 business days",
-                "exitPromptType": "string",
-                "exitFinChatUrl": None,
-                "exitFinChatPrompt": "Sell after 6 business days",
-                "takeProfit": None,
-                "stopLoss": None,
-                "timeBasedExit": 6,
-                "positionSizingMethod": "fixed-dollar",
-                "fixedDollarAmount": 10000.0,
-                "portfolioPercent": None,
-                "riskPercent": None,
-                "maxPositions": 10,
-                "eligibleSymbols": TEST_TICKER,
-                "rankingLogic": None
-            },
-            "portfolioRisk": {
-                "initialCapital": 100000.0,
-                "leverageAllowed": False,
-                "maxLeverage": 1.0,
-                "maxSingleAssetPercent": 100.0,
-                "maxSectorPercent": 100.0,
-                "maxNetExposure": 100.0,
-                "stopLossType": "fixed-percent",
-                "takeProfitRules": None,
-                "useTrailingStops": False,
-                "trailingStopDistance": None,
-                "maxDailyDrawdown": None,
-                "maxWeeklyDrawdown": None
-            },
-            "tradingExecution": {
-                "entryTiming": "next-bar-open",
-                "orderType": "market",
-                "limitOrderLogic": None,
-                "commissionType": "per-trade",
-                "commissionAmount": 1.0,
-                "exchangeFees": 0.0,
-                "slippage": 0.0,
-                "tradingDays": ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"],
-                "handleMissingData": "forward-fill",
-                "shortSellingAllowed": False,
-                "borrowCost": 0.0,
-                "shortConstraints": None
-            },
-            "mtm": {
-                "mtmFrequency": "daily",
-                "mtmPrice": "close",
-                "baseCurrency": "USD",
-                "fxFrequency": "daily",
-                "mtmFXSeparately": False,
-                "adjustForSplitsDividends": True,
-                "bookDividendCashflows": True
-            },
-            "rebalancing": {
-                "rebalancingType": None,
-                "dropDelisted": False,
-                "dropBelowThresholds": False,
-                "exitIneligible": False,
-                "rebalancingMethod": "full",
-                "minShares": 1,
-                "minNotional": 0.0
-            },
-            "output": {
-                "basicMetrics": ["Total Return", "CAGR", "Max Drawdown", "Volatility"],
-                "ratioMetrics": ["Sharpe Ratio", "Sortino Ratio", "Calmar Ratio"],
-                "tradeStats": ["Win Rate", "Average Win/Loss", "Profit Factor", "Average Holding Period"],
-                "outputFormats": ["Equity Curve", "Trade Log"],
-                "benchmarkSymbol": None,
-                "benchmarkMetrics": []
-            },
-            "implementation": {
-                "programmingEnv": "python",
-                "dataFormat": "json",
-                "columnNames": "timestamp,open,high,low,close,volume",
-                "dateFormat": "YYYY-MM-DD"
-            }
-        }
+        "name": f"IBM Test Backtest - {now:%Y%m%d_%H%M%S}",
+        "timestamp": now,
+        "data": _IBM_BACKTEST_DATA
     }
 
-def test_submit_backtest():
+async def test_submit_backtest(session):
     """Test POST /run_backtest endpoint"""
     print_header("TEST 3: Submit Backtest Job")
     
@@ -190,15 +355,11 @@ def test_submit_backtest():
         print_info(f"Submitting backtest for {TEST_TICKER} ({TEST_START_DATE} to {TEST_END_DATE})")
         print_info("Strategy: Buy every 3 days, sell after 6 days")
         
-        response = requests.post(
-            f"{API_BASE_URL}/run_backtest",
-            json=config,
-            headers={"Content-Type": "application/json"},
-            timeout=30
+        _, data = await request_json(
+            session, "POST", "/run_backtest", timeout=30,
+            data=gzip.compress(encode_json(config), compresslevel=1), headers=GZIP_JSON_HEADERS
         )
-        response.raise_for_status()
         
-        data = response.json()
         print_success("Backtest job submitted successfully")
         print(f"  Job ID: {data.get('job_id')}")
         print(f"  Status: {data.get('status')}")
@@ -211,20 +372,18 @@ def test_submit_backtest():
         print(f"  Initial Capital: ${config_summary.get('initial_capital', 0):,.2f}")
         
         return data.get('job_id')
-    except requests.exceptions.HTTPError as e:
+    except HTTPStatusError as e:
         print_error(f"HTTP error: {e}")
-        if e.response is not None:
-            try:
-                error_data = e.response.json()
-                print(f"  Error detail: {error_data.get('detail', 'Unknown error')}")
-            except:
-                print(f"  Response: {e.response.text}")
+        if isinstance(e.data, dict):
+            print(f"  Error detail: {e.data.get('detail', 'Unknown error')}")
+        else:
+            print(f"  Response: {e.data}")
         return None
     except Exception as e:
         print_error(f"Submit backtest failed: {str(e)}")
         return None
 
-def test_check_status(job_id):
+async def test_check_status(session, job_id):
     """Test GET /backtest_status/{job_id} endpoint"""
     print_header("TEST 4: Check Backtest Status")
     
@@ -234,10 +393,8 @@ def test_check_status(job_id):
     
     try:
         print_info(f"Checking status for job: {job_id}")
-        response = requests.get(f"{API_BASE_URL}/backtest_status/{job_id}", timeout=10)
-        response.raise_for_status()
+        _, data = await request_json(session, "GET", f"/backtest_status/{job_id}")
         
-        data = response.json()
         print_success("Status retrieved successfully")
         print(f"  Job ID: {data.get('job_id')}")
         print(f"  Status: {data.get('status')}")
@@ -253,36 +410,69 @@ def test_check_status(job_id):
         print_error(f"Status check failed: {str(e)}")
         return None
 
-def wait_for_completion(job_id, max_wait=300):
+
+async def wait_for_completion(session, job_id, max_wait=300):
     """Wait for backtest to complete"""
     print_header("WAITING FOR BACKTEST TO COMPLETE")
     
     if not job_id:
         return False
     
-    start_time = time.time()
-    check_interval = 5
+    start = time.monotonic()
+    deadline = start + max_wait
+    interval = 1.0
+    etag = None
+    failures = 0  # consecutive transient errors
     
-    print_info(f"Polling every {check_interval} seconds (max wait: {max_wait}s)")
+    print_info(f"Polling with backoff up to every {MAX_POLL_INTERVAL:.0f} seconds (max wait: {max_wait}s)")
     
-    while time.time() - start_time < max_wait:
+    # Monotonic clock: immune to wall-clock jumps during a long wait
+    while (poll_start := time.monotonic()) < deadline:
         try:
-            response = requests.get(f"{API_BASE_URL}/backtest_status/{job_id}", timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            status = data.get('status')
+            if etag:
+                # Conditional long poll: the server holds the request until the
+                # status changes (or the deadline) and answers 304 if it still has not
+                hold = min(STATUS_WAIT_SECONDS, deadline - poll_start)
+                params = {"wait": f"{hold:.1f}"}
+                headers = {"If-None-Match": etag}
+                timeout = hold + 10
+            else:
+                params, headers, timeout = None, None, 10
+            async with session.get(
+                f"{API_BASE_URL}/backtest_status/{job_id}",
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                response.raise_for_status()
+                data = None if response.status == 304 else parse_json(await response.read())
+                etag = response.headers.get("ETag", etag)
+            failures = 0
             
-            elapsed = int(time.time() - start_time)
-            print(f"  [{elapsed}s] Status: {status}")
+            if data is not None:
+                status = data.get('status')
+                
+                elapsed = int(time.monotonic() - start)
+                print(f"  [{elapsed}s] Status: {status}")
+                
+                if status == "completed":
+                    print_success(f"Backtest completed in {elapsed} seconds")
+                    return True
+                elif status == "failed":
+                    print_error("Backtest failed")
+                    return False
             
-            if status == "completed":
-                print_success(f"Backtest completed in {elapsed} seconds")
-                return True
-            elif status == "failed":
-                print_error("Backtest failed")
+            # Time spent held in a long poll counts toward the interval
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - poll_start)))
+            interval = min(interval * 1.5, MAX_POLL_INTERVAL)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError, aiohttp.ClientResponseError) as e:
+            # Transient errors are retried with backoff; anything else ends the wait
+            transient = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUSES
+            failures += 1
+            if not transient or failures > RETRY_ATTEMPTS:
+                print_error(f"Error checking status: {str(e)}")
                 return False
-            
-            time.sleep(check_interval)
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** (failures - 1))
         except Exception as e:
             print_error(f"Error checking status: {str(e)}")
             return False
@@ -290,79 +480,81 @@ def wait_for_completion(job_id, max_wait=300):
     print_error(f"Backtest did not complete within {max_wait} seconds")
     return False
 
-def test_get_results(job_id):
-    """Test GET /backtest_results/{job_id} endpoint"""
-    print_header("TEST 5: Get Backtest Results")
+async def test_get_results(session, job_id):
+    """
+    Test GET /backtest_results/{job_id} endpoint
     
+    The body is written to disk as it arrives; only the summary and sample
+    trades are read back.
+    
+    Returns:
+        {"summary": ..., "trades": sample trades}, or None on failure
+    """
     if not job_id:
+        print_header("TEST 5: Get Backtest Results")
         print_error("No job ID provided, skipping results retrieval")
         return None
     
+    url = f"{API_BASE_URL}/backtest_results/{job_id}"
+    output_file = f"ibm_api_test_results_{job_id[:8]}.json"
+    status = None
     try:
-        print_info(f"Retrieving results for job: {job_id}")
-        response = requests.get(f"{API_BASE_URL}/backtest_results/{job_id}", timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            status = response.status
+            if status >= 400:
+                raise HTTPStatusError(status, url, await response.text())
+            if status != 202:
+                with open(output_file, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(RESULTS_CHUNK_SIZE):
+                        f.write(chunk)
+        error = None
+    except HTTPStatusError as e:
+        error = f"HTTP error: {e}"
+    except Exception as e:
+        error = f"Get results failed: {str(e)}"
+    
+    print_header("TEST 5: Get Backtest Results")
+    print_info(f"Retrieving results for job: {job_id}")
+    if error:
+        print_error(error)
+        return None
+    if status == 202:
+        print_info("Backtest still running, results not available yet")
+        return None
+    
+    try:
+        summary, trades, n_trades = read_results_preview(output_file)
         print_success("Results retrieved successfully")
         
-        # Display summary
-        summary = data.get('summary', {})
-        print("\n" + "="*70)
-        print("BACKTEST RESULTS SUMMARY")
-        print("="*70)
-        print(f"  Initial Capital:    ${summary.get('initial_capital', 0):,.2f}")
-        print(f"  Final Value:        ${summary.get('final_value', 0):,.2f}")
-        print(f"  Total Return:       {summary.get('total_return', 0):.2f}%")
-        print(f"  CAGR:              {summary.get('cagr', 0):.2f}%")
-        print(f"  Max Drawdown:      {summary.get('max_drawdown', 0):.2f}%")
-        print(f"  Volatility:        {summary.get('volatility', 0):.2f}%")
-        print(f"  Sharpe Ratio:      {summary.get('sharpe_ratio', 0):.2f}")
-        print(f"  Sortino Ratio:     {summary.get('sortino_ratio', 0):.2f}")
-        print(f"  Calmar Ratio:      {summary.get('calmar_ratio', 0):.2f}")
-        print(f"  Total Trades:      {summary.get('total_trades', 0)}")
-        print(f"  Winning Trades:    {summary.get('winning_trades', 0)}")
-        print(f"  Losing Trades:     {summary.get('losing_trades', 0)}")
-        print(f"  Win Rate:          {summary.get('win_rate', 0):.2f}%")
-        print(f"  Profit Factor:     {summary.get('profit_factor', 0):.2f}")
-        
-        # Display sample trades
-        trades = data.get('trades', [])
+        # Display summary and sample trades, written in one go
+        lines = [SUMMARY_TEMPLATE.format_map(defaultdict(int, summary))]
         if trades:
-            print(f"\n  Sample Trades (showing first 3 of {len(trades)}):")
-            for i, trade in enumerate(trades[:3], 1):
-                print(f"    Trade {i}:")
-                print(f"      Entry: {trade.get('Entry Date')} @ ${trade.get('Entry Price', 0):.2f}")
-                print(f"      Exit:  {trade.get('Exit Date')} @ ${trade.get('Exit Price', 0):.2f}")
-                print(f"      P&L: ${trade.get('P&L', 0):,.2f} ({trade.get('P&L %', 0):.2f}%)")
+            lines.append(f"\n  Sample Trades (showing first 3 of {n_trades}):")
+            lines.extend(
+                TRADE_TEMPLATE.format_map(defaultdict(int, {**TRADE_DATE_DEFAULTS, **trade, "index": i}))
+                for i, trade in enumerate(trades, 1)
+            )
         
-        # Save full results to file
-        output_file = f"ibm_api_test_results_{job_id[:8]}.json"
-        with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-        print(f"\n  Full results saved to: {output_file}")
+        lines.append(f"\n  Full results saved to: {output_file}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
-        return data
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 202:
-            print_info("Backtest still running, results not available yet")
-            return None
-        else:
-            print_error(f"HTTP error: {e}")
-            return None
+        return {"summary": summary, "trades": trades}
     except Exception as e:
         print_error(f"Get results failed: {str(e)}")
         return None
 
-def test_list_backtests():
+async def test_list_backtests(session):
     """Test GET /list_backtests endpoint"""
-    print_header("TEST 6: List All Backtests")
+    try:
+        _, data = await request_json(session, "GET", "/list_backtests")
+        error = None
+    except Exception as e:
+        error = e
     
+    print_header("TEST 6: List All Backtests")
     try:
-        response = requests.get(f"{API_BASE_URL}/list_backtests", timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        if error:
+            raise error
         print_success("Backtest list retrieved successfully")
         print(f"  Total Jobs: {data.get('total', 0)}")
         
@@ -384,7 +576,7 @@ def test_list_backtests():
         print_error(f"List backtests failed: {str(e)}")
         return False
 
-def test_delete_backtest(job_id):
+async def test_delete_backtest(session, job_id):
     """Test DELETE /backtest_results/{job_id} endpoint"""
     print_header("TEST 7: Delete Backtest Results")
     
@@ -394,10 +586,8 @@ def test_delete_backtest(job_id):
     
     try:
         print_info(f"Deleting backtest: {job_id}")
-        response = requests.delete(f"{API_BASE_URL}/backtest_results/{job_id}", timeout=10)
-        response.raise_for_status()
+        _, data = await request_json(session, "DELETE", f"/backtest_results/{job_id}")
         
-        data = response.json()
         print_success("Backtest deleted successfully")
         print(f"  Message: {data.get('message')}")
         return True
@@ -405,47 +595,92 @@ def test_delete_backtest(job_id):
         print_error(f"Delete backtest failed: {str(e)}")
         return False
 
-def main():
+async def test_delete_backtests(session, job_ids):
+    """
+    Test POST /delete_backtests endpoint (bulk cleanup)
+    
+    Falls back to concurrent DELETE /backtest_results/{job_id} calls if the
+    backend has no bulk endpoint.
+    """
+    print_header("TEST 8: Delete Backtests in Bulk")
+    
+    if not job_ids:
+        print_error("No job IDs provided, skipping bulk delete test")
+        return False
+    
+    try:
+        print_info(f"Deleting {len(job_ids)} backtests")
+        try:
+            _, data = await request_json(
+                session, "POST", "/delete_backtests",
+                data=encode_json({"job_ids": job_ids}), headers={"Content-Type": "application/json"}
+            )
+            deleted, not_found = data.get('deleted', []), data.get('not_found', [])
+        except HTTPStatusError as e:
+            if e.status != 404:
+                raise
+            outcomes = await asyncio.gather(
+                *(request_json(session, "DELETE", f"/backtest_results/{job_id}") for job_id in job_ids),
+                return_exceptions=True
+            )
+            deleted, not_found = [], []
+            for job_id, outcome in zip(job_ids, outcomes):
+                if isinstance(outcome, HTTPStatusError) and outcome.status == 404:
+                    not_found.append(job_id)
+                elif isinstance(outcome, Exception):
+                    raise outcome
+                else:
+                    deleted.append(job_id)
+        
+        print_success(f"{len(deleted)} backtests deleted")
+        if not_found:
+            print(f"  Not found: {', '.join(not_found)}")
+        return True
+    except Exception as e:
+        print_error(f"Bulk delete failed: {str(e)}")
+        return False
+
+async def main():
     """Run all API tests"""
     print_header("BACKEND API TEST SUITE - IBM TEST SYMBOL")
     print(f"API Base URL: {API_BASE_URL}")
     print(f"Test Ticker: {TEST_TICKER}")
     print(f"Test Period: {TEST_START_DATE} to {TEST_END_DATE}")
     
-    # Test 1: Health check
-    if not test_health_check():
-        print_error("\nBackend is not running. Please start it first:")
-        print_info("  uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000")
-        sys.exit(1)
-    
-    # Test 2: Root endpoint
-    test_root_endpoint()
-    
-    # Test 3: Submit backtest
-    job_id = test_submit_backtest()
-    
-    if not job_id:
-        print_error("\nFailed to submit backtest. Cannot continue with remaining tests.")
-        sys.exit(1)
-    
-    # Test 4: Check status (initial)
-    status = test_check_status(job_id)
-    
-    # Wait for completion
-    if status in ["queued", "running"]:
-        completed = wait_for_completion(job_id)
-        if completed:
-            # Test 4 again: Check status (completed)
-            test_check_status(job_id)
-    
-    # Test 5: Get results
-    results = test_get_results(job_id)
-    
-    # Test 6: List all backtests
-    test_list_backtests()
-    
-    # Test 7: Delete backtest (optional - comment out if you want to keep results)
-    # test_delete_backtest(job_id)
+    # One keep-alive connection pool for every call. Tests run side by side
+    # with asyncio.gather print their section once their response is in, so
+    # the output does not interleave.
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector, headers={"Accept": "application/json"}) as session:
+        # Test 1 and 2: Health check and root endpoint
+        healthy, _ = await asyncio.gather(test_health_check(session), test_root_endpoint(session))
+        if not healthy:
+            print_error("\nBackend is not running. Please start it first:")
+            print_info("  uvicorn backend.main:app --reload --host 0.0.0.0 --port 8000")
+            sys.exit(1)
+        
+        # Test 3: Submit backtest
+        job_id = await test_submit_backtest(session)
+        
+        if not job_id:
+            print_error("\nFailed to submit backtest. Cannot continue with remaining tests.")
+            sys.exit(1)
+        
+        # Wait for completion; its first poll reports the initial status and
+        # it returns straight away if the job has already finished
+        await wait_for_completion(session, job_id)
+        
+        # Test 4: Check status (final)
+        await test_check_status(session, job_id)
+        
+        # Test 5 and 6: Get results and list all backtests
+        results, _ = await asyncio.gather(test_get_results(session, job_id), test_list_backtests(session))
+        
+        # Test 7: Delete backtest (optional - comment out if you want to keep results)
+        # await test_delete_backtest(session, job_id)
+        
+        # Test 8: Delete several backtests in one request (optional cleanup)
+        # await test_delete_backtests(session, [job_id])
     
     # Summary
     print_header("TEST SUMMARY")
@@ -458,5 +693,4 @@ def main():
         print(f"  Backtest Status: Check manually")
 
 if __name__ == "__main__":
-    main()
-
+    asyncio.run(main())
@@ -4,10 +4,86 @@ Simple CLI script to test backtesting with IBM stock
 Strategy: Buy 100 shares every 3 days, hold for 3 days, then sell
 """
 import asyncio
+import hashlib
 import json
+import os
+import shutil
+import time
 from datetime import datetime
 from backend.backtest_engine import BacktestEngine
 from backend.simple_strategies import create_rotation_strategy_functions
+from backend.utils import numpy_json_default
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Results of identical runs (same config and strategy parameters) are reused
+# from disk for RESULTS_CACHE_TTL seconds; set RESULTS_CACHE_DIR="" to always
+# run the engine
+RESULTS_CACHE_DIR = os.path.expanduser(os.getenv("RESULTS_CACHE_DIR", "~/.backtester_cache"))
+RESULTS_CACHE_TTL = float(os.getenv("RESULTS_CACHE_TTL", 24 * 60 * 60))
+
+# Seconds between "still running" lines while the engine runs
+HEARTBEAT_SECONDS = 10
+
+
+def save_results(results: dict, output_file: str):
+    """Write results as indented JSON (orjson when installed, stdlib json otherwise)"""
+    if ORJSON_AVAILABLE:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=numpy_json_default
+            ))
+    else:
+        with open(output_file, 'w') as f:
+            json.dump(results, f, indent=2, default=numpy_json_default)
+
+
+def results_cache_path(config: dict, strategy_params: dict) -> str:
+    """Cache file for a run, keyed on a SHA-256 of its config and strategy parameters"""
+    canonical = json.dumps([config, strategy_params], sort_keys=True, separators=(",", ":"), default=str)
+    key = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(RESULTS_CACHE_DIR, f"ibm_{key}.json")
+
+
+def load_cached_results(cache_path: str):
+    """Cached results if the cache file exists and is younger than RESULTS_CACHE_TTL, else None"""
+    if not RESULTS_CACHE_DIR:
+        return None
+    try:
+        if time.time() - os.path.getmtime(cache_path) >= RESULTS_CACHE_TTL:
+            return None
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+    except (OSError, ValueError):
+        return None
+
+
+def store_cached_results(cache_path: str, source_file: str):
+    """Copy a saved results file into the cache (atomically, so readers never see a partial file)"""
+    if not RESULTS_CACHE_DIR:
+        return
+    try:
+        os.makedirs(RESULTS_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        shutil.copyfile(source_file, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not cache results: {e}")
+
+
+async def print_heartbeat(interval: float = HEARTBEAT_SECONDS):
+    """Print the elapsed time every interval seconds until cancelled"""
+    start = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        print(f"  ... backtest running ({time.monotonic() - start:.0f}s elapsed)")
 
 
 async def run_ibm_backtest():
@@ -41,8 +117,8 @@ async def run_ibm_backtest():
             'takeProfit': None,  # No take profit
             'stopLoss': None,     # No stop loss
             'timeBasedExit': 3,   # Exit after 3 days
-            'positionSizingMethod': 'fixed-dollar',
-            'fixedDollarAmount': None,  # Will be calculated based on 100 shares
+            'positionSizingMethod': 'fixed-shares',
+            'fixedDollarAmount': 100,  # Share count for fixed-shares sizing
             'portfolioPercent': None,
             'riskPercent': None,
             'maxPositions': 100,  # Allow multiple overlapping positions
@@ -118,26 +194,35 @@ async def run_ibm_backtest():
     print("Starting backtest...")
     print()
     
+    # Strategy parameters set on the engine below; part of the results cache key
+    strategy_params = {'buy_every_n_days': 3, 'hold_for_days': 3}
+    cache_path = results_cache_path(config, strategy_params)
+    
     try:
-        # Initialize backtest engine
-        engine = BacktestEngine(config)
-        
-        # Set up custom rotation strategy (buy every 3 days, hold for 3 days)
-        entry_func, exit_func = create_rotation_strategy_functions(
-            buy_every_n_days=3,
-            hold_for_days=3
-        )
-        engine.strategy.set_entry_signal_function(entry_func)
-        engine.strategy.set_exit_signal_function(exit_func)
-        
-        # Override position sizing to buy exactly 100 shares
-        original_calc = engine.strategy.calculate_position_size
-        def fixed_100_shares(ticker, current_price, portfolio_value, cash_available):
-            return 100  # Always buy 100 shares
-        engine.strategy.calculate_position_size = fixed_100_shares
-        
-        # Run backtest
-        results = await engine.run()
+        results = load_cached_results(cache_path)
+        from_cache = results is not None
+        if from_cache:
+            print(f"Using cached results: {cache_path}")
+            print()
+        else:
+            # Initialize backtest engine
+            engine = BacktestEngine(config)
+            
+            # Set up custom rotation strategy (buy every 3 days, hold for 3 days)
+            entry_func, exit_func = create_rotation_strategy_functions(
+                buy_every_n_days=strategy_params['buy_every_n_days'],
+                hold_for_days=strategy_params['hold_for_days']
+            )
+            engine.strategy.set_entry_signal_function(entry_func)
+            engine.strategy.set_exit_signal_function(exit_func)
+            
+            # Run backtest, with a progress line whenever the engine yields
+            # to the event loop (data and signal requests)
+            heartbeat = asyncio.create_task(print_heartbeat())
+            try:
+                results = await engine.run()
+            finally:
+                heartbeat.cancel()
         
         print("=" * 60)
         print("BACKTEST RESULTS")
@@ -207,8 +292,11 @@ async def run_ibm_backtest():
         
         # Save full results to file
         output_file = 'ibm_backtest_results.json'
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        if from_cache:
+            shutil.copyfile(cache_path, output_file)
+        else:
+            save_results(results, output_file)
+            store_cached_results(cache_path, output_file)
         
         print(f"Full results saved to: {output_file}")
         print()
@@ -0,0 +1,87 @@
+"""
+Tests for backend.signal_expressions
+"""
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from backend.signal_expressions import compile_expression, evaluate_expression
+from backend.utils import validate_backtest_config
+
+
+class ShiftPeriodTest(unittest.TestCase):
+    """shift() may only look back, never ahead"""
+
+    def setUp(self):
+        self.frame = pd.DataFrame({'close': [10.0, 11.0, 10.5, 12.0, 11.0]})
+
+    def test_negative_shift_is_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_expression('shift(close, -1) > close', boolean=True)
+
+    def test_non_literal_shift_is_rejected(self):
+        for text in ('shift(close, 1.5) > close', 'shift(close, close) > close', 'shift(close, 1 - 2) > close'):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                compile_expression(text, boolean=True)
+
+    def test_backward_shift_uses_earlier_bars(self):
+        code = compile_expression('close > shift(close, 1)', boolean=True)
+        result = evaluate_expression(code, self.frame)
+        np.testing.assert_array_equal(result, [False, True, False, True, False])
+
+    def test_default_shift_period(self):
+        self.assertIsNotNone(compile_expression('close > shift(close)', boolean=True))
+
+
+class FunctionArgumentsTest(unittest.TestCase):
+    """Malformed calls fail at compile time instead of per ticker mid-run"""
+
+    def test_bad_windows_are_rejected(self):
+        for text in (
+            'ma(close, -3) > close', 'ema(close, 0) > close', 'sma(close, 2.5) > close',
+            'ma(close, close) > close', 'ema(close, 1 + 1) > close',
+        ):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                compile_expression(text, boolean=True)
+
+    def test_wrong_arity_is_rejected(self):
+        for text in (
+            'ma(close) > close', 'abs(close, close, close) > 0', 'shift(close, 1, 2) > close',
+            'max(close) > 0', 'ema(close, 5, 6) > close',
+        ):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                compile_expression(text, boolean=True)
+
+    def test_valid_calls_compile(self):
+        for text in (
+            'ma(close, 5) > ema(close, 20)', 'abs(close - open) > 1', 'max(open, close) > shift(close, 0)',
+        ):
+            with self.subTest(text=text):
+                self.assertIsNotNone(compile_expression(text, boolean=True))
+
+
+class ValidateConfigTest(unittest.TestCase):
+    """validate_backtest_config rejects malformed strategy expressions"""
+
+    def _config(self, **strategy):
+        return {
+            'marketData': {'tickers': 'IBM', 'startDate': '2025-01-01', 'endDate': '2025-03-31'},
+            'portfolioRisk': {'initialCapital': 10000},
+            'strategy': strategy,
+        }
+
+    def test_bad_expression_is_invalid(self):
+        is_valid, message = validate_backtest_config(self._config(entryLogic='ma(close, -3) > close'))
+        self.assertFalse(is_valid)
+        self.assertIn('entryLogic', message)
+
+    def test_plain_language_logic_is_valid(self):
+        is_valid, _ = validate_backtest_config(
+            self._config(entryLogic='Buy every 3 days', exitLogic='ma(close, 5) < ma(close, 20)')
+        )
+        self.assertTrue(is_valid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+"""
+Tests for natural-language rule parsing in backend.strategy_parser
+"""
+import unittest
+
+from backend.strategy_parser import LogicSpec, _compile_entry_spec, _compile_exit_spec
+
+
+class PatternPriorityTest(unittest.TestCase):
+    """With several patterns in one string, the highest-priority one wins"""
+
+    def test_entry_priority(self):
+        self.assertEqual(_compile_entry_spec('Buy now, then buy on the first day'), LogicSpec('first_day'))
+        self.assertEqual(_compile_entry_spec('Buy now, or buy every 5 days'), LogicSpec('every_n', 5))
+
+    def test_exit_priority(self):
+        self.assertEqual(
+            _compile_exit_spec('Sell after 10 days, otherwise hold until the end'),
+            LogicSpec('hold_until_end')
+        )
+        self.assertEqual(_compile_exit_spec('Never exit, or exit after 3 days'), LogicSpec('after_n', 3))
+
+    def test_single_pattern(self):
+        self.assertEqual(_compile_entry_spec('BUY EVERY 3 business days'), LogicSpec('every_n', 3))
+        self.assertEqual(_compile_exit_spec('hold forever'), LogicSpec('never'))
+        self.assertIsNone(_compile_exit_spec('when momentum fades'))
+
+
+if __name__ == '__main__':
+    unittest.main()